@@ -0,0 +1,237 @@
+"""
+Columnar - Arrow/Parquet export and import for scraped jobs and cached courses
+
+JSON dumps re-parse every key of every row and CSV flattens tags into a
+comma string; both are slow to reload once dumps reach thousands of rows.
+Parquet (or the Arrow IPC/Feather format, chosen by file extension) stores
+each column once, compressed, with:
+- dictionary-encoded categoricals (source, job_type, location, provider, skill, ...)
+- tags as a real list<string> column
+- numeric salary, rating and review columns
+
+Requires pyarrow (pip install pyarrow); every other script works without it.
+
+Usage:
+    python columnar.py export-jobs ../jobs_20260122_220638.json jobs.parquet
+    python columnar.py export-courses courses.parquet
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Iterable, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = feather = pq = None
+
+COURSE_CACHE_FILE = Path(__file__).resolve().parent / "course_cache" / "all_courses.json"
+
+DEFAULT_COMPRESSION = "zstd"
+
+# Column layout as (name, kind); kind is one of text, category, tags, float, int, bool
+JOB_COLUMNS = (
+    ("title", "text"),
+    ("company", "text"),
+    ("location", "category"),
+    ("url", "text"),
+    ("source", "category"),
+    ("salary", "text"),
+    ("job_type", "category"),
+    ("description", "text"),
+    ("posted_date", "text"),
+    ("tags", "tags"),
+    ("salary_min", "float"),
+    ("salary_max", "float"),
+    ("salary_currency", "category"),
+    ("salary_period", "category"),
+    ("location_id", "category"),
+    ("region_id", "category"),
+)
+
+COURSE_COLUMNS = (
+    ("id", "text"),
+    ("title", "text"),
+    ("description", "text"),
+    ("provider", "category"),
+    ("providerLogo", "category"),
+    ("url", "text"),
+    ("image", "text"),
+    ("price", "category"),
+    ("isFree", "bool"),
+    ("rating", "float"),
+    ("reviews", "int"),
+    ("skill", "category"),
+    ("type", "category"),
+)
+
+
+def require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow is required for Arrow/Parquet export. Install with: pip install pyarrow")
+
+
+def _arrow_type(kind: str):
+    return {
+        "text": pa.string(),
+        "category": pa.dictionary(pa.int32(), pa.string()),
+        "tags": pa.list_(pa.string()),
+        "float": pa.float64(),
+        "int": pa.int64(),
+        "bool": pa.bool_(),
+    }[kind]
+
+
+def schema_for(columns) -> "pa.Schema":
+    require_pyarrow()
+    return pa.schema([(name, _arrow_type(kind)) for name, kind in columns])
+
+
+def _cell(value, kind: str):
+    if value is None:
+        return None
+    if kind == "category" and isinstance(value, (list, tuple)):
+        return ", ".join(value)  # Jobicy's jobType list
+    if kind == "tags":
+        return list(value)
+    if kind == "float":
+        return float(value)
+    if kind == "int":
+        return int(value)
+    if kind in ("text", "category") and not isinstance(value, str):
+        return str(value)  # e.g. numeric posting timestamps
+    return value
+
+
+def to_table(rows: Iterable, columns, attributes: bool = False) -> "pa.Table":
+    """
+    Build a table column by column from dicts, or from objects such as Job
+    when attributes is True.
+    """
+    require_pyarrow()
+    rows = list(rows)
+    arrays = []
+    for name, kind in columns:
+        if attributes:
+            values = [_cell(getattr(row, name, None), kind) for row in rows]
+        else:
+            values = [_cell(row.get(name), kind) for row in rows]
+        if kind == "category":
+            arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(values, type=_arrow_type(kind)))
+    return pa.Table.from_arrays(arrays, schema=schema_for(columns))
+
+
+def write_table(table: "pa.Table", path, compression: str = DEFAULT_COMPRESSION):
+    """Write Parquet, or Arrow IPC for .arrow/.feather paths"""
+    require_pyarrow()
+    path = Path(path)
+    uncompressed = compression in (None, "none", "uncompressed")
+    if path.suffix in (".arrow", ".feather"):
+        feather.write_feather(table, str(path), compression="uncompressed" if uncompressed else compression)
+    else:
+        pq.write_table(table, str(path), compression=None if uncompressed else compression)
+
+
+def read_table(path, columns: Optional[list[str]] = None) -> "pa.Table":
+    """Read a table written by write_table, optionally only some columns"""
+    require_pyarrow()
+    path = Path(path)
+    if path.suffix in (".arrow", ".feather"):
+        return feather.read_table(str(path), columns=columns)
+    return pq.read_table(str(path), columns=columns)
+
+
+def table_records(table: "pa.Table") -> list[dict]:
+    """
+    Rows as dicts. Dictionary columns are decoded once per chunk, so every row
+    shares the same string object per category instead of a fresh copy.
+    """
+    columns = {}
+    for name in table.column_names:
+        column = table.column(name)
+        if pa.types.is_dictionary(column.type):
+            values = []
+            for chunk in column.chunks:
+                categories = chunk.dictionary.to_pylist()
+                values.extend(None if code is None else categories[code] for code in chunk.indices.to_pylist())
+            columns[name] = values
+        else:
+            columns[name] = column.to_pylist()
+    names = list(columns)
+    return [dict(zip(names, row)) for row in zip(*columns.values())]
+
+
+def write_jobs(jobs: Iterable, path, compression: str = DEFAULT_COMPRESSION):
+    """Export Job objects (or job dicts from a JSON dump)"""
+    jobs = list(jobs)
+    attributes = bool(jobs) and not isinstance(jobs[0], dict)
+    write_table(to_table(jobs, JOB_COLUMNS, attributes=attributes), path, compression)
+
+
+def read_job_records(path) -> list[dict]:
+    """Job dicts ready for Job(**record)"""
+    return table_records(read_table(path))
+
+
+def write_courses(courses_by_skill: dict[str, list[dict]], path, compression: str = DEFAULT_COMPRESSION):
+    """Export a course cache ({skill: [course, ...]}) as one flat table"""
+    rows = []
+    for skill, courses in courses_by_skill.items():
+        for course in courses:
+            rows.append({**course, "skill": course.get("skill") or skill})
+    write_table(to_table(rows, COURSE_COLUMNS), path, compression)
+
+
+def read_courses(path) -> dict[str, list[dict]]:
+    """Course cache in the same {skill: [course, ...]} shape as all_courses.json"""
+    grouped: dict[str, list[dict]] = {}
+    for course in table_records(read_table(path)):
+        grouped.setdefault(course["skill"], []).append(course)
+    return grouped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export job dumps and the course cache to Parquet/Arrow")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    jobs = subparsers.add_parser("export-jobs", help="Convert a JobScraper JSON dump")
+    jobs.add_argument("source", type=Path, help="JSON file written by JobScraper.save_to_json")
+    jobs.add_argument("target", type=Path, help="Output path (.parquet, .arrow or .feather)")
+
+    courses = subparsers.add_parser("export-courses", help="Convert the course cache")
+    courses.add_argument("target", type=Path, help="Output path (.parquet, .arrow or .feather)")
+    courses.add_argument("--source", type=Path, default=COURSE_CACHE_FILE,
+                         help="Combined course cache (default: course_cache/all_courses.json)")
+
+    for subparser in (jobs, courses):
+        subparser.add_argument("--compression", default=DEFAULT_COMPRESSION,
+                               help=f"Codec: zstd, snappy, lz4, gzip or none (default: {DEFAULT_COMPRESSION})")
+
+    args = parser.parse_args()
+
+    try:
+        require_pyarrow()
+    except ImportError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    with open(args.source, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if args.command == "export-jobs":
+        write_jobs(data, args.target, args.compression)
+        count = len(data)
+    else:
+        write_courses(data, args.target, args.compression)
+        count = sum(len(courses) for courses in data.values())
+
+    print(f"Wrote {count} rows to {args.target} ({args.target.stat().st_size} bytes)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
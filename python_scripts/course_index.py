@@ -0,0 +1,226 @@
+"""
+Course Index - Recommend cached courses for specific missing skills
+
+Cached courses are only reachable by the 8 category names, but job matching
+reports specific missing skills ("Kubernetes", "Figma"). This index embeds
+every cached course's title and description with the ingestion model and
+keeps them as one L2-normalized (courses × dim) matrix, so recommending for
+a whole list of missing skills is one (skills × courses) product and a
+top-k per row.
+
+Rebuilds are incremental: rows are keyed by course id and a hash of the
+embedded text, and only new or changed courses are embedded again. The
+index records a hash of the cached courses it was built from and refreshes
+itself when they have changed since.
+
+Usage (from repo root):
+    python python_scripts/course_index.py build
+    python python_scripts/course_index.py recommend "Kubernetes, Figma, SQL" [--top 3]
+
+Requires numpy and sentence-transformers (see requirements.txt).
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+
+from course_scraper import CACHE_DIR, course_id, is_course_page
+from course_store import CourseStore
+from skill_tagger import DEFAULT_MODEL, PhraseEmbedder
+
+DEFAULT_INDEX_PATH = CACHE_DIR / "course_index.npz"
+STORE_PATH = CACHE_DIR / "courses.sqlite"
+DEFAULT_TOP = 3
+
+
+def course_text(course: dict) -> str:
+    """The text embedded for a course: its title and description"""
+    title = " ".join(str(course.get("title") or "").split())
+    description = " ".join(str(course.get("description") or "").split())
+    return f"{title}. {description}" if description else title
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def load_courses(store_path: Path = STORE_PATH) -> tuple[list[dict], str]:
+    """
+    Distinct cached courses by id, without fallback placeholders (search-page
+    URLs), and a hash of them as the version; all_courses.json is used until
+    the course store exists. Renewing scraped_at alone leaves the version as is.
+    """
+    if store_path.exists():
+        store = CourseStore(store_path, readonly=True)
+        try:
+            courses = store.all_courses()
+        finally:
+            store.close()
+    else:
+        path = CACHE_DIR / "all_courses.json"
+        grouped = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+        courses = [course for items in grouped.values() for course in items]
+
+    distinct: dict[str, dict] = {}
+    for course in courses:
+        if not is_course_page(course.get("url")):
+            continue
+        # Recomputed so entries cached before ids were deterministic still de-duplicate
+        key = course_id(course.get("provider"), course.get("url"), course.get("title", ""))
+        distinct.setdefault(key, {**course, "id": key})
+    courses = list(distinct.values())
+    return courses, text_hash(json.dumps(courses, sort_keys=True, ensure_ascii=False))
+
+
+class CourseIndex:
+    """
+    Normalized course embeddings.
+
+    Attributes:
+        courses: Course dicts, one per matrix row
+        hashes: Hash of each course's embedded text
+        matrix: (courses × dim) L2-normalized embeddings
+        version: Hash of the cached courses the index was built from (see load_courses)
+        model: Sentence-Transformers model the rows were embedded with
+    """
+
+    def __init__(self, courses: Sequence[dict], hashes: Sequence[str], matrix: np.ndarray,
+                 version: str = "", model: str = DEFAULT_MODEL):
+        self.model = model
+        self.courses = list(courses)
+        self.hashes = list(hashes)
+        self.matrix = np.asarray(matrix, dtype=np.float32)
+        self.version = version
+
+    @classmethod
+    def build(cls, courses: Sequence[dict], embedder: PhraseEmbedder, version: str = "",
+              previous: Optional["CourseIndex"] = None) -> "CourseIndex":
+        """Index courses, reusing previous rows whose course id and text are unchanged"""
+        texts = [course_text(course) for course in courses]
+        hashes = [text_hash(text) for text in texts]
+        reusable = {}
+        if previous is not None and previous.model == embedder.model_name:
+            reusable = {(course["id"], digest): row
+                        for row, (course, digest) in enumerate(zip(previous.courses, previous.hashes))}
+
+        rows = [reusable.get((course["id"], digest)) for course, digest in zip(courses, hashes)]
+        changed = [i for i, row in enumerate(rows) if row is None]
+        print(f"Indexing {len(courses)} courses ({len(courses) - len(changed)} unchanged, {len(changed)} to embed)",
+              file=sys.stderr)
+
+        if not courses:
+            return cls([], [], np.zeros((0, 0), dtype=np.float32), version, embedder.model_name)
+        fresh = embedder.vectors([texts[i] for i in changed]) if changed else None
+        dim = fresh.shape[1] if fresh is not None else previous.matrix.shape[1]
+        matrix = np.empty((len(courses), dim), dtype=np.float32)
+        reused = [i for i, row in enumerate(rows) if row is not None]
+        if reused:
+            matrix[reused] = previous.matrix[[rows[i] for i in reused]]
+        if changed:
+            matrix[changed] = fresh
+        return cls(courses, hashes, matrix, version, embedder.model_name)
+
+    def save(self, path: Path = DEFAULT_INDEX_PATH):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.stem}.tmp.npz")
+        np.savez_compressed(
+            tmp,
+            courses=np.array(json.dumps(self.courses, ensure_ascii=False)),
+            hashes=np.array(self.hashes, dtype=str),
+            matrix=self.matrix,
+            version=np.array(self.version),
+            model=np.array(self.model),
+        )
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_INDEX_PATH) -> "CourseIndex":
+        with np.load(path, allow_pickle=False) as data:
+            # Indexes saved with the older (rows, scraped_at) version get "" and are rebuilt
+            version = data["version"].item() if data["version"].ndim == 0 else ""
+            return cls(json.loads(data["courses"].item()), data["hashes"].tolist(), data["matrix"],
+                       version, data["model"].item())
+
+    def recommend(self, skills: Sequence[str], embedder: PhraseEmbedder, top: int = DEFAULT_TOP,
+                  min_score: float = 0.0) -> dict[str, list[dict]]:
+        """{skill: top courses with their cosine score}, for every skill in one matrix multiply"""
+        skills = list(dict.fromkeys(skill.strip() for skill in skills if skill.strip()))
+        if not skills or not self.courses:
+            return {skill: [] for skill in skills}
+        scores = embedder.vectors([skill.lower() for skill in skills]) @ self.matrix.T
+        k = min(top, len(self.courses))
+        # argpartition finds each row's top k in linear time; only those k are sorted
+        best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        recommendations = {}
+        for skill, row, candidates in zip(skills, scores, best):
+            ordered = candidates[np.argsort(-row[candidates])]
+            recommendations[skill] = [
+                {**self.courses[i], "score": round(float(row[i]), 4)} for i in ordered if row[i] >= min_score
+            ]
+        return recommendations
+
+
+def refresh_index(path: Path = DEFAULT_INDEX_PATH, embedder: Optional[PhraseEmbedder] = None,
+                  force: bool = False) -> CourseIndex:
+    """
+    The saved index, rebuilt incrementally first if the course cache (or the
+    embedder's model) changed since it was built
+    """
+    courses, version = load_courses()
+    previous = CourseIndex.load(path) if Path(path).exists() else None
+    own_embedder = embedder is None
+    embedder = embedder or PhraseEmbedder(DEFAULT_MODEL)
+    if previous is not None and previous.version == version and previous.model == embedder.model_name and not force:
+        if own_embedder:
+            embedder.close()
+        return previous
+    try:
+        index = CourseIndex.build(courses, embedder, version, previous)
+    finally:
+        if own_embedder:
+            embedder.close()
+    index.save(path)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recommend cached courses for missing skills")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build = subparsers.add_parser("build", help="Embed new or changed cached courses and save the index")
+    build.add_argument("--force", action="store_true", help="Rebuild even if the course cache is unchanged")
+
+    recommend = subparsers.add_parser("recommend", help="Top courses for each of a comma-separated list of skills")
+    recommend.add_argument("skills", help="e.g. 'Kubernetes, Figma, SQL'")
+    recommend.add_argument("--top", type=int, default=DEFAULT_TOP, help=f"Courses per skill (default: {DEFAULT_TOP})")
+    recommend.add_argument("--min-score", type=float, default=0.0, help="Minimum cosine similarity (default: 0)")
+
+    for subparser in (build, recommend):
+        subparser.add_argument("--index", type=Path, default=DEFAULT_INDEX_PATH, help="Index file")
+        subparser.add_argument("--model", default=DEFAULT_MODEL, help="Sentence-Transformers model name")
+
+    args = parser.parse_args()
+
+    embedder = PhraseEmbedder(args.model)
+    try:
+        index = refresh_index(args.index, embedder, force=args.command == "build" and args.force)
+        if args.command == "build":
+            print(f"Indexed {len(index.courses)} courses -> {args.index}", file=sys.stderr)
+        else:
+            skills = args.skills.split(",")
+            print(json.dumps(index.recommend(skills, embedder, args.top, args.min_score), indent=2,
+                             ensure_ascii=False))
+    finally:
+        embedder.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -9,41 +9,56 @@ Takes a search query and scrapes course information including:
 Usage:
     python course_scraper.py <query> [--limit 5] [--provider udemy|coursera|all]
     python course_scraper.py "UI UX design" --limit 5 --provider all
+    python course_scraper.py "UI UX design" --refresh  # Skip the cached result
     python course_scraper.py --batch  # Scrape all skill categories and cache
+    python course_scraper.py --batch --all-queries  # Use every query per category
 
 Output: JSON to stdout or saved to cache files
 
 Note: Uses requests + BeautifulSoup for scraping. Results may vary based on
-      Udemy/Coursera page structure changes.
+      Udemy/Coursera page structure changes. Udemy pages are parsed with lxml
+      when it is installed, and only their course cards are built.
+      --from-cache imports neither requests nor bs4 and prints only JSON to
+      stdout; diagnostics go to stderr.
 """
 
 import sys
 import os
 import json
 import argparse
+import importlib.util
 import random
 import re
+import sqlite3
 import time
+from functools import cache
 from pathlib import Path
-from typing import Optional
-from urllib.parse import quote_plus, urljoin
+from typing import TYPE_CHECKING, Optional
+from urllib.parse import quote_plus, urljoin, urlsplit
 
-import requests
-from bs4 import BeautifulSoup
+from course_store import COURSE_TTL, SEARCH_TTL, CachedCourses, CourseStore, SearchCache, category_file
 
-# Load environment variables from .env file (check project root)
-try:
-    from dotenv import load_dotenv
+# requests, bs4 and the thread pool are imported only by the scraping paths,
+# so --from-cache starts without loading them (see load_cached_entry)
+if TYPE_CHECKING:
+    import requests
+
+
+def load_env():
+    """Load .env from the Laravel project root (or the working directory); messages go to stderr"""
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        print("Warning: python-dotenv not installed", file=sys.stderr)
+        return
     # Try loading from parent directory (Laravel project root)
     project_root_env = Path(__file__).resolve().parent.parent / '.env'
     if project_root_env.exists():
         load_dotenv(project_root_env)
-        print(f"Loaded .env from: {project_root_env}")
+        print(f"Loaded .env from: {project_root_env}", file=sys.stderr)
     else:
         load_dotenv()
-except ImportError:
-    print("Warning: python-dotenv not installed")
-    pass
+
 
 # Cache directory for pre-scraped courses
 CACHE_DIR = Path(__file__).parent / "course_cache"
@@ -63,6 +78,71 @@ SKILL_SEARCH_QUERIES = {
 # USD to PHP conversion rate (approximate)
 USD_TO_PHP = 56.0
 
+# Requests per second and burst size per host; replaces fixed sleeps between requests
+HOST_RATE_LIMITS = {
+    "www.udemy.com": (2.0, 4),
+    "www.coursera.org": (2.0, 4),
+}
+
+
+@cache
+def rate_limiter():
+    """Shared per-host limiter, created on the first network call"""
+    from rate_limit import HostRateLimiter
+    
+    return HostRateLimiter(HOST_RATE_LIMITS, default=(2.0, 2))
+
+
+# Categories scraped at once by batch_scrape_all_skills
+BATCH_WORKERS = 8
+
+# C-backed lxml parser when installed; html.parser is several times slower
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+# Parse only course-card subtrees of Udemy pages (see find_udemy_cards)
+FAST_PARSE = True
+
+
+@cache
+def udemy_card_strainers() -> dict:
+    from bs4 import SoupStrainer
+    
+    return {
+        "data-purpose": SoupStrainer(attrs={"data-purpose": "course-card-container"}),
+        "class": SoupStrainer(class_=re.compile(r"course-card")),
+    }
+
+# (strainer, selector) pairs tried in order, mirroring the full-page selector fallbacks
+UDEMY_CARD_SELECTORS = [
+    ("data-purpose", '[data-purpose="course-card-container"]'),
+    ("class", '.course-card--container--1QM2W'),
+    ("class", '[class*="course-card"]'),
+]
+
+# Alternative selectors per card field, in fallback order (see udemy_selector_plan)
+UDEMY_FIELD_SELECTORS = {
+    # The catch-all card selector also matches pages the specific ones do, so it
+    # never becomes the preferred variant and stays a last resort
+    "cards": [selector for _, selector in UDEMY_CARD_SELECTORS[:-1]],
+    "title": ['[data-purpose="course-title-url"] a', 'h3 a', '.course-card--course-title a'],
+    "description": ['[data-purpose="course-headline"]', '.course-card--course-headline'],
+    "price": ['[data-purpose="course-price-text"] span span', '.price-text--price-part--Tu6MH'],
+    "rating": ['[data-purpose="rating-number"]', '.star-rating--rating-number'],
+    "reviews": ['[data-purpose="rating-number"] + span', '.course-card--reviews-text'],
+    "image": ['img[src*="udemy"]'],
+}
+
+# Which selector variants last matched, so new processes skip known misses
+SELECTOR_STATS_PATH = Path(__file__).parent / "job_cache" / "udemy_selectors.json"
+
+
+@cache
+def udemy_selector_plan():
+    """Shared adaptive selector plan for Udemy pages, loaded from SELECTOR_STATS_PATH"""
+    from selector_plan import SelectorPlan
+    
+    return SelectorPlan(UDEMY_FIELD_SELECTORS, SELECTOR_STATS_PATH)
+
 # User agent to mimic browser
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -74,6 +154,83 @@ HEADERS = {
 }
 
 
+# search_courses results, in memory and in the course store
+SEARCH_CACHE = SearchCache(CACHE_DIR / "courses.sqlite")
+
+
+@cache
+def http_session() -> "requests.Session":
+    """
+    One keep-alive session for every provider call, so repeated requests to a
+    host reuse its TLS connection; the pool fits a full batch of workers
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=BATCH_WORKERS * 2))
+    session.mount("http://", HTTPAdapter(pool_connections=8, pool_maxsize=BATCH_WORKERS * 2))
+    return session
+
+
+def polite_get(url: str) -> "requests.Response":
+    """GET with browser headers on the shared session, waiting for the host's rate limiter first"""
+    rate_limiter().acquire(urlsplit(url).netloc)
+    return http_session().get(url, timeout=30)
+
+
+def atomic_write_json(path: Path, data):
+    """Write JSON to a temp file and rename it over path, so readers never see a partial file"""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def find_udemy_cards(html: str, limit: int = 5, fast: bool = FAST_PARSE, plan=None) -> list:
+    """
+    Course card elements from a Udemy search page
+    
+    The fast mode parses with HTML_PARSER and a SoupStrainer, so only the
+    card subtrees are built instead of the whole page. Card selectors are
+    tried in the selector plan's order and each strainer is only parsed
+    when its selector is tried, so a page layout the plan already knows
+    costs a single strained parse.
+    """
+    from bs4 import BeautifulSoup
+    
+    if not fast:
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Udemy uses data attributes and specific class patterns
+        # Look for course cards - they typically have specific data attributes
+        course_cards = soup.select('[data-purpose="course-card-container"]')
+        
+        if not course_cards:
+            # Alternative selector - look for course items in search results
+            course_cards = soup.select('.course-card--container--1QM2W')
+        
+        if not course_cards:
+            # Try another pattern - course list items
+            course_cards = soup.select('[class*="course-card"]')[:limit]
+        
+        return course_cards
+    
+    plan = plan or udemy_selector_plan()
+    strainer_names = {selector: name for name, selector in UDEMY_CARD_SELECTORS}
+    soups = {}
+    
+    def select(selector: str) -> list:
+        name = strainer_names[selector]
+        if name not in soups:
+            soups[name] = BeautifulSoup(html, HTML_PARSER, parse_only=udemy_card_strainers()[name])
+        return soups[name].select(selector)
+    
+    course_cards = plan.first("cards", select) or select(UDEMY_CARD_SELECTORS[-1][1])
+    return course_cards[:limit]
+
+
 def scrape_udemy(query: str, limit: int = 5) -> list[dict]:
     """
     Scrape Udemy search results for courses
@@ -85,36 +242,28 @@ def scrape_udemy(query: str, limit: int = 5) -> list[dict]:
     Returns:
         List of course dictionaries
     """
+    import requests
+    
     courses = []
     encoded_query = quote_plus(query)
     url = f"https://www.udemy.com/courses/search/?q={encoded_query}&sort=relevance"
     
     try:
-        response = requests.get(url, headers=HEADERS, timeout=30)
+        response = polite_get(url)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Udemy uses data attributes and specific class patterns
-        # Look for course cards - they typically have specific data attributes
-        course_cards = soup.select('[data-purpose="course-card-container"]')
-        
-        if not course_cards:
-            # Alternative selector - look for course items in search results
-            course_cards = soup.select('.course-card--container--1QM2W')
-        
-        if not course_cards:
-            # Try another pattern - course list items
-            course_cards = soup.select('[class*="course-card"]')[:limit]
+        plan = udemy_selector_plan()
+        course_cards = find_udemy_cards(response.text, limit, plan=plan)
         
         for card in course_cards[:limit]:
             try:
-                course = parse_udemy_card(card, query)
+                course = parse_udemy_card(card, query, plan)
                 if course:
                     courses.append(course)
             except Exception as e:
                 print(f"Error parsing Udemy card: {e}", file=sys.stderr)
                 continue
+        plan.save()
         
         # If we couldn't parse from HTML, try the API approach
         if not courses:
@@ -128,13 +277,17 @@ def scrape_udemy(query: str, limit: int = 5) -> list[dict]:
     return courses
 
 
-def parse_udemy_card(card, skill: str) -> Optional[dict]:
-    """Parse a single Udemy course card element"""
+def parse_udemy_card(card, skill: str, plan=None) -> Optional[dict]:
+    """
+    Parse a single Udemy course card element
+    
+    Each field is looked up through the selector plan, which tries the
+    variant that matched on earlier cards first (UDEMY_FIELD_SELECTORS).
+    """
+    plan = plan or udemy_selector_plan()
     
     # Try to find title
-    title_elem = card.select_one('[data-purpose="course-title-url"] a')
-    if not title_elem:
-        title_elem = card.select_one('h3 a') or card.select_one('.course-card--course-title a')
+    title_elem = plan.select_one(card, "title")
     
     if not title_elem:
         return None
@@ -144,15 +297,11 @@ def parse_udemy_card(card, skill: str) -> Optional[dict]:
     course_url = urljoin("https://www.udemy.com", href) if href else None
     
     # Get description/headline
-    desc_elem = card.select_one('[data-purpose="course-headline"]')
-    if not desc_elem:
-        desc_elem = card.select_one('.course-card--course-headline')
+    desc_elem = plan.select_one(card, "description")
     description = desc_elem.get_text(strip=True) if desc_elem else ""
     
     # Get price
-    price_elem = card.select_one('[data-purpose="course-price-text"] span span')
-    if not price_elem:
-        price_elem = card.select_one('.price-text--price-part--Tu6MH')
+    price_elem = plan.select_one(card, "price")
     
     price_php = "₱549"  # Default price
     is_free = False
@@ -176,9 +325,7 @@ def parse_udemy_card(card, skill: str) -> Optional[dict]:
                     pass
     
     # Get rating
-    rating_elem = card.select_one('[data-purpose="rating-number"]')
-    if not rating_elem:
-        rating_elem = card.select_one('.star-rating--rating-number')
+    rating_elem = plan.select_one(card, "rating")
     
     rating = 4.5  # Default
     if rating_elem:
@@ -188,9 +335,7 @@ def parse_udemy_card(card, skill: str) -> Optional[dict]:
             pass
     
     # Get review count
-    reviews_elem = card.select_one('[data-purpose="rating-number"] + span')
-    if not reviews_elem:
-        reviews_elem = card.select_one('.course-card--reviews-text')
+    reviews_elem = plan.select_one(card, "reviews")
     
     reviews = 10000  # Default
     if reviews_elem:
@@ -206,11 +351,11 @@ def parse_udemy_card(card, skill: str) -> Optional[dict]:
                 pass
     
     # Get image
-    img_elem = card.select_one('img[src*="udemy"]')
+    img_elem = plan.select_one(card, "image")
     image = img_elem.get('src') if img_elem else None
     
     return {
-        "id": f"udemy_{hash(title) % 100000}",
+        "id": course_id("Udemy", course_url, title),
         "title": title,
         "description": description[:200] if description else f"Learn {skill} with this comprehensive course",
         "provider": "Udemy",
@@ -237,7 +382,7 @@ def scrape_udemy_api(query: str, limit: int = 5) -> list[dict]:
     api_url = f"https://www.udemy.com/api-2.0/courses/?search={encoded_query}&page_size={limit}&ordering=relevance"
     
     try:
-        response = requests.get(api_url, headers=HEADERS, timeout=30)
+        response = polite_get(api_url)
         
         if response.status_code == 200:
             data = response.json()
@@ -255,13 +400,14 @@ def scrape_udemy_api(query: str, limit: int = 5) -> list[dict]:
                     except:
                         price = "₱549"
                 
+                course_url = f"https://www.udemy.com{course.get('url', '')}"
                 courses.append({
-                    "id": f"udemy_{course.get('id', random.randint(1000, 99999))}",
+                    "id": course_id("Udemy", course_url, course.get('title', 'Course')),
                     "title": course.get('title', 'Course'),
                     "description": course.get('headline', '')[:200],
                     "provider": "Udemy",
                     "providerLogo": "https://www.udemy.com/staticx/udemy/images/v7/logo-udemy.svg",
-                    "url": f"https://www.udemy.com{course.get('url', '')}",
+                    "url": course_url,
                     "image": course.get('image_480x270') or course.get('image_240x135'),
                     "price": price,
                     "isFree": course.get('is_free', False),
@@ -287,7 +433,7 @@ def scrape_coursera(query: str, limit: int = 5) -> list[dict]:
     api_url = f"https://www.coursera.org/api/search/v1?query={encoded_query}&limit={limit}&index=prod_all_products_term_optimization"
     
     try:
-        response = requests.get(api_url, headers=HEADERS, timeout=30)
+        response = polite_get(api_url)
         
         if response.status_code == 200:
             data = response.json()
@@ -318,7 +464,7 @@ def scrape_coursera(query: str, limit: int = 5) -> list[dict]:
                 partner_name = partners[0] if partners else "Coursera"
                 
                 courses.append({
-                    "id": f"coursera_{item.get('objectId', random.randint(1000, 99999))}",
+                    "id": course_id("Coursera", url, name),
                     "title": name,
                     "description": item.get('description', '')[:200] if item.get('description') else f"Learn {query}",
                     "provider": "Coursera",
@@ -433,13 +579,15 @@ def get_randomized_fallback(skill: str, limit: int = 5) -> list[dict]:
         # Alternate between Udemy and Coursera
         provider = "Udemy" if i % 2 == 0 else "Coursera"
         
+        url = f"https://www.udemy.com/courses/search/?q={quote_plus(skill)}" if provider == "Udemy" else f"https://www.coursera.org/search?query={quote_plus(skill)}"
+        
         courses.append({
-            "id": f"{provider.lower()}_{random.randint(10000, 99999)}",
+            "id": course_id(provider, url, title),
             "title": title,
             "description": desc,
             "provider": provider,
             "providerLogo": "https://www.udemy.com/staticx/udemy/images/v7/logo-udemy.svg" if provider == "Udemy" else "https://d3njjcbhbojbot.cloudfront.net/web/images/favicons/favicon-v2-194x194.png",
-            "url": f"https://www.udemy.com/courses/search/?q={quote_plus(skill)}" if provider == "Udemy" else f"https://www.coursera.org/search?query={quote_plus(skill)}",
+            "url": url,
             "image": None,
             "price": price_str,
             "isFree": is_free,
@@ -452,111 +600,289 @@ def get_randomized_fallback(skill: str, limit: int = 5) -> list[dict]:
     return courses
 
 
-def search_courses(query: str, limit: int = 5, provider: str = "all") -> list[dict]:
+def search_courses(query: str, limit: int = 5, provider: str = "all", refresh: bool = False) -> list[dict]:
     """
     Search for courses from specified providers
     
+    Results are cached in SEARCH_CACHE: a repeated (query, provider, limit)
+    search is answered from memory or the course store while fresh, without
+    touching the network.
+    
     Args:
         query: Search query
         limit: Max courses per provider
         provider: "udemy", "coursera", or "all"
+        refresh: Scrape even if a fresh cached result exists
     
     Returns:
         List of course dictionaries
     """
+    cached = SEARCH_CACHE.get(query, provider, limit)
+    if cached and cached.fresh and not refresh:
+        return cached.courses
+    
     courses = []
     
+    scrapers = []
     if provider in ["udemy", "all"]:
-        udemy_courses = scrape_udemy(query, limit)
-        courses.extend(udemy_courses)
-        time.sleep(1)  # Rate limiting
-    
+        scrapers.append(scrape_udemy)
     if provider in ["coursera", "all"]:
-        coursera_courses = scrape_coursera(query, limit)
-        courses.extend(coursera_courses)
-    
-    # If we got nothing, use randomized fallback
-    if not courses:
-        print(f"Scraping failed, using fallback for: {query}", file=sys.stderr)
-        # Find the skill category this query belongs to
-        skill_category = "Programming"  # Default
-        for category, queries in SKILL_SEARCH_QUERIES.items():
-            if query.lower() in [q.lower() for q in queries] or category.lower() in query.lower():
-                skill_category = category
-                break
-        courses = get_randomized_fallback(skill_category, limit)
+        scrapers.append(scrape_coursera)
+    
+    # Providers are different hosts, so they are queried concurrently;
+    # per-host pacing is left to rate_limiter()
+    from concurrent.futures import ThreadPoolExecutor
+    
+    with ThreadPoolExecutor(max_workers=len(scrapers) or 1) as executor:
+        for provider_courses in executor.map(lambda scrape: scrape(query, limit), scrapers):
+            courses.extend(provider_courses)
+    
+    if courses:
+        courses = courses[:limit * 2] if provider == "all" else courses[:limit]
+        SEARCH_CACHE.put(query, provider, limit, courses)
+        return courses
+    
+    # A stale result beats a randomized fallback
+    if cached and cached.courses:
+        print(f"Scraping failed, using cached results from {cached.age:.0f}s ago for: {query}", file=sys.stderr)
+        return cached.courses
+    
+    # If we got nothing, use randomized fallback (never cached)
+    print(f"Scraping failed, using fallback for: {query}", file=sys.stderr)
+    # Find the skill category this query belongs to
+    skill_category = "Programming"  # Default
+    for category, queries in SKILL_SEARCH_QUERIES.items():
+        if query.lower() in [q.lower() for q in queries] or category.lower() in query.lower():
+            skill_category = category
+            break
+    courses = get_randomized_fallback(skill_category, limit)
     
     return courses[:limit * 2] if provider == "all" else courses[:limit]
 
 
-def batch_scrape_all_skills(limit: int = 5) -> dict:
+def is_course_page(url: Optional[str]) -> bool:
+    """True for a course's own page; False for search pages (used by fallbacks) and missing URLs"""
+    path = urlsplit(url or '').path
+    return bool(path) and '/search' not in path
+
+
+def canonical_course(provider: str, url: Optional[str], title: str = '') -> str:
+    """
+    Stable identity of a course across queries and runs: provider plus the
+    course's canonical URL (host and path, no scheme, query or trailing
+    slash), or its normalized title when the URL is only a search page.
     """
-    Scrape courses for all skill categories and cache results
+    provider = (provider or '').lower()
+    if is_course_page(url):
+        parts = urlsplit(url)
+        return f"{provider}:{parts.netloc.lower()}{parts.path.rstrip('/').lower()}"
+    return f"{provider}:{' '.join(str(title or '').lower().split())}"
+
+
+def course_id(provider: str, url: Optional[str], title: str = '') -> str:
+    """Deterministic course id, e.g. udemy_3f2a9c01b7de; the same course gets the same id on every scrape"""
+    import hashlib  # Loads OpenSSL; kept off the --from-cache startup path
     
-    Returns:
-        Dictionary of skill -> courses
+    digest = hashlib.sha1(canonical_course(provider, url, title).encode('utf-8')).hexdigest()[:12]
+    return f"{(provider or 'course').lower()}_{digest}"
+
+
+def course_key(course: dict) -> str:
+    return canonical_course(course.get('provider') or '', course.get('url'), course.get('title', ''))
+
+
+def merge_cached_courses(old: list[dict], new: list[dict], limit: int) -> list[dict]:
     """
-    CACHE_DIR.mkdir(exist_ok=True)
+    Merge a category's fresh results into its cached list by course id.
     
-    all_results = {}
+    Fresh course-page results come first, in their new order and with their
+    new fields. Cached courses that dropped out only fill the remaining slots,
+    and fallback placeholders (search-page URLs) come last, so a failed scrape
+    never replaces real cached courses with randomized templates.
+    """
+    real_new = [course for course in new if is_course_page(course.get('url'))]
+    seen = {course['id'] for course in real_new}
+    # Entries cached before ids were deterministic get theirs recomputed
+    old = [{**course, 'id': course_id(course.get('provider'), course.get('url'), course.get('title', ''))}
+           for course in old]
+    kept_old = [course for course in old if is_course_page(course.get('url')) and course['id'] not in seen]
+    placeholders = [course for course in new if not is_course_page(course.get('url'))]
+    return (real_new + kept_old + placeholders)[:limit]
+
+
+def merge_ranked(result_lists: list[list[dict]], limit: int) -> list[dict]:
+    """
+    Merge per-query results by course_key and rank them: courses returned by
+    more queries first, then by rating, then by review count. Fallback
+    placeholders (search-page URLs) never count as agreement and rank after
+    every real course.
+    """
+    merged: dict[str, dict] = {}
+    agreement: dict[str, int] = {}
+    for courses in result_lists:
+        for key in dict.fromkeys(course_key(course) for course in courses if is_course_page(course.get('url'))):
+            agreement[key] = agreement.get(key, 0) + 1
+        for course in courses:
+            merged.setdefault(course_key(course), course)
+    
+    ranked = sorted(
+        merged,
+        key=lambda key: (not is_course_page(merged[key].get('url')), -agreement.get(key, 0),
+                         -(merged[key].get('rating') or 0), -(merged[key].get('reviews') or 0), key),
+    )
+    return [merged[key] for key in ranked[:limit]]
+
+
+def scrape_skill_category(skill: str, queries: list[str], limit: int = 5, all_queries: bool = False,
+                          refresh: bool = True) -> list[dict]:
+    """
+    Courses for one skill category
     
-    for skill, queries in SKILL_SEARCH_QUERIES.items():
-        print(f"Scraping courses for: {skill}", file=sys.stderr)
-        
-        skill_courses = []
+    By default only the first query is used and results are de-duplicated by
+    title. With all_queries every query runs concurrently and the results are
+    merged and ranked by merge_ranked(). refresh bypasses fresh SEARCH_CACHE
+    results, since a batch run exists to refresh the category cache.
+    """
+    print(f"Scraping courses for: {skill}", file=sys.stderr)
+    
+    if all_queries:
+        from concurrent.futures import ThreadPoolExecutor
         
+        with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+            result_lists = list(executor.map(lambda query: search_courses(query, limit, "all", refresh), queries))
+        unique_courses = merge_ranked(result_lists, limit)
+    else:
         # Use first query for this skill
         primary_query = queries[0]
-        courses = search_courses(primary_query, limit, "all")
-        
-        # Update skill field to category name
-        for course in courses:
-            course['skill'] = skill
-        
-        skill_courses.extend(courses)
+        courses = search_courses(primary_query, limit, "all", refresh)
         
         # Remove duplicates by title
         seen_titles = set()
         unique_courses = []
-        for course in skill_courses:
+        for course in courses:
             if course['title'] not in seen_titles:
                 seen_titles.add(course['title'])
                 unique_courses.append(course)
+    
+    # Update skill field to category name
+    for course in unique_courses:
+        course['skill'] = skill
+    
+    print(f"  -> Found {len(unique_courses[:limit])} courses for {skill}", file=sys.stderr)
+    return unique_courses[:limit]
+
+
+def batch_scrape_all_skills(limit: int = 5, max_workers: int = BATCH_WORKERS, all_queries: bool = False) -> dict:
+    """
+    Scrape courses for all skill categories concurrently and merge them into the cache
+    
+    Categories run in parallel; rate_limiter() keeps each host's request rate
+    polite. Fresh results are merged into each category's cached list by
+    course id (see merge_cached_courses), and only categories whose list
+    changed are rewritten; unchanged ones just have their scraped_at renewed.
+    A category whose scrape found no real course page (only fallback
+    placeholders) keeps its cached list and age, so it is retried next run;
+    the placeholders are only stored when nothing is cached for it yet.
+    Writes happen once every category is done, each atomically, so readers
+    never see a half-written cache. With all_queries every query in
+    SKILL_SEARCH_QUERIES is used, not just the first.
+    
+    Returns:
+        Dictionary of skill -> courses
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    
+    CACHE_DIR.mkdir(exist_ok=True)
+    started = time.perf_counter()
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            skill: executor.submit(scrape_skill_category, skill, queries, limit, all_queries)
+            for skill, queries in SKILL_SEARCH_QUERIES.items()
+        }
+        scraped = {skill: future.result() for skill, future in futures.items()}
+    
+    store = CourseStore(CACHE_DIR / "courses.sqlite")
+    try:
+        all_results = {}
+        changed = {}
+        unchanged = []
+        failed = set()
+        for skill, courses in scraped.items():
+            cached = store.get(skill)
+            old = cached.courses if cached else []
+            if cached is not None and not any(is_course_page(course.get('url')) for course in courses):
+                all_results[skill] = old
+                failed.add(skill)
+                continue
+            all_results[skill] = merge_cached_courses(old, courses, limit)
+            if all_results[skill] != old:
+                changed[skill] = all_results[skill]
+            else:
+                unchanged.append(skill)
         
-        all_results[skill] = unique_courses[:limit]
-        
-        # Save to cache file
-        cache_file = CACHE_DIR / f"{skill.lower().replace(' ', '_')}.json"
-        with open(cache_file, 'w', encoding='utf-8') as f:
-            json.dump(unique_courses[:limit], f, indent=2, ensure_ascii=False)
-        
-        print(f"  -> Found {len(unique_courses[:limit])} courses", file=sys.stderr)
-        
-        # Rate limiting between skills
-        time.sleep(2)
+        # One transaction for the whole refresh; readers see the old or the new cache, never a mix
+        store.refresh_categories(changed, unchanged)
+    finally:
+        store.close()
+    
+    # JSON copies for readers that open the files directly (CourseScraperService)
+    now = time.time()
+    for skill, courses in all_results.items():
+        path = category_file(skill, CACHE_DIR)
+        if skill in failed:
+            continue
+        if skill in changed or not path.exists():
+            atomic_write_json(path, courses)
+        else:
+            os.utime(path, (now, now))  # Keeps the file's mtime freshness in step with the store
     
     # Save combined results
-    combined_file = CACHE_DIR / "all_courses.json"
-    with open(combined_file, 'w', encoding='utf-8') as f:
-        json.dump(all_results, f, indent=2, ensure_ascii=False)
+    if changed or not (CACHE_DIR / "all_courses.json").exists():
+        atomic_write_json(CACHE_DIR / "all_courses.json", all_results)
     
+    print(f"Scraped {len(all_results)} categories in {time.perf_counter() - started:.1f}s "
+          f"({len(changed)} changed, {len(unchanged)} unchanged, {len(failed)} failed)", file=sys.stderr)
     return all_results
 
 
-def load_cached_courses(skill: str) -> Optional[list[dict]]:
-    """Load courses from cache file for a skill"""
-    cache_file = CACHE_DIR / f"{skill.lower().replace(' ', '_')}.json"
-    
+def load_cached_entry(skill: str, ttl: float = COURSE_TTL) -> Optional[CachedCourses]:
+    """
+    Cached courses for a skill category with their freshness: one indexed
+    read from the course store, or the category's JSON file if the store does
+    not exist yet or has no row for the skill
+    """
+    store_path = CACHE_DIR / "courses.sqlite"
+    if store_path.exists():
+        try:
+            store = CourseStore(store_path, ttl=ttl, readonly=True)
+            try:
+                cached = store.get(skill)
+            finally:
+                store.close()
+            if cached is not None:
+                return cached
+        except sqlite3.Error as e:
+            print(f"Course store unreadable, using JSON cache: {e}", file=sys.stderr)
+    
+    cache_file = category_file(skill, CACHE_DIR)
     if cache_file.exists():
         try:
             with open(cache_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                scraped_at = cache_file.stat().st_mtime
+                return CachedCourses(json.load(f), scraped_at, time.time() - scraped_at <= ttl)
         except (json.JSONDecodeError, IOError):
             pass
     
     return None
 
 
+def load_cached_courses(skill: str) -> Optional[list[dict]]:
+    """Load courses from cache for a skill"""
+    cached = load_cached_entry(skill)
+    return cached.courses if cached else None
+
+
 def main():
     parser = argparse.ArgumentParser(description="Scrape courses from Udemy and Coursera")
     parser.add_argument("query", nargs="?", help="Search query (e.g., 'UI UX design')")
@@ -565,28 +891,46 @@ def main():
                         help="Provider to scrape (default: all)")
     parser.add_argument("--batch", action="store_true", 
                         help="Batch scrape all skill categories and cache results")
+    parser.add_argument("--all-queries", action="store_true",
+                        help="With --batch, search every query of each category and merge the results")
     parser.add_argument("--from-cache", action="store_true",
                         help="Load from cache instead of scraping")
     parser.add_argument("--skill", help="Skill category for cache lookup (e.g., 'Design')")
+    parser.add_argument("--cache-ttl", type=float,
+                        help=f"Seconds a cached category (default: {COURSE_TTL}) or search result "
+                             f"(default: {SEARCH_TTL}) counts as fresh")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Scrape the query even if a fresh cached result exists")
+    parser.add_argument("--cache-meta", action="store_true",
+                        help="With --from-cache, print {courses, scraped_at, age_seconds, fresh} instead of a list")
     
     args = parser.parse_args()
     
     if args.batch:
         # Batch mode: scrape all skills
-        results = batch_scrape_all_skills(args.limit)
+        load_env()
+        results = batch_scrape_all_skills(args.limit, all_queries=args.all_queries)
         print(json.dumps(results, indent=2, ensure_ascii=False))
     elif args.from_cache and args.skill:
         # Load from cache
-        cached = load_cached_courses(args.skill)
-        if cached:
-            print(json.dumps(cached, indent=2, ensure_ascii=False))
+        cached = load_cached_entry(args.skill, COURSE_TTL if args.cache_ttl is None else args.cache_ttl)
+        if cached and cached.courses:
+            freshness = cached.freshness()
+            print(f"Cache {'fresh' if cached.fresh else 'stale'}: {args.skill} scraped "
+                  f"{freshness['age_seconds']:.0f}s ago", file=sys.stderr)
+            output = {"courses": cached.courses, **freshness} if args.cache_meta else cached.courses
         else:
             # Fallback to randomized
             fallback = get_randomized_fallback(args.skill, args.limit)
-            print(json.dumps(fallback, indent=2, ensure_ascii=False))
+            output = {"courses": fallback, "scraped_at": None, "age_seconds": None, "fresh": False} \
+                if args.cache_meta else fallback
+        print(json.dumps(output, indent=2, ensure_ascii=False))
     elif args.query:
         # Single query mode
-        courses = search_courses(args.query, args.limit, args.provider)
+        load_env()
+        if args.cache_ttl is not None:
+            SEARCH_CACHE.ttl = args.cache_ttl
+        courses = search_courses(args.query, args.limit, args.provider, args.refresh)
         print(json.dumps(courses, indent=2, ensure_ascii=False))
     else:
         parser.print_help()
@@ -0,0 +1,263 @@
+"""
+Course Store - Indexed SQLite cache for scraped courses
+
+One store replaces reopening and parsing a per-category JSON file on every
+lookup. Rows are keyed by (category, query) and carry a scraped_at timestamp:
+
+- category rows (query = "") hold the courses batch_scrape_all_skills picked
+  for a skill category and are what --from-cache serves
+- query rows hold the result of one search_courses call, under the
+  search_category() of its provider and limit (see SearchCache)
+
+Entries older than ttl are still returned, marked not fresh, so callers can
+decide whether to serve them. Each batch is written in one transaction and
+the database runs in WAL mode, so readers never block on or see a partial
+refresh. The per-category JSON files are still written for the PHP side and
+are imported automatically the first time the store is opened empty.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+CACHE_DIR = Path(__file__).resolve().parent / "course_cache"
+DEFAULT_STORE_PATH = CACHE_DIR / "courses.sqlite"
+
+# Category rows are considered fresh for a day
+COURSE_TTL = 24 * 60 * 60
+
+# Query value of the per-category rows
+CATEGORY_ROW = ""
+
+# Repeated searches are served from SearchCache for six hours
+SEARCH_TTL = 6 * 60 * 60
+SEARCH_CACHE_SIZE = 256
+
+
+@dataclass(frozen=True)
+class CachedCourses:
+    courses: list
+    scraped_at: float
+    fresh: bool
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.scraped_at
+
+    def freshness(self) -> dict:
+        return {"scraped_at": self.scraped_at, "age_seconds": round(self.age, 1), "fresh": self.fresh}
+
+
+def category_file(category: str, cache_dir: Path = CACHE_DIR) -> Path:
+    return cache_dir / f"{category.lower().replace(' ', '_')}.json"
+
+
+def search_category(provider: str, limit: int) -> str:
+    """Category column of the query rows caching search_courses(query, limit, provider)"""
+    return f"search|{provider}|{int(limit)}"
+
+
+class CourseStore:
+    """
+    SQLite store of course lists keyed by (category, query).
+
+    Args:
+        path: Database file (created on first write)
+        ttl: Age in seconds after which entries are reported as stale
+        readonly: Open without creating anything; used by the --from-cache path
+    """
+
+    def __init__(self, path: Path = DEFAULT_STORE_PATH, ttl: float = COURSE_TTL, readonly: bool = False):
+        self.path = Path(path)
+        self.ttl = ttl
+        if readonly:
+            self.conn = sqlite3.connect(f"{self.path.as_uri()}?mode=ro", uri=True, timeout=10)
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=10)
+        self.conn.execute("PRAGMA journal_mode=WAL;")
+        self.conn.execute("PRAGMA synchronous=NORMAL;")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS course_results (
+                category TEXT NOT NULL,
+                query TEXT NOT NULL,
+                courses TEXT NOT NULL,
+                scraped_at REAL NOT NULL,
+                PRIMARY KEY (category, query)
+            );
+            CREATE INDEX IF NOT EXISTS idx_course_results_scraped_at ON course_results(scraped_at);
+            """
+        )
+        if self.conn.execute("SELECT 1 FROM course_results LIMIT 1").fetchone() is None:
+            self.import_json_files(self.path.parent)
+
+    @staticmethod
+    def normalize(value: str) -> str:
+        return " ".join(str(value).lower().split())
+
+    def get(self, category: str, query: str = CATEGORY_ROW) -> Optional[CachedCourses]:
+        """The cached courses for (category, query) with their freshness, or None"""
+        row = self.conn.execute(
+            "SELECT courses, scraped_at FROM course_results WHERE category = ? AND query = ?",
+            (self.normalize(category), self.normalize(query)),
+        ).fetchone()
+        if row is None:
+            return None
+        courses, scraped_at = row
+        return CachedCourses(json.loads(courses), scraped_at, time.time() - scraped_at <= self.ttl)
+
+    def _upsert(self, entries: Iterable[tuple[str, str, list]], scraped_at: float):
+        self.conn.executemany(
+            """
+            INSERT INTO course_results(category, query, courses, scraped_at)
+            VALUES(?, ?, ?, ?)
+            ON CONFLICT(category, query) DO UPDATE SET
+                courses=excluded.courses,
+                scraped_at=excluded.scraped_at;
+            """,
+            [
+                (self.normalize(category), self.normalize(query),
+                 json.dumps(courses, ensure_ascii=False, separators=(",", ":")), scraped_at)
+                for category, query, courses in entries
+            ],
+        )
+
+    def _touch(self, keys: Iterable[tuple[str, str]], scraped_at: float):
+        self.conn.executemany(
+            "UPDATE course_results SET scraped_at = ? WHERE category = ? AND query = ?",
+            [(scraped_at, self.normalize(category), self.normalize(query)) for category, query in keys],
+        )
+
+    def put_many(self, entries: Iterable[tuple[str, str, list]], scraped_at: Optional[float] = None):
+        """Write (category, query, courses) entries in a single transaction"""
+        with self.conn:
+            self._upsert(entries, time.time() if scraped_at is None else scraped_at)
+
+    def refresh_categories(self, changed: dict[str, list], unchanged: Iterable[str],
+                           scraped_at: Optional[float] = None):
+        """
+        Record a batch refresh in one transaction: rewrite the category rows
+        that changed and only renew scraped_at on those that did not.
+        """
+        scraped_at = time.time() if scraped_at is None else scraped_at
+        with self.conn:
+            self._upsert(((category, CATEGORY_ROW, courses) for category, courses in changed.items()), scraped_at)
+            self._touch(((category, CATEGORY_ROW) for category in unchanged), scraped_at)
+
+    def put(self, category: str, query: str, courses: list):
+        self.put_many([(category, query, courses)])
+
+    def categories(self) -> dict[str, list]:
+        """Every category row, as {category: courses}"""
+        rows = self.conn.execute(
+            "SELECT category, courses FROM course_results WHERE query = ? ORDER BY category", (CATEGORY_ROW,)
+        )
+        return {category: json.loads(courses) for category, courses in rows}
+
+    def all_courses(self) -> list:
+        """Every course in every row (category and search results), duplicates included"""
+        courses = []
+        for (row,) in self.conn.execute("SELECT courses FROM course_results ORDER BY category, query"):
+            courses.extend(json.loads(row))
+        return courses
+
+    def import_json_files(self, cache_dir: Path):
+        """Seed an empty store from per-category JSON files, keeping their modification times"""
+        entries = []
+        for path in sorted(cache_dir.glob("*.json")):
+            if path.name == "all_courses.json":
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    courses = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if isinstance(courses, list):
+                category = courses[0].get("skill", path.stem) if courses else path.stem.replace("_", " ")
+                entries.append((category, CATEGORY_ROW, courses, path.stat().st_mtime))
+        for category, query, courses, scraped_at in entries:
+            self.put_many([(category, query, courses)], scraped_at)
+
+    def close(self):
+        self.conn.close()
+
+
+class SearchCache:
+    """
+    search_courses results keyed by (query, provider, limit).
+
+    An in-process LRU sits in front of the store's query rows, so a repeated
+    search costs no network round trip, and within one process no disk read
+    either. Entries past ttl are still returned, marked not fresh, so a failed
+    scrape can fall back to them.
+
+    Args:
+        path: Store file; None keeps results in memory only
+        ttl: Age in seconds after which a result is rescraped
+        maxsize: Results kept in memory
+    """
+
+    def __init__(self, path: Optional[Path] = DEFAULT_STORE_PATH, ttl: float = SEARCH_TTL,
+                 maxsize: int = SEARCH_CACHE_SIZE):
+        self.path = Path(path) if path is not None else None
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.memory: OrderedDict[tuple, tuple[list, float]] = OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(query: str, provider: str, limit: int) -> tuple:
+        return CourseStore.normalize(query), provider, int(limit)
+
+    def _remember(self, key: tuple, courses: list, scraped_at: float):
+        with self.lock:
+            self.memory[key] = (courses, scraped_at)
+            self.memory.move_to_end(key)
+            while len(self.memory) > self.maxsize:
+                self.memory.popitem(last=False)
+
+    def _read_store(self, query: str, provider: str, limit: int) -> Optional[CachedCourses]:
+        if self.path is None or not self.path.exists():
+            return None
+        try:
+            store = CourseStore(self.path, self.ttl, readonly=True)
+            try:
+                return store.get(search_category(provider, limit), query)
+            finally:
+                store.close()
+        except sqlite3.Error:
+            return None
+
+    def get(self, query: str, provider: str, limit: int) -> Optional[CachedCourses]:
+        """The cached result with its freshness, or None"""
+        key = self.key(query, provider, limit)
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None:
+                self.memory.move_to_end(key)
+        if entry is None:
+            cached = self._read_store(query, provider, limit)
+            if cached is None:
+                return None
+            entry = (cached.courses, cached.scraped_at)
+            self._remember(key, *entry)
+        courses, scraped_at = entry
+        # Callers relabel course["skill"]; hand out copies so the cached dicts stay as scraped
+        return CachedCourses([dict(course) for course in courses], scraped_at, time.time() - scraped_at <= self.ttl)
+
+    def put(self, query: str, provider: str, limit: int, courses: list):
+        scraped_at = time.time()
+        courses = [dict(course) for course in courses]
+        self._remember(self.key(query, provider, limit), courses, scraped_at)
+        if self.path is not None:
+            store = CourseStore(self.path, self.ttl)
+            try:
+                store.put_many([(search_category(provider, limit), query, courses)], scraped_at)
+            finally:
+                store.close()
@@ -0,0 +1,233 @@
+"""
+HTTP Fixtures - Record upstream responses and replay them from a local server
+
+Both scrapers send through requests' HTTPAdapter.send: JobScraper's
+session via its TimedHTTPAdapter, and course_scraper's pooled http_session()
+used by polite_get. Recording patches HTTPAdapter.send to capture every
+response into a fixture directory, one JSON file per request URL. Replay
+starts a local stand-in HTTP server that serves those files, with
+configurable latency and error injection, and patches HTTPAdapter.send to
+reroute requests to it.
+
+Usage:
+    with recording("fixtures/live"):
+        JobScraper().fetch_all_jobs("designer")
+
+    with ReplayServer("fixtures/live", latency_ms=80, error_rate=0.05) as server:
+        with replaying(server):
+            JobScraper().fetch_all_jobs("designer")
+
+API credentials (Adzuna app_id/app_key) are dropped from fixture keys and
+never written to disk.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from requests.adapters import HTTPAdapter
+
+# Query parameters that carry credentials and must not end up in fixtures
+SECRET_PARAMS = {"app_id", "app_key", "api_key", "apikey", "key", "token"}
+
+# Response headers worth replaying; everything else is connection-specific
+KEPT_HEADERS = {"content-type", "retry-after"}
+
+_patch_lock = threading.Lock()
+
+
+def fixture_key(url: str) -> str:
+    """Canonical URL used to match a request to its fixture (sorted query, no secrets)"""
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k.lower() not in SECRET_PARAMS)
+    key = f"{parts.scheme}://{parts.netloc}{parts.path or '/'}"
+    return f"{key}?{urlencode(query)}" if query else key
+
+
+def fixture_path(fixture_dir: Path, url: str) -> Path:
+    key = fixture_key(url)
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+    # Ports become part of the directory name; ":" is not allowed on Windows
+    return fixture_dir / urlsplit(key).netloc.replace(":", "_") / f"{digest}.json"
+
+
+def save_fixture(fixture_dir: Path, url: str, status: int, headers: dict, body: bytes):
+    path = fixture_path(fixture_dir, url)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    record = {
+        "url": fixture_key(url),
+        "status": status,
+        "headers": {k: v for k, v in headers.items() if k.lower() in KEPT_HEADERS},
+    }
+    try:
+        record["body"] = body.decode("utf-8")
+    except UnicodeDecodeError:
+        record["body_base64"] = base64.b64encode(body).decode("ascii")
+
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(record, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def load_fixture(fixture_dir: Path, url: str) -> Optional[dict]:
+    try:
+        with open(fixture_path(fixture_dir, url), "r", encoding="utf-8") as f:
+            record = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if "body_base64" in record:
+        record["body"] = base64.b64decode(record.pop("body_base64"))
+    else:
+        record["body"] = record["body"].encode("utf-8")
+    return record
+
+
+@contextmanager
+def _patched_send(send):
+    with _patch_lock:
+        original = HTTPAdapter.send
+        HTTPAdapter.send = send
+    try:
+        yield original
+    finally:
+        with _patch_lock:
+            HTTPAdapter.send = original
+
+
+@contextmanager
+def recording(fixture_dir):
+    """Capture every requests response made inside the block into fixture_dir"""
+    fixture_dir = Path(fixture_dir)
+    original = HTTPAdapter.send
+
+    def send(adapter, request, **kwargs):
+        response = original(adapter, request, **kwargs)
+        body = response.content  # Buffers streamed bodies; iter_content then replays them
+        save_fixture(fixture_dir, request.url, response.status_code, dict(response.headers), body)
+        return response
+
+    with _patched_send(send):
+        yield fixture_dir
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    server: "ReplayServer"
+
+    def do_GET(self):
+        replay = self.server
+        if replay.latency_ms or replay.jitter_ms:
+            time.sleep((replay.latency_ms + random.uniform(0, replay.jitter_ms)) / 1000)
+
+        if replay.error_rate and random.random() < replay.error_rate:
+            replay.count("errors")
+            self._respond(replay.error_status, {"Retry-After": "0"}, b"injected error")
+            return
+
+        # Path is /<scheme>/<host>/<original path and query>
+        scheme, _, rest = self.path.lstrip("/").partition("/")
+        record = load_fixture(replay.fixture_dir, f"{scheme}://{rest}")
+        if record is None:
+            replay.count("misses")
+            self._respond(404, {}, b"no fixture recorded for this request")
+            return
+
+        replay.count("hits")
+        self._respond(record["status"], record["headers"], record["body"])
+
+    def _respond(self, status: int, headers: dict, body: bytes):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output clean
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """
+    Local stand-in for the upstream APIs, serving recorded fixtures.
+
+    Args:
+        fixture_dir: Directory written by recording()
+        latency_ms: Fixed delay added before every response
+        jitter_ms: Extra uniformly random delay on top of latency_ms
+        error_rate: Fraction of requests answered with error_status instead
+        error_status: Status used for injected errors (default 503)
+    """
+
+    daemon_threads = True
+
+    def __init__(self, fixture_dir, latency_ms: float = 0, jitter_ms: float = 0,
+                 error_rate: float = 0, error_status: int = 503):
+        super().__init__(("127.0.0.1", 0), _ReplayHandler)
+        self.fixture_dir = Path(fixture_dir)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.stats = {"hits": 0, "misses": 0, "errors": 0}
+        self._stats_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, name: str):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def rewrite(self, url: str) -> str:
+        """Map an upstream URL onto this server"""
+        parts = urlsplit(url)
+        query = f"?{parts.query}" if parts.query else ""
+        return f"{self.base_url}/{parts.scheme}/{parts.netloc}{parts.path or '/'}{query}"
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+
+
+@contextmanager
+def replaying(server: ReplayServer):
+    """Reroute every requests call made inside the block to the replay server"""
+    original = HTTPAdapter.send
+
+    def send(adapter, request, **kwargs):
+        request.url = server.rewrite(request.url)
+        return original(adapter, request, **kwargs)
+
+    with _patched_send(send):
+        yield server
+
+
+if __name__ == "__main__":
+    # Serve a fixture directory for manual poking: python http_fixtures.py <dir>
+    directory = sys.argv[1] if len(sys.argv) > 1 else "fixtures"
+    with ReplayServer(directory) as replay_server:
+        print(f"Serving {directory} at {replay_server.base_url}/<scheme>/<host>/<path>", file=sys.stderr)
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
@@ -14,6 +14,11 @@ Embedding storage:
 Usage (from repo root):
   python python_scripts/ingest_kaggle_skills_embeddings.py
 
+Backfill mode embeds skills seen after ingestion that the table lacks: job
+tags from the JobScraper dumps (jobs_*.json, local_jobs_*.json) and the local
+search cache, plus skills logged by resume_parser.py:
+  python python_scripts/ingest_kaggle_skills_embeddings.py --backfill
+
 Notes:
   - Requires Kaggle credentials for kagglehub (typically %USERPROFILE%/.kaggle/kaggle.json).
   - Uses CUDA if available.
@@ -28,7 +33,9 @@ from __future__ import annotations
 
 import argparse
 import glob
+import json
 import os
+import re
 import sqlite3
 from dataclasses import dataclass
 from typing import Iterable, List, Optional, Sequence, Tuple
@@ -199,6 +206,138 @@ def upsert_skills(conn: sqlite3.Connection, rows: Sequence[CandidateSkillRow]) -
     )
 
 
+def upsert_in_chunks(conn: sqlite3.Connection, rows: Sequence[CandidateSkillRow], chunk_size: int = 500) -> None:
+    # Insert in chunks to keep memory/transactions manageable
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start : start + chunk_size]
+        upsert_skills(conn, chunk)
+        conn.commit()
+        print(f"Upserted {min(start + chunk_size, len(rows))}/{len(rows)}")
+
+
+def default_job_dump_patterns() -> List[str]:
+    return [os.path.join(repo_root(), "jobs_*.json"), os.path.join(repo_root(), "local_jobs_*.json")]
+
+
+def default_job_cache_path() -> str:
+    # Written by job_cache.LocalJobCache
+    return os.path.join(repo_root(), "python_scripts", "job_cache", "local_searches.sqlite")
+
+
+def default_resume_skill_log() -> str:
+    # Appended to by resume_parser.py after every successful parse
+    return os.environ.get(
+        "RESUME_SKILL_LOG", os.path.join(repo_root(), "python_scripts", "job_cache", "resume_skills.jsonl")
+    )
+
+
+# Longest tag still treated as a skill name; longer ones are qualification sentences
+MAX_SKILL_WORDS = 4
+
+# "3+ years of ...", "5 years ..." (but not "3D modeling" or "3ds Max")
+_LEADING_COUNT = re.compile(r"^\d+\+?(?:\s|$)")
+
+# Words that mark a qualification requirement rather than a skill name
+_REQUIREMENT_WORDS = {
+    "experience", "years", "ability", "able", "knowledge", "proficiency", "proficient", "strong",
+    "excellent", "familiarity", "familiar", "understanding", "degree", "required", "preferred", "must",
+}
+
+
+def is_skill_candidate(name: str) -> bool:
+    # Drop JSearch's "Experience: 3+ years" style tags and its highlight sentences
+    # ("3+ years of experience with AWS", "Strong communication skills")
+    name = name.strip()
+    return (
+        1 < len(name) <= 60
+        and ":" not in name
+        and not name.replace(".", "").isdigit()
+        and len(name.split()) <= MAX_SKILL_WORDS
+        and not _LEADING_COUNT.match(name)
+        and not name.endswith((".", "!", "?", ";", ","))
+        and not _REQUIREMENT_WORDS.intersection(name.lower().split())
+    )
+
+
+def skills_from_job_records(records: Iterable[dict]) -> Iterable[str]:
+    for record in records:
+        yield from record.get("tags") or []
+
+
+def load_job_records(dump_patterns: Sequence[str], job_cache_path: Optional[str]) -> List[dict]:
+    """Job records from the JSON dumps and the local search cache, skipping unreadable sources"""
+    records: List[dict] = []
+    for pattern in dump_patterns:
+        for path in sorted(glob.glob(pattern)):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    records.extend(record for record in json.load(f) if isinstance(record, dict))
+            except (OSError, ValueError) as e:
+                print(f"Skipping {path}: {e}")
+
+    if job_cache_path and os.path.exists(job_cache_path):
+        conn = sqlite3.connect(job_cache_path)
+        try:
+            for (jobs,) in conn.execute("SELECT jobs FROM local_searches;"):
+                records.extend(record for record in json.loads(jobs) if isinstance(record, dict))
+        except sqlite3.Error as e:
+            print(f"Skipping job cache {job_cache_path}: {e}")
+        finally:
+            conn.close()
+    return records
+
+
+def collect_job_skills(dump_patterns: Sequence[str], job_cache_path: Optional[str]) -> List[str]:
+    return list(skills_from_job_records(load_job_records(dump_patterns, job_cache_path)))
+
+
+def collect_resume_skills(log_path: Optional[str]) -> List[str]:
+    skills: List[str] = []
+    if not log_path or not os.path.exists(log_path):
+        return skills
+    with open(log_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                skills.extend(json.loads(line).get("skills") or [])
+            except (ValueError, AttributeError):
+                continue  # Partially written or foreign line
+    return skills
+
+
+def unseen_skills(conn: sqlite3.Connection, names: Iterable[str]) -> List[str]:
+    """Distinct candidate names (case-insensitive) with no embedded row in the skills table"""
+    embedded = {
+        row[0] for row in conn.execute("SELECT lower(name) FROM skills WHERE embedding IS NOT NULL;")
+    }
+    seen = set()
+    unseen: List[str] = []
+    for raw in names:
+        name = normalize_skill_name(str(raw))
+        key = name.lower()
+        if not is_skill_candidate(name) or key in seen or key in embedded:
+            continue
+        seen.add(key)
+        unseen.append(name)
+    return unseen
+
+
+def backfill(conn: sqlite3.Connection, args: argparse.Namespace) -> None:
+    candidates = collect_job_skills(args.jobs or default_job_dump_patterns(), args.job_cache)
+    job_count = len(candidates)
+    candidates.extend(collect_resume_skills(args.resume_log))
+    print(f"Skill strings: {job_count} from jobs, {len(candidates) - job_count} from resumes")
+
+    missing = unseen_skills(conn, candidates)
+    print(f"Unseen skills: {len(missing)}")
+    if not missing:
+        print("Nothing to backfill.")
+        return
+
+    blobs, dim, device = build_embeddings(missing, args.model, args.batch_size)
+    print(f"Embedding dim: {dim}; device: {device}")
+    upsert_in_chunks(conn, [CandidateSkillRow(name=missing[i], embedding=blobs[i]) for i in range(len(missing))])
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Ingest Kaggle skills dataset into SQLite with embeddings")
     parser.add_argument("--db", default=default_sqlite_path(), help="Path to SQLite database file")
@@ -208,12 +347,34 @@ def main() -> None:
         help="Sentence-Transformers model name",
     )
     parser.add_argument("--batch-size", type=int, default=256, help="Embedding batch size (tune for your GPU VRAM)")
+    parser.add_argument(
+        "--backfill",
+        action="store_true",
+        help="Embed unseen skills from job dumps, the job cache and the resume skill log instead of the Kaggle dataset",
+    )
+    parser.add_argument(
+        "--jobs",
+        nargs="*",
+        help="Job dump globs for --backfill (default: jobs_*.json and local_jobs_*.json in the repo root)",
+    )
+    parser.add_argument("--job-cache", default=default_job_cache_path(), help="Local search cache for --backfill")
+    parser.add_argument("--resume-log", default=default_resume_skill_log(), help="Resume skill log for --backfill")
     args = parser.parse_args()
 
     db_path = os.path.abspath(args.db)
     if not os.path.exists(db_path):
         raise FileNotFoundError(f"SQLite DB not found at: {db_path}")
 
+    if args.backfill:
+        conn = connect_sqlite(db_path)
+        try:
+            ensure_skills_table(conn)
+            backfill(conn, args)
+            print("Done.")
+        finally:
+            conn.close()
+        return
+
     dataset_dir = download_kaggle_dataset()
     dataset_file = find_dataset_file(dataset_dir)
 
@@ -244,14 +405,7 @@ def main() -> None:
         print(f"Embedding dim: {dim}; device: {device}")
 
         rows = [CandidateSkillRow(name=unique_skills[i], embedding=blobs[i]) for i in range(len(unique_skills))]
-
-        # Insert in chunks to keep memory/transactions manageable
-        chunk_size = 500
-        for start in range(0, len(rows), chunk_size):
-            chunk = rows[start : start + chunk_size]
-            upsert_skills(conn, chunk)
-            conn.commit()
-            print(f"Upserted {min(start + chunk_size, len(rows))}/{len(rows)}")
+        upsert_in_chunks(conn, rows)
 
         print("Done.")
     finally:
@@ -0,0 +1,154 @@
+"""
+Job Cache - Stale-while-revalidate cache for local job searches
+
+Local searches (JSearch with 3 pages plus Adzuna) are slow, so results are
+kept in a small SQLite database keyed by (title, location, country):
+
+- younger than fresh_ttl: served as-is
+- older than fresh_ttl but younger than max_stale: served immediately while
+  one background process refreshes the entry
+- older than max_stale: never served; the caller fetches synchronously
+
+Every lookup is also written to a query log so a scheduled warmer can
+pre-fetch the most popular searches, e.g. from cron:
+
+    */10 * * * * python python_scripts/job_listing_scraper.py --warm-cache
+"""
+
+import json
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from single_flight import SingleFlight
+
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parent / "job_cache" / "local_searches.sqlite"
+
+# Serve without refreshing for 15 minutes; never serve anything older than 6 hours
+FRESH_TTL = 15 * 60
+MAX_STALE = 6 * 60 * 60
+
+# Only one background refresh per search is started within this window
+REFRESH_LEASE = 120
+
+# How far back the warmer looks when ranking popular searches
+QUERY_LOG_WINDOW = 7 * 24 * 60 * 60
+
+
+@dataclass(frozen=True)
+class CachedSearch:
+    records: list
+    fetched_at: float
+    fresh: bool
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+class LocalJobCache:
+    """SQLite-backed stale-while-revalidate store for local search results"""
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH, fresh_ttl: float = FRESH_TTL, max_stale: float = MAX_STALE):
+        self.path = Path(path)
+        self.fresh_ttl = fresh_ttl
+        self.max_stale = max_stale
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=10)
+        self.conn.execute("PRAGMA journal_mode=WAL;")
+        self.conn.execute("PRAGMA synchronous=NORMAL;")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS local_searches (
+                key TEXT PRIMARY KEY,
+                job_title TEXT NOT NULL,
+                location TEXT NOT NULL,
+                country TEXT NOT NULL,
+                jobs TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                refresh_until REAL NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS query_log (
+                key TEXT NOT NULL,
+                job_title TEXT NOT NULL,
+                location TEXT NOT NULL,
+                country TEXT NOT NULL,
+                searched_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_query_log_searched_at ON query_log(searched_at);
+            """
+        )
+
+    @staticmethod
+    def key(job_title: str, location: str, country: str) -> str:
+        return SingleFlight.key(("local", job_title, location, country))
+
+    def get(self, job_title: str, location: str, country: str) -> Optional[CachedSearch]:
+        """Cached result no older than max_stale, or None"""
+        row = self.conn.execute(
+            "SELECT jobs, fetched_at FROM local_searches WHERE key = ?",
+            (self.key(job_title, location, country),),
+        ).fetchone()
+        if row is None:
+            return None
+        jobs, fetched_at = row
+        age = time.time() - fetched_at
+        if age > self.max_stale:
+            return None
+        return CachedSearch(records=json.loads(jobs), fetched_at=fetched_at, fresh=age <= self.fresh_ttl)
+
+    def put(self, job_title: str, location: str, country: str, records: list):
+        with self.conn:
+            self.conn.execute(
+                """
+                INSERT INTO local_searches(key, job_title, location, country, jobs, fetched_at, refresh_until)
+                VALUES(?, ?, ?, ?, ?, ?, 0)
+                ON CONFLICT(key) DO UPDATE SET
+                    jobs=excluded.jobs,
+                    fetched_at=excluded.fetched_at,
+                    refresh_until=0;
+                """,
+                (self.key(job_title, location, country), job_title, location, country,
+                 json.dumps(records, ensure_ascii=False, separators=(",", ":")), time.time()),
+            )
+
+    def claim_refresh(self, job_title: str, location: str, country: str) -> bool:
+        """True for exactly one caller per REFRESH_LEASE window"""
+        now = time.time()
+        with self.conn:
+            cursor = self.conn.execute(
+                "UPDATE local_searches SET refresh_until = ? WHERE key = ? AND refresh_until < ?",
+                (now + REFRESH_LEASE, self.key(job_title, location, country), now),
+            )
+        return cursor.rowcount == 1
+
+    def log_query(self, job_title: str, location: str, country: str):
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO query_log(key, job_title, location, country, searched_at) VALUES(?, ?, ?, ?, ?)",
+                (self.key(job_title, location, country), job_title, location, country, time.time()),
+            )
+
+    def popular(self, limit: int, window: float = QUERY_LOG_WINDOW) -> list[tuple[str, str, str]]:
+        """Most searched (title, location, country) in the window, most popular first"""
+        rows = self.conn.execute(
+            """
+            SELECT job_title, location, country, COUNT(*) AS hits
+            FROM query_log
+            WHERE searched_at >= ?
+            GROUP BY key
+            ORDER BY hits DESC
+            LIMIT ?
+            """,
+            (time.time() - window, limit),
+        ).fetchall()
+        return [(title, location, country) for title, location, country, _ in rows]
+
+    def prune_query_log(self, window: float = QUERY_LOG_WINDOW):
+        with self.conn:
+            self.conn.execute("DELETE FROM query_log WHERE searched_at < ?", (time.time() - window,))
+
+    def close(self):
+        self.conn.close()
@@ -14,15 +14,38 @@ Sources (free API key required - for location-based search):
 
 import requests
 import json
+import codecs
 import csv
 import os
+import random
 import re
-from datetime import datetime
-from typing import Optional
-from dataclasses import dataclass, asdict
-from urllib.parse import quote
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from html import unescape
+from typing import Callable, Iterable, Iterator, Optional
+from dataclasses import dataclass, asdict, fields
+from urllib.parse import quote, urlsplit
 from pathlib import Path
 
+from scrape_metrics import (
+    MetricsRecorder,
+    TimedHTTPAdapter,
+    append_json_record,
+    instrumented,
+    write_prometheus_textfile,
+)
+from job_cache import FRESH_TTL, MAX_STALE, LocalJobCache
+from locations import LocationIndex, location_region, normalize_location
+from rate_limit import HostRateLimiter
+from salary import ADZUNA_CURRENCIES, SalaryIndex, parse_salary, salary_fields, salary_range
+from single_flight import SingleFlight
+
 # Load environment variables from .env file (check both current dir and parent/project root)
 try:
     from dotenv import load_dotenv
@@ -30,18 +53,41 @@ try:
     project_root_env = Path(__file__).resolve().parent.parent / '.env'
     if project_root_env.exists():
         load_dotenv(project_root_env)
-        print(f"Loaded .env from: {project_root_env}")
+        print(f"Loaded .env from: {project_root_env}", file=sys.stderr)
     else:
         # Fallback to current directory
         load_dotenv()
 except ImportError:
-    print("Warning: python-dotenv not installed. Install with: pip install python-dotenv")
+    print("Warning: python-dotenv not installed. Install with: pip install python-dotenv", file=sys.stderr)
     pass  # python-dotenv not installed, will use system env vars
 
 
-@dataclass
+# Low-cardinality Job fields that are interned and dictionary-encoded in JobBatch
+CATEGORICAL_FIELDS = ("source", "job_type", "location", "salary_currency", "salary_period", "location_id", "region_id")
+
+
+def _intern(value):
+    """
+    Intern repeated categorical strings so equal values share one object.
+    Lists (e.g. Jobicy's jobType) become hashable tuples of interned strings.
+    """
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, list):
+        return tuple(_intern(item) for item in value)
+    return value
+
+
+@dataclass(slots=True, frozen=True)
 class Job:
-    """Standardized job listing structure"""
+    """
+    Standardized job listing structure
+
+    Slotted and immutable so large scrape batches carry no per-instance __dict__.
+    Categorical fields (source, job_type, location, salary currency/period) are
+    interned and tags are stored as a tuple of interned strings. location_id
+    and region_id are filled from the location via the PH gazetteer.
+    """
     title: str
     company: str
     location: str
@@ -51,7 +97,113 @@ class Job:
     job_type: Optional[str] = None
     description: Optional[str] = None
     posted_date: Optional[str] = None
-    tags: Optional[list] = None
+    tags: Optional[tuple] = None
+    # Normalized pay: annual amounts in salary.BASE_CURRENCY, original currency and period
+    salary_min: Optional[float] = None
+    salary_max: Optional[float] = None
+    salary_currency: Optional[str] = None
+    salary_period: Optional[str] = None
+    # Canonical gazetteer place (e.g. "bgc", "taguig", "remote") and its region (e.g. "ncr")
+    location_id: Optional[str] = None
+    region_id: Optional[str] = None
+
+    def __post_init__(self):
+        if self.location_id is None:
+            object.__setattr__(self, "location_id", normalize_location(self.location))
+            object.__setattr__(self, "region_id", location_region(self.location))
+        for name in CATEGORICAL_FIELDS:
+            object.__setattr__(self, name, _intern(getattr(self, name)))
+        if self.tags is not None:
+            object.__setattr__(self, "tags", tuple(_intern(tag) for tag in self.tags))
+
+
+class JobBatch:
+    """
+    Columnar (struct-of-arrays) container for large scrape batches
+
+    Categorical fields are dictionary-encoded: each row stores a small integer
+    code and the distinct values live once in a per-column category list, so
+    equality filters compare integers instead of strings.
+    """
+
+    __slots__ = ("columns", "codes", "categories", "_category_index")
+
+    def __init__(self, jobs: Iterable[Job] = ()):
+        self.columns: dict[str, list] = {
+            f.name: [] for f in fields(Job) if f.name not in CATEGORICAL_FIELDS
+        }
+        self.codes: dict[str, array] = {name: array("I") for name in CATEGORICAL_FIELDS}
+        self.categories: dict[str, list] = {name: [] for name in CATEGORICAL_FIELDS}
+        self._category_index: dict[str, dict] = {name: {} for name in CATEGORICAL_FIELDS}
+        self.extend(jobs)
+
+    def __len__(self) -> int:
+        return len(self.codes["source"])
+
+    def __iter__(self) -> Iterator[Job]:
+        for i in range(len(self)):
+            yield self.job(i)
+
+    def _encode(self, name: str, value) -> int:
+        index = self._category_index[name]
+        code = index.get(value)
+        if code is None:
+            code = index[value] = len(self.categories[name])
+            self.categories[name].append(_intern(value))
+        return code
+
+    def append(self, job: Job):
+        for name, column in self.columns.items():
+            column.append(getattr(job, name))
+        for name in CATEGORICAL_FIELDS:
+            self.codes[name].append(self._encode(name, getattr(job, name)))
+
+    def extend(self, jobs: Iterable[Job]):
+        for job in jobs:
+            self.append(job)
+
+    def column(self, name: str) -> list:
+        """Decoded values of one column"""
+        if name in CATEGORICAL_FIELDS:
+            values = self.categories[name]
+            return [values[code] for code in self.codes[name]]
+        return self.columns[name]
+
+    def job(self, i: int) -> Job:
+        """Materialize row i as a Job"""
+        row = {name: column[i] for name, column in self.columns.items()}
+        for name in CATEGORICAL_FIELDS:
+            row[name] = self.categories[name][self.codes[name][i]]
+        return Job(**row)
+
+    def indices_where(self, name: str, value) -> list[int]:
+        """Row indices whose field equals value (integer compare for categorical fields)"""
+        if name in CATEGORICAL_FIELDS:
+            code = self._category_index[name].get(value)
+            if code is None:
+                return []
+            return [i for i, c in enumerate(self.codes[name]) if c == code]
+        return [i for i, v in enumerate(self.columns[name]) if v == value]
+
+    def take(self, indices: Iterable[int]) -> "JobBatch":
+        """New batch containing only the given rows"""
+        return JobBatch(self.job(i) for i in indices)
+
+    def filter(self, **equals) -> "JobBatch":
+        """New batch with rows matching every field=value pair"""
+        selected = None
+        for name, value in equals.items():
+            matches = set(self.indices_where(name, value))
+            selected = matches if selected is None else selected & matches
+        if selected is None:
+            return self.take(range(len(self)))
+        return self.take(sorted(selected))
+
+    def to_dicts(self) -> list[dict]:
+        """Row-oriented export matching asdict(Job)"""
+        names = [f.name for f in fields(Job)]
+        columns = [self.column(name) for name in names]
+        return [dict(zip(names, row)) for row in zip(*columns)]
 
 
 # Common skills/tools to extract from job descriptions
@@ -78,43 +230,392 @@ COMMON_SKILLS = [
 ]
 
 
+def log(message: str = "") -> None:
+    """Print progress to stderr so stdout stays clean for JSON output"""
+    print(message, file=sys.stderr)
+
+
+# One alternation over every skill, longest first so "JavaScript" wins over "Java"
+_SKILL_NAMES = {skill.lower(): skill for skill in COMMON_SKILLS}
+_SKILL_ORDER = {skill: i for i, skill in enumerate(COMMON_SKILLS)}
+_SKILL_PATTERN = re.compile(
+    r'\b(?:' + '|'.join(re.escape(s) for s in sorted(_SKILL_NAMES, key=len, reverse=True)) + r')\b'
+)
+
+
 def extract_skills_from_text(text: str) -> list[str]:
-    """Extract common skills mentioned in job description"""
+    """Extract common skills mentioned in job description (one regex pass over the text)"""
     if not text:
         return []
 
-    text_lower = text.lower()
-    found_skills = []
+    found = {_SKILL_NAMES[match] for match in _SKILL_PATTERN.findall(text.lower())}
+    return sorted(found, key=_SKILL_ORDER.__getitem__)
+
+
+# Max characters of cleaned description text stored per job
+DESCRIPTION_LIMIT = 500
 
-    for skill in COMMON_SKILLS:
-        # Check for skill mention (case-insensitive, word boundary)
-        skill_lower = skill.lower()
-        if skill_lower in text_lower:
-            # Verify it's a word boundary match (not part of another word)
-            pattern = r'\b' + re.escape(skill_lower) + r'\b'
-            if re.search(pattern, text_lower):
-                found_skills.append(skill)
+# Script/style blocks, comments and tags (including one cut off at the end) are
+# all dropped in one substitution; a bare "<" in prose is left alone
+_HTML_MARKUP = re.compile(r'<(script|style)\b.*?</\1\s*>|<!--.*?-->|</?[a-zA-Z!][^>]*(?:>|$)', re.S | re.I)
 
-    return found_skills
+
+def html_to_text(html: Optional[str]) -> str:
+    """Strip HTML markup and entities, collapsing whitespace to single spaces"""
+    if not html:
+        return ""
+    if "<" in html:
+        html = _HTML_MARKUP.sub(" ", html)
+    if "&" in html:
+        html = unescape(html)
+    return " ".join(html.split())
+
+
+def process_description(raw: Optional[str]) -> tuple[Optional[str], list[str]]:
+    """
+    Description pipeline stage: HTML -> text, extract skills from the full
+    text, and only then truncate to DESCRIPTION_LIMIT characters.
+
+    Returns (truncated text or None, skills found in the full text).
+    """
+    text = html_to_text(raw) if isinstance(raw, str) else ""
+    if not text:
+        return None, []
+    return text[:DESCRIPTION_LIMIT], extract_skills_from_text(text)
+
+
+def merge_tags(tags: Optional[list], skills: list[str]) -> list:
+    """Source tags followed by extracted skills they do not already mention"""
+    merged = list(tags or [])
+    seen = {str(tag).lower() for tag in merged}
+    merged.extend(skill for skill in skills if skill.lower() not in seen)
+    return merged
+
+
+def remoteok_job(job_data: dict) -> Job:
+    """Map one RemoteOK API item to a Job"""
+    salary = ""
+    if job_data.get("salary_min") and job_data.get("salary_max"):
+        salary = f"${job_data['salary_min']:,} - ${job_data['salary_max']:,}"
+
+    description, skills = process_description(job_data.get("description"))
+    return Job(
+        title=job_data.get("position", ""),
+        company=job_data.get("company", ""),
+        location=job_data.get("location", "Remote"),
+        url=job_data.get("url", ""),
+        source="RemoteOK",
+        salary=salary,
+        job_type="Remote",
+        **salary_fields(salary_range(job_data.get("salary_min"), job_data.get("salary_max"), "USD")),
+        description=description,
+        posted_date=job_data.get("date", ""),
+        tags=merge_tags(job_data.get("tags", []), skills)
+    )
+
+
+# Requests per second and burst size per upstream host; unlisted hosts use the default
+HOST_RATE_LIMITS = {
+    "jsearch.p.rapidapi.com": (1.0, 2),
+    "api.adzuna.com": (2.0, 4),
+    "remoteok.com": (0.5, 1),
+}
+DEFAULT_RATE_LIMIT = (5.0, 5)
+
+# (connect, read) timeout in seconds
+REQUEST_TIMEOUT = (5, 30)
+
+# Statuses worth retrying; anything else is returned to the caller as-is
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Where circuit breaker state is shared between scraper processes
+CIRCUIT_STATE_FILE = Path(tempfile.gettempdir()) / "job_scraper_circuits.json"
+
+
+class SourceUnavailable(requests.RequestException):
+    """Raised instead of calling a source whose circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """
+    Skips a source after `threshold` consecutive failures for `cooldown` seconds.
+
+    State is persisted to a small JSON file so a dead upstream is skipped by
+    every scraper process, not only the one that saw it fail.
+    """
+
+    def __init__(self, threshold: int = 3, cooldown: float = 300, state_file: Optional[Path] = CIRCUIT_STATE_FILE):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state_file = state_file
+        self.lock = threading.Lock()
+        self.state: dict[str, dict] = self._load()
+
+    def _load(self) -> dict:
+        if not self.state_file:
+            return {}
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        if not self.state_file:
+            return
+        tmp = self.state_file.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.state, f)
+            os.replace(tmp, self.state_file)
+        except OSError:
+            pass  # Breaker state is an optimisation; never fail a scrape over it
+
+    def allow(self, source: str) -> bool:
+        with self.lock:
+            entry = self.state.get(source)
+            return not entry or entry.get("open_until", 0) <= time.time()
+
+    def record_success(self, source: str):
+        with self.lock:
+            if self.state.pop(source, None) is not None:
+                self._save()
+
+    def record_failure(self, source: str):
+        with self.lock:
+            entry = self.state.setdefault(source, {"failures": 0, "open_until": 0})
+            entry["failures"] += 1
+            if entry["failures"] >= self.threshold:
+                entry["open_until"] = time.time() + self.cooldown
+                log(f"  Circuit open for {source} for {self.cooldown:.0f}s after {entry['failures']} failures")
+            self._save()
+
+
+def retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Parse a Retry-After header given either as seconds or as an HTTP date"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+_JSON_WHITESPACE = " \t\n\r"
+
+
+class _JsonStream:
+    """Incrementally decoded text of a streamed response body"""
+
+    def __init__(self, response: requests.Response, chunk_size: int):
+        self.chunks = response.iter_content(chunk_size=chunk_size)
+        self.decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+        self.decoder_json = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.exhausted = False
+
+    def fill(self) -> bool:
+        """Append the next chunk to the buffer, dropping consumed text. False at EOF."""
+        if self.exhausted:
+            return False
+        self.buffer = self.buffer[self.pos:]
+        self.pos = 0
+        try:
+            self.buffer += self.decoder.decode(next(self.chunks))
+        except StopIteration:
+            self.buffer += self.decoder.decode(b"", final=True)
+            self.exhausted = True
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character, or '' at EOF"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _JSON_WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self.buffer, self.pos)
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value, reading more chunks as needed"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder_json.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A number cut at the chunk boundary still decodes; make sure it is complete
+            if end == len(self.buffer) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_array(response: requests.Response, key: Optional[str] = None, chunk_size: int = 65536) -> Iterator:
+    """
+    Yield the items of a JSON array from a streamed response one at a time.
+
+    With key=None the body itself must be an array; otherwise the array is the
+    value of that key in a top-level object. Only the current item and one
+    chunk of undecoded text are held in memory, never the whole body.
+    """
+    stream = _JsonStream(response, chunk_size)
+
+    if key is not None:
+        stream.expect("{")
+        while True:
+            if stream.peek() == "}":
+                return  # Key not present
+            name = stream.value()
+            stream.expect(":")
+            if name == key:
+                break
+            stream.value()  # Skip sibling values such as legal notices and counts
+            if stream.peek() == ",":
+                stream.pos += 1
+
+    if stream.peek() == "n":
+        stream.value()  # null array
+        return
+
+    stream.expect("[")
+    if stream.peek() == "]":
+        return
+    while True:
+        yield stream.value()
+        char = stream.peek()
+        if char == ",":
+            stream.pos += 1
+        elif char == "]":
+            return
+        else:
+            raise json.JSONDecodeError("Expecting ',' or ']'", stream.buffer, stream.pos)
 
 
 class JobScraper:
     """Scrapes job listings from multiple open APIs"""
 
-    def __init__(self):
+    # Retry policy for transient upstream failures
+    max_retries = 3
+    backoff_base = 0.5
+    backoff_cap = 8.0
+
+    def __init__(
+        self,
+        on_jobs: Optional[Callable[[list[Job]], None]] = None,
+        retain_jobs: bool = True,
+        single_flight: Optional[SingleFlight] = None,
+        cache: Optional[LocalJobCache] = None
+    ):
+        """
+        Args:
+            on_jobs: Called with each source's jobs as soon as that source returns
+            retain_jobs: Keep jobs in self.jobs (disable when streaming via on_jobs)
+            single_flight: Coalesce identical concurrent local searches across processes
+            cache: Stale-while-revalidate cache for local searches
+        """
         self.jobs: list[Job] = []
+        self.job_count = 0
+        self.on_jobs = on_jobs
+        self.retain_jobs = retain_jobs
+        self.single_flight = single_flight
+        self.cache = cache
+        self._salary_index: Optional[SalaryIndex] = None
+        self._location_index: Optional[LocationIndex] = None
         self.session = requests.Session()
         self.session.headers.update({
             "User-Agent": "JobScraper/1.0 (Educational Purpose)"
         })
+        self.metrics = MetricsRecorder()
+        # Size the pool so concurrent fetches to one host reuse connections
+        adapter = TimedHTTPAdapter(self.metrics, pool_connections=16, pool_maxsize=16)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.rate_limiter = HostRateLimiter(HOST_RATE_LIMITS, DEFAULT_RATE_LIMIT)
+        self.circuit_breaker = CircuitBreaker()
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    def _get(self, source: str, url: str, **kwargs) -> requests.Response:
+        """
+        GET with per-host rate limiting, jittered retries and a per-source circuit breaker.
 
-    def fetch_remotive_jobs(self, category: Optional[str] = None, limit: int = 50) -> list[Job]:
+        Retries connection errors, timeouts and RETRY_STATUSES, honouring
+        Retry-After when the upstream sends one. Raises SourceUnavailable while
+        the source's circuit is open.
         """
-        Fetch remote jobs from Remotive API
+        if not self.circuit_breaker.allow(source):
+            raise SourceUnavailable(f"{source} is failing, skipped until its circuit closes")
+
+        kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+        host = urlsplit(url).hostname or ""
+
+        for attempt in range(self.max_retries + 1):
+            started = time.perf_counter()
+            self.rate_limiter.acquire(host)
+            requested = time.perf_counter()
+            self.metrics.record_wait(requested - started)
+            try:
+                response = self.session.get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    self.circuit_breaker.record_failure(source)
+                    raise
+                delay = self._backoff(attempt)
+            else:
+                self.metrics.track_response(response, time.perf_counter() - requested, kwargs.get("stream", False))
+                if response.status_code not in RETRY_STATUSES:
+                    self.circuit_breaker.record_success(source)
+                    return response
+                delay = retry_after_seconds(response)
+                if delay is None:
+                    delay = self._backoff(attempt)
+                # Give up rather than sleep past the cap; the caller sees the error status
+                if attempt == self.max_retries or delay > self.backoff_cap:
+                    self.circuit_breaker.record_failure(source)
+                    return response
+                response.close()
+
+            log(f"  Retrying {source} in {delay:.1f}s (attempt {attempt + 2}/{self.max_retries + 1})")
+            self.metrics.record_retry()
+            self.metrics.record_wait(delay)
+            time.sleep(delay)
+
+    def _collect(self, source: str, jobs: list[Job]) -> list[Job]:
+        """Record jobs returned by one source and hand them to the on_jobs sink"""
+        log(f"  Found {len(jobs)} jobs from {source}")
+        self.job_count += len(jobs)
+        if self.retain_jobs:
+            self.jobs.extend(jobs)
+            self._salary_index = None
+            self._location_index = None
+        if self.on_jobs:
+            self.on_jobs(jobs)
+        return jobs
+
+    def iter_remotive_jobs(self, category: Optional[str] = None, limit: int = 50) -> Iterator[Job]:
+        """
+        Stream remote jobs from Remotive API, yielding each Job as it is parsed
         Categories: software-dev, customer-support, design, marketing, sales, etc.
         API Docs: https://remotive.com/api/remote-jobs
         """
-        print("Fetching jobs from Remotive...")
         url = "https://remotive.com/api/remote-jobs"
         params = {}
         if category:
@@ -122,14 +623,13 @@ class JobScraper:
         if limit:
             params["limit"] = limit
 
-        try:
-            response = self.session.get(url, params=params, timeout=30)
+        with self._get("Remotive", url, params=params, stream=True) as response:
             response.raise_for_status()
-            data = response.json()
-
-            jobs = []
-            for job_data in data.get("jobs", []):
-                job = Job(
+            for job_data in iter_json_array(response, key="jobs"):
+                if not isinstance(job_data, dict):
+                    continue
+                description, skills = process_description(job_data.get("description"))
+                yield Job(
                     title=job_data.get("title", ""),
                     company=job_data.get("company_name", ""),
                     location=job_data.get("candidate_required_location", "Remote"),
@@ -137,82 +637,79 @@ class JobScraper:
                     source="Remotive",
                     salary=job_data.get("salary", ""),
                     job_type=job_data.get("job_type", ""),
-                    description=job_data.get("description", "")[:500] if job_data.get("description") else None,
+                    **salary_fields(parse_salary(job_data.get("salary"), default_currency="USD")),
+                    description=description,
                     posted_date=job_data.get("publication_date", ""),
-                    tags=job_data.get("tags", [])
+                    tags=merge_tags(job_data.get("tags", []), skills)
                 )
-                jobs.append(job)
 
-            print(f"  Found {len(jobs)} jobs from Remotive")
-            self.jobs.extend(jobs)
-            return jobs
+    @instrumented("Remotive")
+    def fetch_remotive_jobs(self, category: Optional[str] = None, limit: int = 50) -> list[Job]:
+        """
+        Fetch remote jobs from Remotive API
+        Categories: software-dev, customer-support, design, marketing, sales, etc.
+        API Docs: https://remotive.com/api/remote-jobs
+        """
+        log("Fetching jobs from Remotive...")
+        try:
+            jobs = list(self.iter_remotive_jobs(category=category, limit=limit))
+            return self._collect("Remotive", jobs)
 
-        except requests.RequestException as e:
-            print(f"  Error fetching from Remotive: {e}")
+        except (requests.RequestException, ValueError) as e:
+            self.metrics.record_error(e)
+            log(f"  Error fetching from Remotive: {e}")
             return []
 
-    def fetch_remoteok_jobs(self, tag: Optional[str] = None) -> list[Job]:
+    def iter_remoteok_jobs(self, tag: Optional[str] = None) -> Iterator[Job]:
         """
-        Fetch remote tech jobs from RemoteOK API
+        Stream remote tech jobs from RemoteOK API, yielding each Job as it is parsed
         API: https://remoteok.com/api
         """
-        print("Fetching jobs from RemoteOK...")
         url = "https://remoteok.com/api"
         if tag:
             url = f"https://remoteok.com/api?tag={tag}"
 
-        try:
-            response = self.session.get(url, timeout=30)
+        with self._get("RemoteOK", url, stream=True) as response:
             response.raise_for_status()
-            data = response.json()
-
-            jobs = []
-            # First item is usually metadata, skip it
-            for job_data in data[1:] if len(data) > 1 else []:
-                if not isinstance(job_data, dict):
+            for index, job_data in enumerate(iter_json_array(response)):
+                # First item is usually metadata, skip it
+                if index == 0 or not isinstance(job_data, dict):
                     continue
+                yield remoteok_job(job_data)
 
-                salary = ""
-                if job_data.get("salary_min") and job_data.get("salary_max"):
-                    salary = f"${job_data['salary_min']:,} - ${job_data['salary_max']:,}"
-
-                job = Job(
-                    title=job_data.get("position", ""),
-                    company=job_data.get("company", ""),
-                    location=job_data.get("location", "Remote"),
-                    url=job_data.get("url", ""),
-                    source="RemoteOK",
-                    salary=salary,
-                    job_type="Remote",
-                    description=job_data.get("description", "")[:500] if job_data.get("description") else None,
-                    posted_date=job_data.get("date", ""),
-                    tags=job_data.get("tags", [])
-                )
-                jobs.append(job)
-
-            print(f"  Found {len(jobs)} jobs from RemoteOK")
-            self.jobs.extend(jobs)
-            return jobs
+    @instrumented("RemoteOK")
+    def fetch_remoteok_jobs(self, tag: Optional[str] = None) -> list[Job]:
+        """
+        Fetch remote tech jobs from RemoteOK API
+        API: https://remoteok.com/api
+        """
+        log("Fetching jobs from RemoteOK...")
+        try:
+            jobs = list(self.iter_remoteok_jobs(tag=tag))
+            return self._collect("RemoteOK", jobs)
 
-        except requests.RequestException as e:
-            print(f"  Error fetching from RemoteOK: {e}")
+        except (requests.RequestException, ValueError) as e:
+            self.metrics.record_error(e)
+            log(f"  Error fetching from RemoteOK: {e}")
             return []
 
+    @instrumented("Arbeitnow")
     def fetch_arbeitnow_jobs(self, page: int = 1) -> list[Job]:
         """
         Fetch jobs from Arbeitnow API (European focus)
         API Docs: https://www.arbeitnow.com/api/job-board-api
         """
-        print("Fetching jobs from Arbeitnow...")
+        log("Fetching jobs from Arbeitnow...")
         url = f"https://www.arbeitnow.com/api/job-board-api?page={page}"
 
         try:
-            response = self.session.get(url, timeout=30)
+            response = self._get("Arbeitnow", url)
             response.raise_for_status()
             data = response.json()
 
             jobs = []
             for job_data in data.get("data", []):
+                description, skills = process_description(job_data.get("description"))
                 job = Job(
                     title=job_data.get("title", ""),
                     company=job_data.get("company_name", ""),
@@ -221,26 +718,26 @@ class JobScraper:
                     source="Arbeitnow",
                     salary=None,
                     job_type="Remote" if job_data.get("remote") else "On-site",
-                    description=job_data.get("description", "")[:500] if job_data.get("description") else None,
+                    description=description,
                     posted_date=job_data.get("created_at", ""),
-                    tags=job_data.get("tags", [])
+                    tags=merge_tags(job_data.get("tags", []), skills)
                 )
                 jobs.append(job)
 
-            print(f"  Found {len(jobs)} jobs from Arbeitnow")
-            self.jobs.extend(jobs)
-            return jobs
+            return self._collect("Arbeitnow", jobs)
 
         except requests.RequestException as e:
-            print(f"  Error fetching from Arbeitnow: {e}")
+            self.metrics.record_error(e)
+            log(f"  Error fetching from Arbeitnow: {e}")
             return []
 
+    @instrumented("Jobicy")
     def fetch_github_jobs_alternative(self, description: str = "python") -> list[Job]:
         """
         Fetch jobs from Jobs.GitHub.com alternative - using Jobicy API
         API: https://jobicy.com/api/v2/remote-jobs
         """
-        print("Fetching jobs from Jobicy...")
+        log("Fetching jobs from Jobicy...")
         url = "https://jobicy.com/api/v2/remote-jobs"
         params = {
             "count": 50,
@@ -248,12 +745,13 @@ class JobScraper:
         }
 
         try:
-            response = self.session.get(url, params=params, timeout=30)
+            response = self._get("Jobicy", url, params=params)
             response.raise_for_status()
             data = response.json()
 
             jobs = []
             for job_data in data.get("jobs", []):
+                description, skills = process_description(job_data.get("jobExcerpt"))
                 job = Job(
                     title=job_data.get("jobTitle", ""),
                     company=job_data.get("companyName", ""),
@@ -261,21 +759,29 @@ class JobScraper:
                     url=job_data.get("url", ""),
                     source="Jobicy",
                     salary=job_data.get("annualSalaryMin", ""),
+                    **salary_fields(salary_range(
+                        job_data.get("annualSalaryMin"),
+                        job_data.get("annualSalaryMax"),
+                        job_data.get("salaryCurrency") or "USD"
+                    )),
                     job_type=job_data.get("jobType", ""),
-                    description=job_data.get("jobExcerpt", ""),
+                    description=description,
                     posted_date=job_data.get("pubDate", ""),
-                    tags=job_data.get("jobIndustry", []) if isinstance(job_data.get("jobIndustry"), list) else []
+                    tags=merge_tags(
+                        job_data.get("jobIndustry", []) if isinstance(job_data.get("jobIndustry"), list) else [],
+                        skills
+                    )
                 )
                 jobs.append(job)
 
-            print(f"  Found {len(jobs)} jobs from Jobicy")
-            self.jobs.extend(jobs)
-            return jobs
+            return self._collect("Jobicy", jobs)
 
         except requests.RequestException as e:
-            print(f"  Error fetching from Jobicy: {e}")
+            self.metrics.record_error(e)
+            log(f"  Error fetching from Jobicy: {e}")
             return []
 
+    @instrumented("Adzuna")
     def fetch_adzuna_jobs(
         self,
         query: str = "developer",
@@ -296,11 +802,12 @@ class JobScraper:
         api_key = os.environ.get("ADZUNA_API_KEY")
 
         if not app_id or not api_key:
-            print("Skipping Adzuna - Set ADZUNA_APP_ID and ADZUNA_API_KEY env vars")
-            print("  Get free API key at: https://developer.adzuna.com/")
+            log("Skipping Adzuna - Set ADZUNA_APP_ID and ADZUNA_API_KEY env vars")
+            log("  Get free API key at: https://developer.adzuna.com/")
+            self.metrics.record_skip()
             return []
 
-        print(f"Fetching jobs from Adzuna ({country.upper()})...")
+        log(f"Fetching jobs from Adzuna ({country.upper()})...")
         url = f"https://api.adzuna.com/v1/api/jobs/{country}/search/1"
 
         params = {
@@ -315,7 +822,7 @@ class JobScraper:
             params["where"] = location
 
         try:
-            response = self.session.get(url, params=params, timeout=30)
+            response = self._get("Adzuna", url, params=params)
             response.raise_for_status()
             data = response.json()
 
@@ -327,6 +834,7 @@ class JobScraper:
                 elif job_data.get("salary_min"):
                     salary = f"From {job_data['salary_min']:,.0f}"
 
+                description, skills = process_description(job_data.get("description"))
                 job = Job(
                     title=job_data.get("title", ""),
                     company=job_data.get("company", {}).get("display_name", ""),
@@ -335,20 +843,28 @@ class JobScraper:
                     source="Adzuna",
                     salary=salary,
                     job_type=job_data.get("contract_type", ""),
-                    description=job_data.get("description", "")[:500] if job_data.get("description") else None,
+                    **salary_fields(salary_range(
+                        job_data.get("salary_min"),
+                        job_data.get("salary_max"),
+                        ADZUNA_CURRENCIES.get(country.lower())
+                    )),
+                    description=description,
                     posted_date=job_data.get("created", ""),
-                    tags=job_data.get("category", {}).get("label", "").split(", ") if job_data.get("category") else []
+                    tags=merge_tags(
+                        job_data.get("category", {}).get("label", "").split(", ") if job_data.get("category") else [],
+                        skills
+                    )
                 )
                 jobs.append(job)
 
-            print(f"  Found {len(jobs)} jobs from Adzuna")
-            self.jobs.extend(jobs)
-            return jobs
+            return self._collect("Adzuna", jobs)
 
         except requests.RequestException as e:
-            print(f"  Error fetching from Adzuna: {e}")
+            self.metrics.record_error(e)
+            log(f"  Error fetching from Adzuna: {e}")
             return []
 
+    @instrumented("JSearch")
     def fetch_jsearch_jobs(
         self,
         query: str = "python developer",
@@ -367,11 +883,12 @@ class JobScraper:
         api_key = os.environ.get("RAPIDAPI_KEY")
 
         if not api_key:
-            print("Skipping JSearch - Set RAPIDAPI_KEY env var")
-            print("  Get free API key at: https://rapidapi.com/letscrape-6bRBa3QguO5/api/jsearch")
+            log("Skipping JSearch - Set RAPIDAPI_KEY env var")
+            log("  Get free API key at: https://rapidapi.com/letscrape-6bRBa3QguO5/api/jsearch")
+            self.metrics.record_skip()
             return []
 
-        print(f"Fetching jobs from JSearch (query: '{query}', location: '{location}')...")
+        log(f"Fetching jobs from JSearch (query: '{query}', location: '{location}')...")
 
         # Combine query and location
         search_query = f"{query} in {location}" if location else query
@@ -388,7 +905,7 @@ class JobScraper:
         }
 
         try:
-            response = self.session.get(url, headers=headers, params=params, timeout=30)
+            response = self._get("JSearch", url, headers=headers, params=params)
             response.raise_for_status()
             data = response.json()
 
@@ -432,40 +949,53 @@ class JobScraper:
                             if years > 0:
                                 skills.append(f"Experience: {years}+ years")
 
-                # If no structured skills found, extract from description
+                # If no structured skills found, use those extracted from the full description
+                description, description_skills = process_description(job_data.get("job_description"))
                 if not skills:
-                    description = job_data.get("job_description", "")
-                    skills = extract_skills_from_text(description)
+                    skills = description_skills
 
                 job = Job(
                     title=job_data.get("job_title", ""),
                     company=job_data.get("employer_name", ""),
-                    location=f"{job_data.get('job_city', '')} {job_data.get('job_state', '')} {job_data.get('job_country', '')}".strip(),
+                    location=", ".join(
+                        part.strip() for part in (
+                            job_data.get("job_city"), job_data.get("job_state"), job_data.get("job_country")
+                        ) if part and part.strip()
+                    ),
                     url=job_data.get("job_apply_link", "") or job_data.get("job_google_link", ""),
                     source="JSearch",
                     salary=salary,
                     job_type=job_data.get("job_employment_type", ""),
-                    description=job_data.get("job_description", "")[:500] if job_data.get("job_description") else None,
+                    **salary_fields(salary_range(
+                        job_data.get("job_min_salary"),
+                        job_data.get("job_max_salary"),
+                        job_data.get("job_salary_currency"),
+                        job_data.get("job_salary_period")
+                    )),
+                    description=description,
                     posted_date=job_data.get("job_posted_at_datetime_utc", ""),
                     tags=skills
                 )
                 jobs.append(job)
 
-            print(f"  Found {len(jobs)} jobs from JSearch")
-            self.jobs.extend(jobs)
-            return jobs
+            return self._collect("JSearch", jobs)
 
         except requests.RequestException as e:
-            print(f"  Error fetching from JSearch: {e}")
+            self.metrics.record_error(e)
+            log(f"  Error fetching from JSearch: {e}")
             return []
 
     def fetch_all_jobs(self, search_term: Optional[str] = None) -> list[Job]:
         """Fetch jobs from all available sources"""
-        print(f"\n{'='*60}")
-        print("Starting job scraping from all sources...")
-        print(f"{'='*60}\n")
+        log(f"\n{'='*60}")
+        log("Starting job scraping from all sources...")
+        log(f"{'='*60}\n")
 
         self.jobs = []  # Reset jobs list
+        self._salary_index = None
+        self._location_index = None
+        self.job_count = 0
+        self.metrics.reset()
 
         # Fetch from all sources (all free, no auth required)
         self.fetch_remotive_jobs(limit=50)
@@ -477,9 +1007,9 @@ class JobScraper:
         self.fetch_adzuna_jobs(query=search_term or "developer")
         self.fetch_jsearch_jobs(query=search_term or "developer")
 
-        print(f"\n{'='*60}")
-        print(f"Total jobs collected: {len(self.jobs)}")
-        print(f"{'='*60}\n")
+        log(f"\n{'='*60}")
+        log(f"Total jobs collected: {self.job_count}")
+        log(f"{'='*60}\n")
 
         return self.jobs
 
@@ -487,35 +1017,96 @@ class JobScraper:
         self,
         job_title: str,
         location: str,
-        country_code: str = "ph"
+        country_code: str = "ph",
+        refresh: bool = False
     ) -> list[Job]:
         """
         Fetch jobs for a specific location (e.g., "Digital designer" in "Taguig City")
 
         This uses location-aware APIs (Adzuna, JSearch) to find local jobs.
+        With a cache configured, fresh or acceptably stale results are served
+        from it and stale ones are refreshed by a background process.
 
         Args:
             job_title: Job title to search (e.g., "Digital designer", "Python developer")
             location: City/area (e.g., "Taguig City", "Makati", "Manila")
             country_code: Country code for Adzuna (ph=Philippines, sg=Singapore, etc.)
+            refresh: Skip the cache read and fetch from upstream (still stores the result)
         """
-        print(f"\n{'='*60}")
-        print(f"Searching for '{job_title}' in '{location}'...")
-        print(f"{'='*60}\n")
+        log(f"\n{'='*60}")
+        log(f"Searching for '{job_title}' in '{location}'...")
+        log(f"{'='*60}\n")
 
         self.jobs = []  # Reset
+        self._salary_index = None
+        self._location_index = None
+        self.job_count = 0
+        self.metrics.reset()
+
+        cached = None
+        if self.cache is not None and not refresh:
+            self.cache.log_query(job_title, location, country_code)
+            cached = self.cache.get(job_title, location, country_code)
+
+        if cached is not None:
+            self._serve_records(cached.records, "hit" if cached.fresh else "stale")
+            if not cached.fresh and self.cache.claim_refresh(job_title, location, country_code):
+                log(f"  Cached result is {cached.age:.0f}s old, refreshing in the background")
+                spawn_background_refresh(job_title, location, country_code)
+        elif self.single_flight is None and self.cache is None:
+            self._fetch_local_sources(job_title, location, country_code)
+        else:
+            def fetch() -> list[dict]:
+                return [asdict(job) for job in self._fetch_local_sources(job_title, location, country_code)]
+
+            if self.single_flight is None:
+                records, shared = fetch(), False
+            else:
+                # A concurrent identical search in another process shares its result
+                records, shared = self.single_flight.run(("local", job_title, location, country_code), fetch)
+
+            if shared:
+                self._serve_records(records, "coalesced")
+            elif self.cache is not None and all(m.status != "error" for m in self.metrics.records):
+                # A failed source (including one whose circuit is open) would cache a partial
+                # result as complete; sources skipped for a missing API key are just not configured
+                self.cache.put(job_title, location, country_code, records)
+
+        log(f"\n{'='*60}")
+        log(f"Total local jobs found: {self.job_count}")
+        log(f"{'='*60}\n")
+
+        return self.jobs
 
+    def warm_local_cache(self, top: int = 20) -> int:
+        """Refresh the most popular local searches whose cache entry is not fresh"""
+        if self.cache is None:
+            return 0
+        self.cache.prune_query_log()
+        warmed = 0
+        for job_title, location, country_code in self.cache.popular(top):
+            cached = self.cache.get(job_title, location, country_code)
+            if cached is not None and cached.fresh:
+                continue
+            self.fetch_local_jobs(job_title, location, country_code, refresh=True)
+            warmed += 1
+        return warmed
+
+    def _serve_records(self, records: list[dict], cache_status: str):
+        """Emit jobs that came from the cache or another process instead of upstream"""
+        with self.metrics.fetch("Cache") as metrics:
+            metrics.cache = cache_status
+            jobs = self._collect(f"cache ({cache_status})", [Job(**record) for record in records])
+            metrics.job_count = len(jobs)
+
+    def _fetch_local_sources(self, job_title: str, location: str, country_code: str) -> list[Job]:
+        """Query the location-aware sources; returns their jobs even when not retained"""
         # JSearch works best for location-specific searches (aggregates LinkedIn, Indeed)
-        self.fetch_jsearch_jobs(query=job_title, location=location, num_pages=3)
+        jobs = self.fetch_jsearch_jobs(query=job_title, location=location, num_pages=3)
 
         # Adzuna with country code
-        self.fetch_adzuna_jobs(query=job_title, location=location, country=country_code)
-
-        print(f"\n{'='*60}")
-        print(f"Total local jobs found: {len(self.jobs)}")
-        print(f"{'='*60}\n")
-
-        return self.jobs
+        jobs += self.fetch_adzuna_jobs(query=job_title, location=location, country=country_code)
+        return jobs
 
     def filter_jobs(self, keyword: str) -> list[Job]:
         """Filter jobs by keyword in title or description"""
@@ -527,18 +1118,54 @@ class JobScraper:
             or (job.tags and any(keyword_lower in tag.lower() for tag in job.tags))
         ]
 
+    @property
+    def location_index(self) -> LocationIndex:
+        """Place → jobs index over self.jobs, rebuilt only after jobs change"""
+        if self._location_index is None:
+            self._location_index = LocationIndex(self.jobs)
+        return self._location_index
+
     def filter_by_location(self, location: str) -> list[Job]:
-        """Filter jobs by location (city, country, etc.)"""
+        """
+        Filter jobs by location (district, city, province, region, country or "remote").
+
+        Places known to the gazetteer match hierarchically ("Taguig" also returns
+        BGC jobs, "Metro Manila" every NCR city); anything else falls back to a
+        substring test on the raw location.
+        """
+        place_id = self.location_index.resolve(location)
+        if place_id is not None:
+            return list(self.location_index.jobs_in(place_id))
         location_lower = location.lower()
         return [
             job for job in self.jobs
             if location_lower in job.location.lower()
         ]
 
-    def search(self, keyword: Optional[str] = None, location: Optional[str] = None) -> list[Job]:
-        """Filter jobs by keyword AND/OR location"""
+    @property
+    def salary_index(self) -> SalaryIndex:
+        """Salary range index over self.jobs, rebuilt only after jobs change"""
+        if self._salary_index is None:
+            self._salary_index = SalaryIndex(self.jobs)
+        return self._salary_index
+
+    def filter_by_salary(self, min_salary: float) -> list[Job]:
+        """Jobs that can pay at least min_salary per year (in salary.BASE_CURRENCY), lowest first"""
+        return list(self.salary_index.at_least(min_salary))
+
+    def search(
+        self,
+        keyword: Optional[str] = None,
+        location: Optional[str] = None,
+        min_salary: Optional[float] = None
+    ) -> list[Job]:
+        """Filter jobs by keyword AND/OR location AND/OR minimum annual salary"""
         results = self.jobs
 
+        if min_salary is not None:
+            eligible = {id(job) for job in self.salary_index.at_least(min_salary)}
+            results = [job for job in results if id(job) in eligible]
+
         if keyword:
             keyword_lower = keyword.lower()
             results = [
@@ -549,11 +1176,8 @@ class JobScraper:
             ]
 
         if location:
-            location_lower = location.lower()
-            results = [
-                job for job in results
-                if location_lower in job.location.lower()
-            ]
+            matching = {id(job) for job in self.filter_by_location(location)}
+            results = [job for job in results if id(job) in matching]
 
         return results
 
@@ -562,17 +1186,16 @@ class JobScraper:
         jobs_to_save = jobs or self.jobs
         with open(filename, "w", encoding="utf-8") as f:
             json.dump([asdict(job) for job in jobs_to_save], f, indent=2, ensure_ascii=False)
-        print(f"Saved {len(jobs_to_save)} jobs to {filename}")
+        log(f"Saved {len(jobs_to_save)} jobs to {filename}")
 
     def save_to_csv(self, filename: str = "jobs.csv", jobs: Optional[list[Job]] = None):
         """Save jobs to CSV file"""
         jobs_to_save = jobs or self.jobs
         if not jobs_to_save:
-            print("No jobs to save")
+            log("No jobs to save")
             return
 
-        fieldnames = ["title", "company", "location", "url", "source", "salary",
-                      "job_type", "description", "posted_date", "tags"]
+        fieldnames = [f.name for f in fields(Job)]
 
         with open(filename, "w", newline="", encoding="utf-8") as f:
             writer = csv.DictWriter(f, fieldnames=fieldnames)
@@ -582,7 +1205,25 @@ class JobScraper:
                 job_dict["tags"] = ", ".join(job_dict["tags"]) if job_dict["tags"] else ""
                 writer.writerow(job_dict)
 
-        print(f"Saved {len(jobs_to_save)} jobs to {filename}")
+        log(f"Saved {len(jobs_to_save)} jobs to {filename}")
+
+    def save_to_parquet(self, filename: str = "jobs.parquet", jobs: Optional[list[Job]] = None):
+        """Save jobs as compressed Parquet (or Arrow IPC for .arrow/.feather); needs pyarrow"""
+        import columnar
+
+        jobs_to_save = jobs or self.jobs
+        columnar.write_jobs(jobs_to_save, filename)
+        log(f"Saved {len(jobs_to_save)} jobs to {filename}")
+
+    def load_from_parquet(self, filename: str) -> list[Job]:
+        """Replace self.jobs with jobs saved by save_to_parquet"""
+        import columnar
+
+        self.jobs = [Job(**record) for record in columnar.read_job_records(filename)]
+        self._salary_index = None
+        self._location_index = None
+        log(f"Loaded {len(self.jobs)} jobs from {filename}")
+        return self.jobs
 
     def print_jobs(self, jobs: Optional[list[Job]] = None, limit: int = 10, show_description: bool = True):
         """Print jobs to console"""
@@ -630,27 +1271,106 @@ class JobScraper:
             print(f"   URL:      {job.url}")
 
 
-def main():
-    import sys
+def spawn_background_refresh(job_title: str, location: str, country_code: str):
+    """Start a detached scraper process that refreshes one cached local search"""
+    command = [sys.executable, str(Path(__file__).resolve()), job_title, location,
+               "--country", country_code, "--refresh"]
+    if os.name == "nt":
+        detach = {"creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+    else:
+        detach = {"start_new_session": True}
+    # No inherited stdio: the caller (PHP shell_exec) waits for stdout to close
+    subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                     stderr=subprocess.DEVNULL, close_fds=True, **detach)
 
-    # Get command line arguments
-    job_title = sys.argv[1] if len(sys.argv) > 1 else "Graphics designer"
-    location = sys.argv[2] if len(sys.argv) > 2 else "Taguig City"
 
-    # Create scraper instance
-    scraper = JobScraper()
+def write_ndjson(jobs: list[Job], stream=None) -> None:
+    """Write jobs as compact newline-delimited JSON, one object per line"""
+    stream = stream or sys.stdout
+    for job in jobs:
+        stream.write(json.dumps(asdict(job), ensure_ascii=True, separators=(",", ":")))
+        stream.write("\n")
+    stream.flush()
 
-    # Fetch local jobs
-    local_jobs = scraper.fetch_local_jobs(
-        job_title=job_title,
-        location=location,
-        country_code="ph"
-    )
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fetch local job listings")
+    parser.add_argument("job_title", nargs="?", default="Graphics designer",
+                        help="Job title to search (default: 'Graphics designer')")
+    parser.add_argument("location", nargs="?", default="Taguig City",
+                        help="City/area to search (default: 'Taguig City')")
+    parser.add_argument("--country", default="ph", help="Country code for Adzuna (default: ph)")
+    parser.add_argument("--ndjson", action="store_true",
+                        help="Stream one compact JSON object per job as each source returns")
+    parser.add_argument("--no-coalesce", action="store_true",
+                        help="Always query upstream, even if an identical search is in flight")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the local search cache")
+    parser.add_argument("--cache-ttl", type=float, default=FRESH_TTL,
+                        help=f"Seconds a cached search is served without refreshing (default: {FRESH_TTL})")
+    parser.add_argument("--cache-max-stale", type=float, default=MAX_STALE,
+                        help=f"Seconds after which a cached search is never served (default: {MAX_STALE})")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Fetch from upstream and update the cache (used by the background refresher)")
+    parser.add_argument("--warm-cache", action="store_true",
+                        help="Pre-fetch the most popular searches from the query log, then exit")
+    parser.add_argument("--warm-top", type=int, default=20, help="Searches to warm (default: 20)")
+    parser.add_argument("--tag-skills", action="store_true",
+                        help="Add tags from the skills table by embedding similarity (needs sentence-transformers)")
+    parser.add_argument("--metrics-json", metavar="PATH",
+                        help="Append a JSON metrics record for this run to PATH ('-' for stderr)")
+    parser.add_argument("--metrics-prom", metavar="PATH",
+                        help="Write per-source metrics as a Prometheus text-file to PATH")
+    args = parser.parse_args()
+
+    single_flight = None if args.no_coalesce else SingleFlight()
+    cache = None if args.no_cache else LocalJobCache(fresh_ttl=args.cache_ttl, max_stale=args.cache_max_stale)
+
+    if args.warm_cache:
+        warmed = JobScraper(retain_jobs=False, single_flight=single_flight, cache=cache).warm_local_cache(args.warm_top)
+        log(f"Warmed {warmed} cached searches")
+        return
+
+    tagger = None
+    if args.tag_skills:
+        from skill_tagger import SkillTagger
+
+        tagger = SkillTagger()
+
+    try:
+        if args.ndjson:
+            # Stream each source's jobs as soon as it returns (tagged first if asked); nothing is buffered
+            on_jobs = write_ndjson if tagger is None else lambda jobs: write_ndjson(tagger.tag_jobs(jobs))
+            scraper = JobScraper(on_jobs=on_jobs, retain_jobs=False, single_flight=single_flight, cache=cache)
+        else:
+            scraper = JobScraper(single_flight=single_flight, cache=cache)
+
+        # Fetch local jobs
+        local_jobs = scraper.fetch_local_jobs(
+            job_title=args.job_title,
+            location=args.location,
+            country_code=args.country,
+            refresh=args.refresh
+        )
+
+        if local_jobs and tagger is not None and not args.ndjson:
+            local_jobs = tagger.tag_jobs(local_jobs)
+    finally:
+        if tagger is not None:
+            tagger.close()
 
     # Output JSON to stdout
-    if local_jobs:
+    if local_jobs and not args.ndjson:
         print(json.dumps([asdict(job) for job in local_jobs], indent=2, ensure_ascii=True))
 
+    if args.metrics_json or args.metrics_prom:
+        report = scraper.metrics.report()
+        if args.metrics_json:
+            append_json_record(report, args.metrics_json)
+        if args.metrics_prom:
+            write_prometheus_textfile(report, args.metrics_prom)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,277 @@
+"""
+Locations - Normalize free-form job locations against an offline PH gazetteer
+
+Sources spell places every way imaginable: "Taguig City, Metro Manila",
+"BGC, Taguig", "Makati City NCR PH", JSearch's "  PH" when city and state are
+empty, or "Worldwide" for remote roles. normalize_location() maps each to one
+canonical place id from data/ph_gazetteer.json (country → region → province
+→ city → district), and region_of() gives the region it belongs to.
+
+LocationIndex registers every job under its place and all of that place's
+ancestors, so "jobs in Taguig" (including BGC and McKinley Hill) or "jobs in
+Metro Manila" is a single dict lookup instead of a substring scan.
+"""
+
+import json
+import re
+import unicodedata
+from functools import cache, lru_cache
+from pathlib import Path
+from typing import Iterable, Optional
+
+GAZETTEER_PATH = Path(__file__).resolve().parent / "data" / "ph_gazetteer.json"
+
+# Pseudo-place for remote / work-from-anywhere roles
+REMOTE = "remote"
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, strip accents (Parañaque → paranaque) and collapse punctuation to single spaces"""
+    decomposed = unicodedata.normalize("NFKD", text)
+    ascii_text = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _NON_WORD.sub(" ", ascii_text.lower()).strip()
+
+
+class PrefixTrie:
+    """Maps normalized names to place ids; complete() finds every name starting with a prefix"""
+
+    __slots__ = ("root",)
+
+    _END = ""  # Child key holding the ids of names that end at this node
+
+    def __init__(self):
+        self.root: dict = {}
+
+    def insert(self, name: str, place_id: str):
+        node = self.root
+        for ch in name:
+            node = node.setdefault(ch, {})
+        node.setdefault(self._END, set()).add(place_id)
+
+    def complete(self, prefix: str) -> dict[str, set]:
+        """{name: place ids} for every inserted name that starts with prefix"""
+        node = self.root
+        for ch in prefix:
+            node = node.get(ch)
+            if node is None:
+                return {}
+        matches = {}
+        stack = [(prefix, node)]
+        while stack:
+            name, node = stack.pop()
+            for ch, child in node.items():
+                if ch == self._END:
+                    matches[name] = child
+                else:
+                    stack.append((name + ch, child))
+        return matches
+
+
+class Gazetteer:
+    """
+    Place hierarchy with alias lookup.
+
+    Args:
+        places: Records with id, name, kind, optional parent and aliases
+        remote_markers: Phrases that mark a location as remote ("worldwide", "wfh")
+        qualifiers: Words that may accompany a place without changing it ("hybrid", "area")
+    """
+
+    def __init__(self, places: list[dict], remote_markers: Iterable[str] = (), qualifiers: Iterable[str] = ()):
+        self.names: dict[str, str] = {}
+        self.kinds: dict[str, str] = {}
+        self.parents: dict[str, Optional[str]] = {}
+        self.aliases: dict[str, str] = {}
+        self.trie = PrefixTrie()
+
+        for place in places:
+            place_id = place["id"]
+            self.names[place_id] = place["name"]
+            self.kinds[place_id] = place["kind"]
+            self.parents[place_id] = place.get("parent")
+            for alias in [place["name"], *place.get("aliases", ())]:
+                key = normalize_text(alias)
+                if key:
+                    self.aliases.setdefault(key, place_id)
+                    self.trie.insert(key, place_id)
+
+        self.names[REMOTE] = "Remote"
+        self.kinds[REMOTE] = REMOTE
+        self.parents[REMOTE] = None
+        self.remote_markers = {normalize_text(marker) for marker in remote_markers}
+        for marker in self.remote_markers:
+            self.aliases.setdefault(marker, REMOTE)
+        self.qualifiers = {word for qualifier in qualifiers for word in normalize_text(qualifier).split()}
+
+        self.max_alias_words = max((len(alias.split()) for alias in self.aliases), default=1)
+        self._depths = {place_id: len(self.ancestors(place_id)) for place_id in self.parents}
+
+    @classmethod
+    def load(cls, path: Path = GAZETTEER_PATH) -> "Gazetteer":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["places"], data.get("remote_markers", ()), data.get("qualifiers", ()))
+
+    def ancestors(self, place_id: str) -> tuple[str, ...]:
+        """The place itself followed by each parent up to the country"""
+        chain = []
+        while place_id is not None and place_id not in chain:
+            chain.append(place_id)
+            place_id = self.parents.get(place_id)
+        return tuple(chain)
+
+    def region_of(self, place_id: Optional[str]) -> Optional[str]:
+        """Region id containing the place; countries and remote map to themselves"""
+        if place_id is None:
+            return None
+        for ancestor in self.ancestors(place_id):
+            if self.kinds.get(ancestor) == "region":
+                return ancestor
+        return place_id
+
+    def _scan(self, text: str) -> tuple[list[str], list[str]]:
+        """
+        (place ids, unknown words) in text, matching the longest alias at each
+        position; qualifiers and numbers (postal codes) are not unknown
+        """
+        words = normalize_text(text).split()
+        found, unknown = [], []
+        i = 0
+        while i < len(words):
+            for size in range(min(self.max_alias_words, len(words) - i), 0, -1):
+                place_id = self.aliases.get(" ".join(words[i:i + size]))
+                if place_id is not None:
+                    found.append(place_id)
+                    i += size
+                    break
+            else:
+                if words[i] not in self.qualifiers and not words[i].isdigit():
+                    unknown.append(words[i])
+                i += 1
+        return found, unknown
+
+    def places_in(self, text: str) -> list[str]:
+        """Place ids mentioned in text, matching the longest alias at each position"""
+        return self._scan(text)[0]
+
+    def is_remote(self, text: str) -> bool:
+        return REMOTE in self.places_in(text)
+
+    def normalize(self, text: Optional[str]) -> Optional[str]:
+        """
+        Canonical place id for a job location: the most specific gazetteer place
+        it mentions, REMOTE if it only mentions remote markers, else None. Also
+        None when words the gazetteer does not know remain ("Santa Rosa, CA",
+        "Car Nicobar"): the place is then most likely a foreign namesake.
+        """
+        if not text:
+            return None
+        found, unknown = self._scan(text)
+        if unknown:
+            return None
+        places = [place_id for place_id in found if place_id != REMOTE]
+        if places:
+            # "Makati City, Metro Manila, PH" → makati, not ncr or ph
+            return max(places, key=lambda place_id: self._depths[place_id])
+        return REMOTE if REMOTE in found else None
+
+    def completions(self, prefix: str) -> list[str]:
+        """Place ids with a name starting with prefix, shortest name first"""
+        matches = self.trie.complete(normalize_text(prefix))
+        ordered = []
+        for name in sorted(matches, key=lambda candidate: (len(candidate), candidate)):
+            for place_id in sorted(matches[name], key=lambda candidate: self._depths[candidate]):
+                if place_id not in ordered:
+                    ordered.append(place_id)
+        return ordered
+
+    def match(self, query: str) -> Optional[str]:
+        """
+        The place a location filter names: an exact alias, else the most
+        specific place the query mentions ("Taguig City, Metro Manila" →
+        taguig). None when the query has words the gazetteer does not know
+        ("San Jose", "Remote - US"), since it then means more than a place.
+        """
+        key = normalize_text(query)
+        if not key:
+            return None
+        if key in self.aliases:
+            return self.aliases[key]
+        return self.normalize(key)
+
+    def lookup(self, query: str) -> list[str]:
+        """
+        Autocomplete candidates for a partly typed location, best first: an
+        exact alias, else every name the query is a prefix of ("tagu" → tagum,
+        taguig; "cebu it" → cebu_it_park), else the place the query mentions
+        ("Taguig City, Metro Manila" → taguig). Use match() for filtering.
+        """
+        key = normalize_text(query)
+        if not key:
+            return []
+        if key in self.aliases:
+            return [self.aliases[key]]
+        candidates = self.completions(key)
+        if candidates:
+            return candidates
+        place_id = self.normalize(query)
+        return [place_id] if place_id is not None else []
+
+
+@cache
+def default_gazetteer() -> Gazetteer:
+    """The bundled PH gazetteer, loaded on first use"""
+    return Gazetteer.load()
+
+
+@lru_cache(maxsize=4096)
+def normalize_location(text: Optional[str]) -> Optional[str]:
+    """Canonical place id for a job location string (cached; sources repeat locations a lot)"""
+    return default_gazetteer().normalize(text)
+
+
+@lru_cache(maxsize=4096)
+def location_region(text: Optional[str]) -> Optional[str]:
+    """Region id for a job location string"""
+    return default_gazetteer().region_of(normalize_location(text))
+
+
+@lru_cache(maxsize=4096)
+def is_remote_location(text: Optional[str]) -> bool:
+    return bool(text) and default_gazetteer().is_remote(text)
+
+
+class LocationIndex:
+    """
+    Jobs keyed by every place that contains them.
+
+    A job in BGC is registered under bgc, taguig, ncr and ph, and also under
+    REMOTE when its location mentions a remote marker, so hierarchy-aware
+    location filters are a single dict lookup.
+    """
+
+    def __init__(self, jobs: Iterable, gazetteer: Optional[Gazetteer] = None):
+        self.gazetteer = gazetteer or default_gazetteer()
+        self.jobs_by_place: dict[str, list] = {}
+        for job in jobs:
+            keys = set(self.gazetteer.ancestors(job.location_id)) if job.location_id else set()
+            if is_remote_location(job.location):
+                keys.add(REMOTE)
+            for key in keys:
+                self.jobs_by_place.setdefault(key, []).append(job)
+
+    def resolve(self, query: str) -> Optional[str]:
+        """
+        The place a location filter names, or None when the query is not fully
+        a gazetteer place or that place has no jobs (callers then fall back to
+        a substring test on the raw location)
+        """
+        place_id = self.gazetteer.match(query)
+        if place_id is None or not self.jobs_in(place_id):
+            return None
+        return place_id
+
+    def jobs_in(self, place_id: str) -> list:
+        return self.jobs_by_place.get(place_id, [])
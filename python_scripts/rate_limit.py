@@ -0,0 +1,56 @@
+"""
+Rate Limit - Per-host token buckets shared by the scrapers
+
+Politeness is enforced per upstream host instead of with global sleeps, so
+requests to different hosts run concurrently while each host still sees at
+most `rate` requests per second (with bursts of up to `burst`).
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is available"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class HostRateLimiter:
+    """
+    One token bucket per upstream host.
+
+    Args:
+        limits: {host: (requests per second, burst)}
+        default: (requests per second, burst) for hosts not in limits
+    """
+
+    def __init__(self, limits: dict, default: tuple = (5.0, 5)):
+        self.limits = limits
+        self.default = default
+        self.buckets: dict[str, TokenBucket] = {}
+        self.lock = threading.Lock()
+
+    def acquire(self, host: str):
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = self.buckets[host] = TokenBucket(*self.limits.get(host, self.default))
+        bucket.acquire()
@@ -7,7 +7,7 @@ Takes a resume file (PDF or image) and uses GPT-4o-mini Vision to extract:
 - Work experience, certifications, and projects
 
 Usage:
-    python resume_parser.py <file_path> [--api-key KEY]
+    python resume_parser.py <file_path> [--api-key KEY] [--no-cache]
 
 Output: JSON to stdout
 
@@ -19,6 +19,7 @@ import os
 import json
 import base64
 import argparse
+import hashlib
 import traceback
 from pathlib import Path
 from typing import Optional
@@ -148,13 +149,165 @@ def get_image_media_type(file_path: str) -> str:
     return media_types.get(ext, "image/png")
 
 
-def parse_resume_with_gpt(file_path: str, api_key: Optional[str] = None) -> dict:
+# Model used for parsing; part of the result cache key
+RESUME_MODEL = "gpt-5-mini"
+
+# Bump when result handling changes in a way that should invalidate cached
+# parses; edits to the prompt text itself change the key automatically
+PROMPT_VERSION = "1"
+
+# Parsed results keyed by file content, model and prompt (see ResumeResultCache)
+RESUME_CACHE_DIR = Path(os.getenv(
+    'RESUME_CACHE_DIR',
+    str(Path(__file__).resolve().parent / 'job_cache' / 'resume_results')
+))
+RESUME_CACHE_MAX_ENTRIES = 500
+RESUME_CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+
+def build_prompt() -> str:
+    """Extraction instructions sent with the resume images"""
+    return f"""Analyze this resume and extract the following information in JSON format:
+
+1. **Basic Information**: First name and last name of the person
+
+2. **Skills**: List all skills mentioned. For each skill, also estimate a competency level (1-100) based on:
+   - Years of experience mentioned (more years = higher rating)
+   - Context clues (e.g., "expert in", "proficient", "beginner" etc.)
+   - If no experience level mentioned, use 50 as default
+   
+   Map skills to these categories: {list(SKILL_CATEGORIES.keys())}
+   
+   Here are example skills per category for reference:
+   {json.dumps(SKILL_CATEGORIES, indent=2)}
+
+3. **Credentials**: Extract work experience, certifications, and projects with:
+   - type: "work", "certificate", or "project"
+   - title: Job title or credential name
+   - organization: Company or issuing organization
+   - description: Brief description
+   - startDate: Start date (format: YYYY-MM-DD or null)
+   - endDate: End date (format: YYYY-MM-DD or null, null if "Present")
+
+Return ONLY valid JSON in this exact structure:
+{{
+    "firstName": "string",
+    "lastName": "string",
+    "skills": [
+        {{"name": "skill name", "category": "category name", "rating": 75}}
+    ],
+    "credentials": [
+        {{
+            "type": "work|certificate|project",
+            "title": "string",
+            "organization": "string", 
+            "description": "string",
+            "startDate": "YYYY-MM-DD or null",
+            "endDate": "YYYY-MM-DD or null"
+        }}
+    ],
+    "competencyRatings": {{
+        "Design": 0-100,
+        "Prototyping": 0-100,
+        "Tools": 0-100,
+        "Research": 0-100,
+        "Communication": 0-100,
+        "Programming": 0-100,
+        "Data Analysis": 0-100,
+        "Leadership": 0-100
+    }}
+}}
+
+For competencyRatings, calculate an aggregate score (0-100) for each category based on:
+- Number of skills in that category
+- Average rating of skills in that category
+- Relevant work experience
+- Set to 0 if no skills found in that category"""
+
+
+def file_sha256(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def resume_cache_key(file_path: str, model: str = RESUME_MODEL, prompt_version: str = PROMPT_VERSION) -> str:
+    """SHA-256 of the file bytes, the model, the prompt version and the prompt text"""
+    prompt_hash = hashlib.sha256(build_prompt().encode("utf-8")).hexdigest()
+    parts = [file_sha256(file_path), model, prompt_version, prompt_hash]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class ResumeResultCache:
+    """
+    Successful parse results as one JSON file per cache key.
+
+    Writes go to a temp file renamed into place, so a concurrent reader never
+    sees a partial result. Hits refresh the file's mtime and every write
+    evicts the least recently used files beyond max_entries or max_bytes.
+    Results hold personal data and stay in the git-ignored job_cache.
+    """
+
+    def __init__(self, directory: Path = RESUME_CACHE_DIR, max_entries: int = RESUME_CACHE_MAX_ENTRIES,
+                 max_bytes: int = RESUME_CACHE_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[dict]:
+        path = self.path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                result = json.load(f)
+            os.utime(path)  # Marks the entry as recently used
+        except (OSError, ValueError):
+            return None
+        return result
+
+    def put(self, key: str, result: dict):
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp = self.directory / f".{key}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(result, f, ensure_ascii=False)
+            os.replace(tmp, self.path(key))
+            self.evict()
+        except OSError as e:
+            debug_log(f"Could not write resume cache entry: {e}")
+
+    def evict(self):
+        """Delete least recently used entries until both bounds hold"""
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort(reverse=True)
+        total = 0
+        for kept, (_, size, path) in enumerate(entries):
+            total += size
+            if kept >= self.max_entries or total > self.max_bytes:
+                path.unlink(missing_ok=True)
+
+
+def parse_resume_with_gpt(file_path: str, api_key: Optional[str] = None, use_cache: bool = True) -> dict:
     """
     Parse resume using GPT-4o-mini Vision API
     
+    Results are cached by file content, model and prompt (ResumeResultCache),
+    so re-parsing the same file returns without rendering or an API call.
+    
     Args:
         file_path: Path to resume file (PDF, PNG, JPG, etc.)
         api_key: OpenAI API key (defaults to env var)
+        use_cache: Serve and store results in the local result cache
     
     Returns:
         Parsed profile data as dictionary
@@ -171,6 +324,16 @@ def parse_resume_with_gpt(file_path: str, api_key: Optional[str] = None) -> dict
     file_size = os.path.getsize(file_path)
     debug_log(f"File size: {file_size} bytes ({file_size / 1024:.1f} KB)")
     
+    cache = ResumeResultCache() if use_cache else None
+    cache_key = None
+    if cache is not None:
+        cache_key = resume_cache_key(file_path)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            debug_log(f"Cache hit: {cache_key[:16]}... (no API call)")
+            return cached
+        debug_log(f"Cache miss: {cache_key[:16]}...")
+    
     # Get API key
     api_key = api_key or os.getenv("OPENAI_API_KEY")
     if not api_key or api_key == "your-api-key-here":
@@ -207,62 +370,7 @@ def parse_resume_with_gpt(file_path: str, api_key: Optional[str] = None) -> dict
     content = [
         {
             "type": "text",
-            "text": f"""Analyze this resume and extract the following information in JSON format:
-
-1. **Basic Information**: First name and last name of the person
-
-2. **Skills**: List all skills mentioned. For each skill, also estimate a competency level (1-100) based on:
-   - Years of experience mentioned (more years = higher rating)
-   - Context clues (e.g., "expert in", "proficient", "beginner" etc.)
-   - If no experience level mentioned, use 50 as default
-   
-   Map skills to these categories: {list(SKILL_CATEGORIES.keys())}
-   
-   Here are example skills per category for reference:
-   {json.dumps(SKILL_CATEGORIES, indent=2)}
-
-3. **Credentials**: Extract work experience, certifications, and projects with:
-   - type: "work", "certificate", or "project"
-   - title: Job title or credential name
-   - organization: Company or issuing organization
-   - description: Brief description
-   - startDate: Start date (format: YYYY-MM-DD or null)
-   - endDate: End date (format: YYYY-MM-DD or null, null if "Present")
-
-Return ONLY valid JSON in this exact structure:
-{{
-    "firstName": "string",
-    "lastName": "string",
-    "skills": [
-        {{"name": "skill name", "category": "category name", "rating": 75}}
-    ],
-    "credentials": [
-        {{
-            "type": "work|certificate|project",
-            "title": "string",
-            "organization": "string", 
-            "description": "string",
-            "startDate": "YYYY-MM-DD or null",
-            "endDate": "YYYY-MM-DD or null"
-        }}
-    ],
-    "competencyRatings": {{
-        "Design": 0-100,
-        "Prototyping": 0-100,
-        "Tools": 0-100,
-        "Research": 0-100,
-        "Communication": 0-100,
-        "Programming": 0-100,
-        "Data Analysis": 0-100,
-        "Leadership": 0-100
-    }}
-}}
-
-For competencyRatings, calculate an aggregate score (0-100) for each category based on:
-- Number of skills in that category
-- Average rating of skills in that category
-- Relevant work experience
-- Set to 0 if no skills found in that category"""
+            "text": build_prompt()
         }
     ]
     
@@ -283,7 +391,7 @@ For competencyRatings, calculate an aggregate score (0-100) for each category ba
             "Authorization": f"Bearer {api_key}"
         }
         
-        model = "gpt-5-mini"
+        model = RESUME_MODEL
         debug_log(f"Using model: {model}")
         
         payload = {
@@ -391,6 +499,9 @@ For competencyRatings, calculate an aggregate score (0-100) for each category ba
             }
         }
         
+        if cache is not None:
+            cache.put(cache_key, result)
+        
         debug_log("="*60)
         debug_log("RESUME PARSE COMPLETE - SUCCESS")
         debug_log(f"Final result skills: {[s.get('name') for s in result['skills'][:5]]}...")
@@ -413,12 +524,34 @@ For competencyRatings, calculate an aggregate score (0-100) for each category ba
         return {"error": f"GPT API error: {str(e)}"}
 
 
+# Skill names from every successful parse, read by ingest_kaggle_skills_embeddings.py --backfill
+RESUME_SKILL_LOG = Path(os.getenv(
+    'RESUME_SKILL_LOG',
+    str(Path(__file__).resolve().parent / 'job_cache' / 'resume_skills.jsonl')
+))
+
+
+def log_resume_skills(skills: list, log_path: Path = RESUME_SKILL_LOG):
+    """Append the parsed skill names (nothing else from the resume) as one JSON line"""
+    names = [s.get("name") for s in skills if isinstance(s, dict) and s.get("name")]
+    if not names:
+        return
+    try:
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"logged_at": datetime.now().isoformat(), "skills": names}) + "\n")
+    except OSError as e:
+        debug_log(f"Could not write resume skill log: {e}")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Parse resume using GPT Vision")
     parser.add_argument("file_path", help="Path to resume file (PDF, PNG, JPG)")
     parser.add_argument("--api-key", help="OpenAI API key (defaults to OPENAI_API_KEY env var)")
     parser.add_argument("--debug", action="store_true", help="Enable debug logging")
     parser.add_argument("--no-debug", action="store_true", help="Disable debug logging")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always call the API instead of reusing a cached result for the same file")
     
     args = parser.parse_args()
     
@@ -455,7 +588,7 @@ def main():
     debug_log(f"File validated: {args.file_path} ({file_ext})")
     
     # Parse resume
-    result = parse_resume_with_gpt(args.file_path, args.api_key)
+    result = parse_resume_with_gpt(args.file_path, args.api_key, use_cache=not args.no_cache)
     
     # Output JSON (to stdout - this is what PHP reads)
     print(json.dumps(result, indent=2))
@@ -465,6 +598,7 @@ def main():
         debug_log(f"EXITING WITH ERROR: {result.get('error')}")
         sys.exit(1)
     else:
+        log_resume_skills(result.get("skills", []))
         debug_log("EXITING SUCCESSFULLY")
 
 
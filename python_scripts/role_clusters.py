@@ -0,0 +1,273 @@
+"""
+Role Clusters - Group scraped job titles into roles with skill profiles
+
+Most postings collapse into a few dozen roles ("Graphic Designer", "Senior
+DevOps Engineer", ...). This offline stage:
+
+1. Embeds every distinct job title once (phrase vectors are cached, see skill_tagger.py)
+2. Clusters the titles with spherical mini-batch k-means in NumPy
+3. Aggregates each cluster's job tags into a role profile: the share of the
+   role's jobs that mention each skill
+4. Persists centroids, profiles and the title → role map to an .npz file
+
+At match time a candidate's skills become one vector over the skill
+vocabulary, so ranking every role is a single (roles × skills) product and
+per-job scoring only has to look at jobs inside the top roles.
+
+Usage (from repo root):
+    python python_scripts/role_clusters.py build [--k 40]
+    python python_scripts/role_clusters.py match "Figma, Photoshop, Illustrator" [--top 3]
+
+Requires numpy and sentence-transformers (see requirements.txt).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+
+from ingest_kaggle_skills_embeddings import (
+    default_job_cache_path,
+    default_job_dump_patterns,
+    is_skill_candidate,
+    load_job_records,
+    normalize_skill_name,
+)
+from skill_tagger import DEFAULT_MODEL, PhraseEmbedder
+
+DEFAULT_ROLE_PATH = Path(__file__).resolve().parent / "job_cache" / "role_profiles.npz"
+DEFAULT_K = 40
+
+
+def normalize_title(title: str) -> str:
+    return " ".join(str(title).lower().split())
+
+
+def skill_key(name: str) -> str:
+    return normalize_skill_name(str(name)).lower()
+
+
+def minibatch_kmeans(
+    vectors: np.ndarray,
+    k: int,
+    batch_size: int = 256,
+    iterations: int = 100,
+    seed: int = 0,
+) -> np.ndarray:
+    """
+    Spherical mini-batch k-means (Sculley 2010) on L2-normalized rows.
+
+    Centers start from k-means++ seeding; each step assigns a random batch to
+    its nearest centers by dot product and moves every center toward its
+    points with a per-center learning rate of 1 / points seen, so each center
+    is the running mean of everything assigned to it.
+    """
+    rng = np.random.default_rng(seed)
+    n = vectors.shape[0]
+    k = min(k, n)
+
+    # k-means++ seeding with cosine distance
+    centers = np.empty((k, vectors.shape[1]), dtype=np.float32)
+    centers[0] = vectors[rng.integers(n)]
+    closest = 1.0 - vectors @ centers[0]
+    for i in range(1, k):
+        weights = np.clip(closest, 0, None) ** 2
+        total = weights.sum()
+        index = rng.choice(n, p=weights / total) if total > 0 else rng.integers(n)
+        centers[i] = vectors[index]
+        closest = np.minimum(closest, 1.0 - vectors @ centers[i])
+
+    counts = np.zeros(k, dtype=np.int64)
+    for _ in range(iterations):
+        batch = vectors[rng.choice(n, size=min(batch_size, n), replace=False)]
+        assigned = (batch @ centers.T).argmax(axis=1)
+        # Same result as stepping each point in with rate 1 / count, one array op per batch
+        batch_counts = np.bincount(assigned, minlength=k)
+        sums = np.zeros_like(centers)
+        np.add.at(sums, assigned, batch)
+        moved = batch_counts > 0
+        totals = counts[moved] + batch_counts[moved]
+        centers[moved] = (centers[moved] * counts[moved, None] + sums[moved]) / totals[:, None]
+        counts[moved] = totals
+        norms = np.linalg.norm(centers, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        centers /= norms
+    return centers
+
+
+class RoleIndex:
+    """
+    Role centroids and skill profiles.
+
+    Attributes:
+        labels: Most common title in each role
+        sizes: Jobs per role
+        centroids: (roles × dim) normalized title embeddings
+        skills: Skill vocabulary (lowercase)
+        profiles: (roles × skills) share of each role's jobs that list the skill
+        title_roles: Role of every title seen at build time
+    """
+
+    def __init__(self, labels, sizes, centroids, skills, profiles, title_roles: dict[str, int]):
+        self.labels = list(labels)
+        self.sizes = np.asarray(sizes)
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.skills = list(skills)
+        self.profiles = np.asarray(profiles, dtype=np.float32)
+        self.title_roles = title_roles
+        self.skill_index = {skill: i for i, skill in enumerate(self.skills)}
+        norms = np.linalg.norm(self.profiles, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self._unit_profiles = self.profiles / norms
+
+    @classmethod
+    def build(cls, records: Sequence[dict], embedder: PhraseEmbedder, k: int = DEFAULT_K,
+              seed: int = 0) -> "RoleIndex":
+        titles = [normalize_title(record.get("title", "")) for record in records]
+        distinct = [title for title in dict.fromkeys(titles) if title]
+        if not distinct:
+            raise ValueError("No job titles to cluster")
+        print(f"Clustering {len(distinct)} distinct titles from {len(records)} jobs into {min(k, len(distinct))} roles",
+              file=sys.stderr)
+
+        vectors = embedder.vectors(distinct)
+        centroids = minibatch_kmeans(vectors, k, seed=seed)
+        title_roles = dict(zip(distinct, (vectors @ centroids.T).argmax(axis=1).tolist()))
+
+        skill_counts = Counter(
+            skill_key(tag) for record in records for tag in (record.get("tags") or []) if is_skill_candidate(str(tag))
+        )
+        skills = [skill for skill, _ in skill_counts.most_common()]
+        skill_index = {skill: i for i, skill in enumerate(skills)}
+
+        roles = len(centroids)
+        profiles = np.zeros((roles, len(skills)), dtype=np.float32)
+        sizes = np.zeros(roles, dtype=np.int64)
+        role_titles = [Counter() for _ in range(roles)]
+        for title, record in zip(titles, records):
+            if not title:
+                continue
+            role = title_roles[title]
+            sizes[role] += 1
+            role_titles[role][record.get("title", title)] += 1
+            for tag in {skill_key(tag) for tag in (record.get("tags") or [])}:
+                if tag in skill_index:
+                    profiles[role, skill_index[tag]] += 1
+        profiles /= np.maximum(sizes, 1)[:, None]
+
+        labels = [counter.most_common(1)[0][0] if counter else "" for counter in role_titles]
+        return cls(labels, sizes, centroids, skills, profiles, title_roles)
+
+    def save(self, path: Path = DEFAULT_ROLE_PATH):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.stem}.tmp.npz")
+        np.savez_compressed(
+            tmp,
+            labels=np.array(self.labels, dtype=str),
+            sizes=self.sizes,
+            centroids=self.centroids,
+            skills=np.array(self.skills, dtype=str),
+            profiles=self.profiles,
+            titles=np.array(list(self.title_roles), dtype=str),
+            title_roles=np.array(list(self.title_roles.values()), dtype=np.int32),
+        )
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_ROLE_PATH) -> "RoleIndex":
+        with np.load(path, allow_pickle=False) as data:
+            title_roles = dict(zip(data["titles"].tolist(), data["title_roles"].tolist()))
+            return cls(data["labels"].tolist(), data["sizes"], data["centroids"], data["skills"].tolist(),
+                       data["profiles"], title_roles)
+
+    def candidate_vector(self, skills: Iterable[str]) -> np.ndarray:
+        vector = np.zeros(len(self.skills), dtype=np.float32)
+        for skill in skills:
+            index = self.skill_index.get(skill_key(skill))
+            if index is not None:
+                vector[index] = 1.0
+        return vector
+
+    def top_roles(self, skills: Iterable[str], top: int = 3) -> list[tuple[int, float]]:
+        """(role, cosine score) for the roles whose profiles best fit the candidate's skills"""
+        scores = self._unit_profiles @ self.candidate_vector(skills)
+        order = np.argsort(-scores)[:top]
+        return [(int(role), float(scores[role])) for role in order if scores[role] > 0]
+
+    def roles_of(self, titles: Sequence[str], embedder: Optional[PhraseEmbedder] = None) -> list[int]:
+        """Role of each title; unseen titles are embedded (needs embedder) and assigned to the nearest centroid"""
+        keys = [normalize_title(title) for title in titles]
+        unseen = [key for key in dict.fromkeys(keys) if key not in self.title_roles]
+        if unseen:
+            if embedder is None:
+                raise ValueError(f"{len(unseen)} titles were not seen at build time; pass an embedder")
+            assigned = (embedder.vectors(unseen) @ self.centroids.T).argmax(axis=1).tolist()
+            self.title_roles.update(zip(unseen, assigned))
+        return [self.title_roles[key] for key in keys]
+
+    def jobs_in_top_roles(self, jobs: Sequence, skills: Iterable[str], top: int = 3,
+                          embedder: Optional[PhraseEmbedder] = None) -> list:
+        """Only the jobs worth scoring in detail: those whose title falls in the candidate's top roles"""
+        wanted = {role for role, _ in self.top_roles(skills, top)}
+        roles = self.roles_of([job.title for job in jobs], embedder)
+        return [job for job, role in zip(jobs, roles) if role in wanted]
+
+    def describe(self, role: int, top_skills: int = 8) -> dict:
+        order = np.argsort(-self.profiles[role])[:top_skills]
+        return {
+            "role": role,
+            "label": self.labels[role],
+            "jobs": int(self.sizes[role]),
+            "skills": {self.skills[i]: round(float(self.profiles[role, i]), 3)
+                       for i in order if self.profiles[role, i] > 0},
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cluster job titles into roles with skill profiles")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build = subparsers.add_parser("build", help="Cluster the job store and persist role profiles")
+    build.add_argument("--jobs", nargs="*", help="Job dump globs (default: jobs_*.json and local_jobs_*.json)")
+    build.add_argument("--job-cache", default=default_job_cache_path(), help="Local search cache to include")
+    build.add_argument("--k", type=int, default=DEFAULT_K, help=f"Number of roles (default: {DEFAULT_K})")
+    build.add_argument("--model", default=DEFAULT_MODEL, help="Sentence-Transformers model name")
+    build.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+
+    match = subparsers.add_parser("match", help="Rank roles for a comma-separated list of skills")
+    match.add_argument("skills", help="e.g. 'Figma, Photoshop, Illustrator'")
+    match.add_argument("--top", type=int, default=3, help="Roles to return (default: 3)")
+
+    for subparser in (build, match):
+        subparser.add_argument("--roles", type=Path, default=DEFAULT_ROLE_PATH, help="Role profile file")
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        records = load_job_records(args.jobs or default_job_dump_patterns(), args.job_cache)
+        embedder = PhraseEmbedder(args.model)
+        try:
+            index = RoleIndex.build(records, embedder, args.k, args.seed)
+        finally:
+            embedder.close()
+        index.save(args.roles)
+        print(f"Saved {len(index.labels)} roles over {len(index.skills)} skills to {args.roles}", file=sys.stderr)
+        print(json.dumps([index.describe(role) for role in np.argsort(-index.sizes)], indent=2, ensure_ascii=False))
+    else:
+        index = RoleIndex.load(args.roles)
+        skills = [skill.strip() for skill in args.skills.split(",") if skill.strip()]
+        print(json.dumps(
+            [{**index.describe(role), "score": round(score, 4)} for role, score in index.top_roles(skills, args.top)],
+            indent=2, ensure_ascii=False,
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Salary - Normalize free-form and structured salaries into numeric ranges
+
+Every source reports pay differently: Remotive's "$130k - $150k", Adzuna's
+bare annual numbers in the country's currency, JSearch's min/max with a
+currency and period, Jobicy's annualSalaryMin. parse_salary() and
+salary_range() turn them all into a SalaryRange, whose annual_base() gives
+yearly amounts in BASE_CURRENCY so jobs from every source compare directly.
+
+SalaryIndex keeps jobs sorted by their annual upper bound so "salary >= X"
+is a bisect instead of a scan.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Iterable, Optional, Sequence
+
+BASE_CURRENCY = "PHP"
+
+# Approximate conversion rates into BASE_CURRENCY (same basis as course_scraper.USD_TO_PHP)
+FX_TO_BASE = {
+    "PHP": 1.0,
+    "USD": 56.0,
+    "EUR": 61.0,
+    "GBP": 71.0,
+    "SGD": 42.0,
+    "AUD": 37.0,
+    "CAD": 41.0,
+    "NZD": 34.0,
+    "INR": 0.67,
+    "JPY": 0.38,
+    "CHF": 64.0,
+    "PLN": 14.0,
+    "BRL": 11.0,
+    "MXN": 3.3,
+    "ZAR": 3.1,
+}
+
+# Currency used by each Adzuna country endpoint
+ADZUNA_CURRENCIES = {
+    "ph": "PHP", "us": "USD", "gb": "GBP", "au": "AUD", "sg": "SGD", "in": "INR",
+    "ca": "CAD", "nz": "NZD", "za": "ZAR", "br": "BRL", "mx": "MXN", "pl": "PLN",
+    "ch": "CHF", "de": "EUR", "fr": "EUR", "nl": "EUR", "it": "EUR", "es": "EUR", "at": "EUR", "be": "EUR",
+}
+
+# Multiplier from each pay period to a year
+PERIODS_PER_YEAR = {"year": 1, "month": 12, "week": 52, "day": 260, "hour": 2080}
+
+# Period spellings used by the sources' structured fields (e.g. JSearch "YEAR", "HOUR")
+_PERIOD_ALIASES = {
+    **{name: name for name in PERIODS_PER_YEAR},
+    "yearly": "year", "annual": "year", "annually": "year",
+    "monthly": "month", "weekly": "week", "daily": "day", "hourly": "hour",
+}
+
+_CURRENCY_SYMBOLS = {"₱": "PHP", "$": "USD", "€": "EUR", "£": "GBP", "¥": "JPY", "₹": "INR"}
+_CURRENCY_CODE = re.compile(r'\b(' + '|'.join(FX_TO_BASE) + r')\b', re.I)
+_AMOUNT = re.compile(r'(\d[\d,]*(?:\.\d+)?)\s*([kKmM])?(?![\w])')
+_PERIOD_PATTERNS = [
+    ("hour", re.compile(r'\b(?:hour|hourly|hr)\b|/\s*h\b', re.I)),
+    ("day", re.compile(r'\b(?:day|daily)\b', re.I)),
+    ("week", re.compile(r'\b(?:week|weekly|wk)\b', re.I)),
+    ("month", re.compile(r'\b(?:month|monthly|mo)\b', re.I)),
+    ("year", re.compile(r'\b(?:year|yearly|annual|annually|annum|yr|pa)\b', re.I)),
+]
+
+# Smallest amount accepted as pay when the text names no currency or period
+# ("2 - 3 years" of experience is not a salary, "30,000 - 40,000" is)
+_MIN_BARE_AMOUNT = 1_000
+
+
+@dataclass(slots=True, frozen=True)
+class SalaryRange:
+    """A pay range in its original currency and period; either bound may be missing"""
+    min: Optional[float]
+    max: Optional[float]
+    currency: Optional[str]
+    period: str = "year"
+
+    def annual_base(self) -> tuple[Optional[float], Optional[float]]:
+        """(min, max) per year in BASE_CURRENCY, or (None, None) if the currency is unknown"""
+        rate = FX_TO_BASE.get(self.currency or "")
+        if rate is None:
+            return None, None
+        factor = rate * PERIODS_PER_YEAR.get(self.period, 1)
+        return (
+            round(self.min * factor, 2) if self.min is not None else None,
+            round(self.max * factor, 2) if self.max is not None else None,
+        )
+
+
+def _number(value) -> Optional[float]:
+    if value is None or value == "":
+        return None
+    try:
+        number = float(str(value).replace(",", ""))
+    except ValueError:
+        return None
+    return number if number > 0 else None
+
+
+def salary_range(minimum, maximum, currency: Optional[str], period: Optional[str] = "year") -> Optional[SalaryRange]:
+    """SalaryRange from structured numeric fields (e.g. Adzuna salary_min/salary_max)"""
+    low, high = _number(minimum), _number(maximum)
+    if low is None and high is None:
+        return None
+    if low is not None and high is not None and low > high:
+        low, high = high, low
+    period = _PERIOD_ALIASES.get((period or "year").lower(), "year")
+    return SalaryRange(low, high, currency.upper() if currency else None, period)
+
+
+def parse_salary(text, default_currency: Optional[str] = None, default_period: str = "year") -> Optional[SalaryRange]:
+    """
+    Parse a free-form salary such as "$130k - $150k", "$40-50k", "From 30,000",
+    "PHP 25,000 - 35,000 per month" or "Up to €60k/yr". Numbers with no
+    currency or period marker are only pay from _MIN_BARE_AMOUNT up.
+    """
+    if text is None:
+        return None
+    if isinstance(text, (int, float)):
+        return salary_range(text, None, default_currency, default_period)
+
+    text = str(text).strip()
+    amounts, multipliers = [], []
+    for number, suffix in _AMOUNT.findall(text):
+        value = float(number.replace(",", ""))
+        multiplier = (1_000 if suffix in "kK" else 1_000_000) if suffix else 1
+        if value > 0:
+            amounts.append(value * multiplier)
+            multipliers.append(multiplier)
+    if not amounts:
+        return None
+    # "$40-50k" and "1.5-2M PHP" share the upper bound's suffix
+    if (len(amounts) >= 2 and multipliers[0] == 1 and multipliers[1] > 1
+            and amounts[0] * multipliers[1] <= amounts[1]):
+        amounts[0] *= multipliers[1]
+
+    currency = None
+    code = _CURRENCY_CODE.search(text)
+    if code:
+        currency = code.group(1).upper()
+    else:
+        for symbol, symbol_currency in _CURRENCY_SYMBOLS.items():
+            if symbol in text:
+                currency = symbol_currency
+                break
+
+    period = None
+    for name, pattern in _PERIOD_PATTERNS:
+        if pattern.search(text):
+            period = name
+            break
+
+    if currency is None and period is None and max(amounts) < _MIN_BARE_AMOUNT:
+        return None
+    currency = currency or default_currency
+    period = period or default_period
+
+    lowered = text.lower()
+    if len(amounts) >= 2:
+        return salary_range(amounts[0], amounts[1], currency, period)
+    if lowered.startswith(("up to", "max", "<")):
+        return salary_range(None, amounts[0], currency, period)
+    return salary_range(amounts[0], None, currency, period)
+
+
+def salary_fields(salary: Optional[SalaryRange]) -> dict:
+    """Numeric Job fields for a parsed salary (annual amounts in BASE_CURRENCY)"""
+    if salary is None:
+        return {}
+    low, high = salary.annual_base()
+    return {
+        "salary_min": low,
+        "salary_max": high,
+        "salary_currency": salary.currency,
+        "salary_period": salary.period,
+    }
+
+
+class SalaryIndex:
+    """
+    Jobs sorted by annual salary so range filters are bisects.
+
+    A job's sort key is its upper bound (salary_max, falling back to
+    salary_min): a job matches "at least X" if it can pay X.
+    """
+
+    def __init__(self, jobs: Iterable):
+        keyed = []
+        for job in jobs:
+            upper = job.salary_max if job.salary_max is not None else job.salary_min
+            if upper is not None:
+                keyed.append((upper, job))
+        keyed.sort(key=lambda pair: pair[0])
+        self.keys: list[float] = [key for key, _ in keyed]
+        self.jobs: list = [job for _, job in keyed]
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    def at_least(self, amount: float) -> Sequence:
+        """Jobs whose annual upper bound is >= amount (in BASE_CURRENCY)"""
+        return self.jobs[bisect_left(self.keys, amount):]
+
+    def between(self, low: float, high: float) -> Sequence:
+        """Jobs whose annual upper bound lies in [low, high]"""
+        return self.jobs[bisect_left(self.keys, low):bisect_right(self.keys, high)]
@@ -0,0 +1,281 @@
+"""
+Scrape Metrics - Per-source timing and volume instrumentation for JobScraper
+
+Every fetch_* call produces one FetchMetrics record:
+- connect/ttfb/download/wait/parse time in milliseconds (connect includes DNS)
+- bytes received, HTTP requests made, retries, job count
+- status (ok/error/skipped), error class and cache status
+
+Records for a run are emitted as one JSON object (appended as a line to a
+JSONL file) or as a Prometheus text-file for node_exporter's textfile collector.
+"""
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# Connection setup timings for the request currently being sent on this thread
+_connection_timings = threading.local()
+
+
+class _TimedConnectionMixin:
+    """Times connection setup of new connections: DNS resolution, TCP and TLS as one number"""
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _connection_timings.connect = (
+                getattr(_connection_timings, "connect", 0.0) + time.perf_counter() - started
+            )
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+@dataclass
+class FetchMetrics:
+    """Timing and volume for one fetch_* call"""
+    source: str
+    status: str = "ok"  # ok, error or skipped
+    error: Optional[str] = None  # Exception class name when status is error
+    cache: str = "none"  # none, hit, stale, coalesced
+    requests: int = 0
+    retries: int = 0
+    bytes_received: int = 0
+    job_count: int = 0
+    connect_ms: float = 0.0  # DNS resolution, TCP and TLS of new connections
+    ttfb_ms: float = 0.0
+    download_ms: float = 0.0
+    wait_ms: float = 0.0  # Rate limiting and retry backoff
+    parse_ms: float = 0.0
+    total_ms: float = 0.0
+
+
+class MetricsRecorder:
+    """Collects FetchMetrics for one scraper run"""
+
+    def __init__(self):
+        self.records: list[FetchMetrics] = []
+        self.run_started = time.time()
+        self._local = threading.local()
+
+    @property
+    def current(self) -> Optional[FetchMetrics]:
+        """Metrics of the fetch running on this thread, if any"""
+        return getattr(self._local, "metrics", None)
+
+    def reset(self):
+        self.records = []
+        self.run_started = time.time()
+
+    @contextmanager
+    def fetch(self, source: str) -> Iterator[FetchMetrics]:
+        metrics = FetchMetrics(source=source)
+        self._local.metrics = metrics
+        started = time.perf_counter()
+        try:
+            yield metrics
+        finally:
+            self._local.metrics = None
+            metrics.total_ms = (time.perf_counter() - started) * 1000
+            # Whatever is not network or waiting is decoding and mapping jobs
+            network_ms = metrics.connect_ms + metrics.ttfb_ms + metrics.download_ms
+            metrics.parse_ms = max(0.0, metrics.total_ms - network_ms - metrics.wait_ms)
+            for name in ("connect_ms", "ttfb_ms", "download_ms", "wait_ms", "parse_ms", "total_ms"):
+                setattr(metrics, name, round(getattr(metrics, name), 3))
+            self.records.append(metrics)
+
+    def record_error(self, error: BaseException):
+        metrics = self.current
+        if metrics:
+            metrics.status = "error"
+            metrics.error = type(error).__name__
+
+    def record_skip(self):
+        metrics = self.current
+        if metrics:
+            metrics.status = "skipped"
+
+    def record_wait(self, seconds: float):
+        metrics = self.current
+        if metrics:
+            metrics.wait_ms += seconds * 1000
+
+    def record_retry(self):
+        metrics = self.current
+        if metrics:
+            metrics.retries += 1
+
+    def track_response(self, response: requests.Response, get_seconds: float, streamed: bool):
+        """
+        Account for the body of a response returned by session.get.
+
+        Buffered bodies were already read inside session.get; streamed bodies
+        are timed chunk by chunk as the caller consumes iter_content.
+        """
+        metrics = self.current
+        if metrics is None:
+            return
+        sent_seconds = getattr(response, "_send_seconds", get_seconds)
+        if not streamed:
+            metrics.download_ms += max(0.0, get_seconds - sent_seconds) * 1000
+            metrics.bytes_received += len(response.content)
+            return
+
+        iter_content = response.iter_content
+
+        @functools.wraps(iter_content)
+        def timed_iter_content(*args, **kwargs):
+            chunks = iter_content(*args, **kwargs)
+            while True:
+                started = time.perf_counter()
+                try:
+                    chunk = next(chunks)
+                except StopIteration:
+                    metrics.download_ms += (time.perf_counter() - started) * 1000
+                    return
+                metrics.download_ms += (time.perf_counter() - started) * 1000
+                metrics.bytes_received += len(chunk)
+                yield chunk
+
+        response.iter_content = timed_iter_content
+
+    def report(self) -> dict:
+        """One machine-readable record for the whole run"""
+        return {
+            "run_started": datetime.fromtimestamp(self.run_started, timezone.utc).isoformat(),
+            "duration_ms": round((time.time() - self.run_started) * 1000, 3),
+            "job_count": sum(m.job_count for m in self.records),
+            "sources": [asdict(m) for m in self.records],
+        }
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that attributes DNS, connect and time-to-first-byte to the current fetch"""
+
+    def __init__(self, recorder: MetricsRecorder, **kwargs):
+        self.recorder = recorder
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+    def send(self, request, **kwargs):
+        _connection_timings.connect = 0.0
+        started = time.perf_counter()
+        try:
+            response = super().send(request, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics = self.recorder.current
+            if metrics:
+                metrics.requests += 1
+                metrics.connect_ms += _connection_timings.connect * 1000
+                metrics.ttfb_ms += max(0.0, elapsed - _connection_timings.connect) * 1000
+        response._send_seconds = elapsed
+        return response
+
+
+def instrumented(source: str):
+    """Decorator for JobScraper.fetch_* methods: record one FetchMetrics per call"""
+    def decorator(fetch):
+        @functools.wraps(fetch)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.fetch(source) as metrics:
+                try:
+                    jobs = fetch(self, *args, **kwargs)
+                except Exception as e:
+                    # Record the fetch as failed (fetch_up 0), then let the caller handle it
+                    self.metrics.record_error(e)
+                    raise
+                metrics.job_count = len(jobs)
+            return jobs
+        return wrapper
+    return decorator
+
+
+def append_json_record(report: dict, path: str):
+    """Append the run record as one JSON line; "-" writes it to stderr"""
+    line = json.dumps(report, separators=(",", ":"))
+    if path == "-":
+        print(line, file=sys.stderr)
+        return
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+
+
+def _label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text(report: dict, prefix: str = "job_scraper") -> str:
+    """Render a run record in the Prometheus text exposition format"""
+    lines = []
+
+    def metric(name: str, kind: str, help_text: str, samples: list[tuple[dict, float]]):
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} {kind}")
+        for labels, value in samples:
+            rendered = ",".join(f'{k}="{_label(v)}"' for k, v in labels.items())
+            lines.append(f"{prefix}_{name}{{{rendered}}} {value}")
+
+    sources = report["sources"]
+    phases = ("connect", "ttfb", "download", "wait", "parse", "total")
+    metric("fetch_phase_seconds", "gauge", "Time spent per fetch phase in the last run",
+           [({"source": m["source"], "phase": phase}, m[f"{phase}_ms"] / 1000) for m in sources for phase in phases])
+    metric("fetch_bytes", "gauge", "Response bytes received in the last run",
+           [({"source": m["source"]}, m["bytes_received"]) for m in sources])
+    metric("fetch_requests", "gauge", "HTTP requests made in the last run",
+           [({"source": m["source"]}, m["requests"]) for m in sources])
+    metric("fetch_retries", "gauge", "Retries in the last run",
+           [({"source": m["source"]}, m["retries"]) for m in sources])
+    metric("fetch_jobs", "gauge", "Jobs returned in the last run",
+           [({"source": m["source"]}, m["job_count"]) for m in sources])
+    metric("fetch_up", "gauge", "1 if the source fetch succeeded in the last run",
+           [({"source": m["source"], "status": m["status"], "error": m["error"] or "", "cache": m["cache"]},
+             1 if m["status"] == "ok" else 0) for m in sources])
+    lines.append(f"# HELP {prefix}_last_run_timestamp_seconds Start time of the last run")
+    lines.append(f"# TYPE {prefix}_last_run_timestamp_seconds gauge")
+    lines.append(f"{prefix}_last_run_timestamp_seconds "
+                 f"{datetime.fromisoformat(report['run_started']).timestamp()}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus_textfile(report: dict, path: str):
+    """Atomically replace a node_exporter textfile with the run's metrics"""
+    target = Path(path)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    tmp.write_text(prometheus_text(report), encoding="utf-8")
+    os.replace(tmp, target)
@@ -0,0 +1,554 @@
+"""
+Scraper Benchmarks - Offline performance checks for the scraping scripts
+
+Benchmarks run against the job dumps committed at the repo root
+(jobs_*.json, local_jobs_*.json) or against HTTP fixtures recorded with
+http_fixtures.py, so no network access is needed after recording.
+
+Usage:
+    python scraper_benchmarks.py memory [--rows 20000]
+    python scraper_benchmarks.py stream [--rows 2000] [--description-kb 8]
+    python scraper_benchmarks.py record [--fixtures DIR]
+    python scraper_benchmarks.py replay [--fixtures DIR] [--iterations 20]
+                                        [--latency-ms 50] [--jitter-ms 20] [--error-rate 0.0]
+    python scraper_benchmarks.py formats [--rows 20000] [--repeat 3]
+    python scraper_benchmarks.py parse [--fixtures DIR] [--cards 20] [--repeat 5]
+    python scraper_benchmarks.py startup [--skill Design] [--runs 10]
+
+Output: human-readable report to stdout
+"""
+
+import argparse
+import csv
+import html
+import gc
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+import requests
+from bs4 import BeautifulSoup
+
+import columnar
+import course_scraper
+from course_store import SearchCache
+from http_fixtures import ReplayServer, recording, replaying
+from selector_plan import SelectorPlan
+from job_listing_scraper import CircuitBreaker, Job, JobBatch, JobScraper, log, remoteok_job
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures" / "http"
+
+# Searches driven by the record/replay benchmarks
+SEARCH_TERM = "designer"
+LOCAL_JOB_TITLE = "Graphics designer"
+LOCAL_LOCATION = "Taguig City"
+COURSE_QUERY = "UI UX design"
+
+
+@dataclass
+class LegacyJob:
+    """The pre-slots Job layout, kept only as a memory baseline"""
+    title: str
+    company: str
+    location: str
+    url: str
+    source: str
+    salary: Optional[str] = None
+    job_type: Optional[str] = None
+    description: Optional[str] = None
+    posted_date: Optional[str] = None
+    tags: Optional[list] = None
+
+
+def job_dump_files() -> list[Path]:
+    """Job dumps written by JobScraper.save_to_json"""
+    return sorted(REPO_ROOT.glob("*jobs_*.json"))
+
+
+def load_job_records(rows: int) -> list[dict]:
+    """
+    Load `rows` job dicts by re-parsing the dumps until enough rows exist.
+
+    Each pass parses the raw text again so every record owns fresh string
+    objects, as it would after scraping many pages from many sources.
+    """
+    texts = [path.read_text(encoding="utf-8") for path in job_dump_files()]
+    if not texts:
+        raise FileNotFoundError(f"No job dumps found in {REPO_ROOT}")
+
+    records = []
+    while len(records) < rows:
+        for text in texts:
+            records.extend(json.loads(text))
+    return records[:rows]
+
+
+def traced_size(build: Callable[[], object]) -> tuple[int, object]:
+    """Bytes still allocated after build() returns, with its result kept alive"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, result
+
+
+def bench_memory(rows: int):
+    """Compare retained memory of LegacyJob, slotted Job and JobBatch"""
+    candidates = {
+        "LegacyJob (dataclass, __dict__)": lambda: [LegacyJob(**r) for r in load_job_records(rows)],
+        "Job (slots, frozen, interned)": lambda: [Job(**r) for r in load_job_records(rows)],
+        "JobBatch (columnar)": lambda: JobBatch(Job(**r) for r in load_job_records(rows)),
+    }
+
+    print(f"Retained memory for {rows} jobs (tracemalloc)")
+    baseline = None
+    for label, build in candidates.items():
+        size, result = traced_size(build)
+        del result
+        baseline = baseline or size
+        print(f"  {label:<34} {size / 1024 / 1024:8.2f} MiB  ({size / baseline:5.1%} of baseline)")
+
+
+def remoteok_fixture(rows: int, description_kb: int) -> bytes:
+    """
+    A RemoteOK-shaped feed body built from the job dumps.
+
+    The dumps only keep 500 description characters, so descriptions are
+    padded back out to `description_kb` to match the live feed's size.
+    """
+    items = [{"legal": "RemoteOK API metadata"}]
+    for i, record in enumerate(load_job_records(rows)):
+        description = record.get("description") or record["title"]
+        items.append({
+            "id": str(i),
+            "position": record["title"],
+            "company": record["company"],
+            "location": record["location"],
+            "url": record["url"],
+            "date": record.get("posted_date") or "",
+            "tags": record.get("tags") or [],
+            "description": (description * (description_kb * 1024 // len(description) + 1))[:description_kb * 1024],
+        })
+    return json.dumps(items).encode("utf-8")
+
+
+def fixture_response(body: bytes) -> requests.Response:
+    """A streamable Response serving body, standing in for the network"""
+    response = requests.Response()
+    response.status_code = 200
+    response.encoding = "utf-8"
+    response.raw = io.BytesIO(body)
+    return response
+
+
+def peak_memory(run: Callable[[], object]) -> tuple[int, float, object]:
+    """Peak traced bytes and wall time while run() executes"""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = run()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, elapsed, result
+
+
+def bench_stream(rows: int, description_kb: int):
+    """Peak memory of response.json() parsing vs iter_remoteok_jobs streaming"""
+    body = remoteok_fixture(rows, description_kb)
+
+    def buffered():
+        # The pre-streaming fetch_remoteok_jobs: decode the whole body, then map
+        # each item exactly as the streamed path does, so only the parser differs
+        data = fixture_response(body).json()
+        return [remoteok_job(d) for d in data[1:] if isinstance(d, dict)]
+
+    def streamed():
+        scraper = JobScraper()
+        scraper._get = lambda source, url, **kwargs: fixture_response(body)
+        return list(scraper.iter_remoteok_jobs())
+
+    print(f"RemoteOK feed: {rows} jobs, {len(body) / 1024 / 1024:.1f} MiB body")
+    for label, run in (("response.json()", buffered), ("iter_json_array", streamed)):
+        peak, elapsed, jobs = peak_memory(run)
+        print(f"  {label:<18} peak {peak / 1024 / 1024:8.2f} MiB  {elapsed * 1000:8.1f} ms  ({len(jobs)} jobs)")
+
+
+def isolated_scraper() -> JobScraper:
+    """A JobScraper whose circuit breaker does not touch the shared state file"""
+    scraper = JobScraper()
+    scraper.circuit_breaker = CircuitBreaker(state_file=None)
+    return scraper
+
+
+def scraper_drivers() -> dict[str, Callable[[], int]]:
+    """End-to-end entry points; each returns the number of items produced"""
+    return {
+        "fetch_all_jobs": lambda: len(isolated_scraper().fetch_all_jobs(search_term=SEARCH_TERM)),
+        "fetch_local_jobs": lambda: len(isolated_scraper().fetch_local_jobs(LOCAL_JOB_TITLE, LOCAL_LOCATION)),
+        "search_courses": lambda: len(course_scraper.search_courses(COURSE_QUERY, 5, "all", refresh=True)),
+        "search_courses (cached)": lambda: len(course_scraper.search_courses(COURSE_QUERY, 5, "all")),
+    }
+
+
+def isolate_search_cache():
+    """Keep benchmark searches out of the real course store"""
+    course_scraper.SEARCH_CACHE = SearchCache(path=None)
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def bench_record(fixture_dir: Path):
+    """Run every driver once against the live upstreams, capturing responses"""
+    isolate_search_cache()
+    with recording(fixture_dir):
+        for name, drive in scraper_drivers().items():
+            print(f"  {name:<24} {drive()} items recorded")
+    print(f"Fixtures written to {fixture_dir}")
+
+
+def bench_replay(fixture_dir: Path, iterations: int, latency_ms: float, jitter_ms: float, error_rate: float):
+    """Throughput and latency percentiles of every driver against recorded fixtures"""
+    # Keyed sources skip themselves without credentials; fixtures never store them
+    for name in ("ADZUNA_APP_ID", "ADZUNA_API_KEY", "RAPIDAPI_KEY"):
+        os.environ.setdefault(name, "replay")
+
+    isolate_search_cache()
+    server = ReplayServer(fixture_dir, latency_ms=latency_ms, jitter_ms=jitter_ms, error_rate=error_rate)
+    with server, replaying(server):
+        print(f"Replaying {fixture_dir} (latency {latency_ms}+{jitter_ms} ms, error rate {error_rate:.0%})")
+        for name, drive in scraper_drivers().items():
+            timings = []
+            items = 0
+            for _ in range(iterations):
+                started = time.perf_counter()
+                items += drive()
+                timings.append(time.perf_counter() - started)
+            timings.sort()
+            total = sum(timings)
+            print(f"  {name:<24} p50 {percentile(timings, 0.5) * 1000:8.1f} ms"
+                  f"  p90 {percentile(timings, 0.9) * 1000:8.1f} ms"
+                  f"  p99 {percentile(timings, 0.99) * 1000:8.1f} ms"
+                  f"  {iterations / total:6.2f} runs/s  {items / total:8.1f} items/s")
+        print(f"  server: {server.stats}")
+
+
+def load_csv_jobs(path: Path) -> list[Job]:
+    """Read a save_to_csv file back into Jobs (tags split, numbers parsed)"""
+    numeric = {"salary_min", "salary_max"}
+    jobs = []
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            record = {}
+            for name, value in row.items():
+                if value == "":
+                    record[name] = None
+                elif name in numeric:
+                    record[name] = float(value)
+                else:
+                    record[name] = value
+            record["tags"] = [tag.strip() for tag in record["tags"].split(",")] if record["tags"] else None
+            jobs.append(Job(**record))
+    return jobs
+
+
+def best_time(run: Callable[[], object], repeat: int) -> tuple[float, object]:
+    """Fastest of `repeat` wall-clock runs"""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def bench_formats(rows: int, repeat: int):
+    """File size and reload time of JSON, CSV, Parquet and Arrow IPC job dumps and course caches"""
+    columnar.require_pyarrow()
+    jobs = [Job(**record) for record in load_job_records(rows)]
+    courses = json.loads(course_scraper.CACHE_DIR.joinpath("all_courses.json").read_text(encoding="utf-8"))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        scraper = JobScraper()
+        scraper.jobs = jobs
+        scraper.save_to_json(str(tmp / "jobs.json"))
+        scraper.save_to_csv(str(tmp / "jobs.csv"))
+        scraper.save_to_parquet(str(tmp / "jobs.parquet"))
+        scraper.save_to_parquet(str(tmp / "jobs.arrow"))
+        log("")
+
+        loaders = {
+            "jobs.json": lambda: [Job(**r) for r in json.loads((tmp / "jobs.json").read_text(encoding="utf-8"))],
+            "jobs.csv": lambda: load_csv_jobs(tmp / "jobs.csv"),
+            "jobs.parquet": lambda: [Job(**r) for r in columnar.read_job_records(tmp / "jobs.parquet")],
+            "jobs.arrow": lambda: [Job(**r) for r in columnar.read_job_records(tmp / "jobs.arrow")],
+            "jobs.parquet (table only)": lambda: columnar.read_table(tmp / "jobs.parquet"),
+            "jobs.parquet (3 columns)": lambda: columnar.read_table(tmp / "jobs.parquet", ["title", "source", "tags"]),
+        }
+        print(f"Reloading {len(jobs)} jobs (best of {repeat})")
+        for label, load in loaders.items():
+            elapsed, _ = best_time(load, repeat)
+            path = tmp / label.split(" ")[0]
+            print(f"  {label:<26} {path.stat().st_size / 1024:9.1f} KiB  {elapsed * 1000:8.1f} ms")
+
+        (tmp / "courses.json").write_text(json.dumps(courses, indent=2, ensure_ascii=False), encoding="utf-8")
+        columnar.write_courses(courses, tmp / "courses.parquet")
+        course_count = sum(len(items) for items in courses.values())
+        print(f"Reloading the course cache ({course_count} courses, best of {repeat})")
+        for label, load in (
+            ("courses.json", lambda: json.loads((tmp / "courses.json").read_text(encoding="utf-8"))),
+            ("courses.parquet", lambda: columnar.read_courses(tmp / "courses.parquet")),
+        ):
+            elapsed, _ = best_time(load, repeat)
+            print(f"  {label:<26} {(tmp / label).stat().st_size / 1024:9.1f} KiB  {elapsed * 1000:8.1f} ms")
+
+
+def udemy_fixture_pages(fixture_dir: Path) -> list[str]:
+    """Bodies of recorded Udemy search pages"""
+    pages = []
+    for path in sorted((fixture_dir / "www.udemy.com").glob("*.json")):
+        record = json.loads(path.read_text(encoding="utf-8"))
+        if "/courses/search" in record["url"] and "body" in record:
+            pages.append(record["body"])
+    return pages
+
+
+def synthetic_udemy_page(cards: int, markup: str = "data-purpose") -> str:
+    """
+    A Udemy-shaped search page built from the course cache, for when no page
+    has been recorded: course cards inside the usual bulk of navigation,
+    inline state and filter markup that the card parser never looks at.
+    markup "class" builds the older class-based cards that only the fallback
+    selectors match.
+    """
+    courses = [course for items in json.loads(
+        course_scraper.CACHE_DIR.joinpath("all_courses.json").read_text(encoding="utf-8")).values() for course in items]
+    card_html = []
+    for i in range(cards):
+        course = courses[i % len(courses)]
+        title = html.escape(course["title"])
+        href = f'/course/{course_scraper.course_key(course).rsplit("/", 1)[-1] or i}/'
+        description = html.escape(course.get("description") or "")
+        if markup == "class":
+            card_html.append(
+                f'<div class="course-card--container--1QM2W">'
+                f'<img src="https://img-c.udemycdn.com/course/240x135/{i}.jpg" alt="">'
+                f'<div class="course-card--course-title"><a href="{href}">{title}</a></div>'
+                f'<p class="course-card--course-headline">{description}</p>'
+                f'<span class="star-rating--rating-number">{course.get("rating", 4.5)}</span>'
+                f'<span class="course-card--reviews-text">({course.get("reviews", 0):,})</span>'
+                f'<span class="price-text--price-part--Tu6MH">$12.99</span></div>'
+            )
+            continue
+        card_html.append(
+            f'<div class="course-card-module--container--3oS-F" data-purpose="course-card-container">'
+            f'<div class="course-card-image-module--image-container"><img src="https://img-c.udemycdn.com/course/240x135/{i}.jpg" alt=""></div>'
+            f'<div class="course-card-module--main-content"><h3 data-purpose="course-title-url" class="ud-heading-md">'
+            f'<a href="{href}">{title}</a></h3>'
+            f'<p data-purpose="course-headline" class="ud-text-sm">{description}</p>'
+            f'<div class="course-card-instructors-module--instructor-list">Instructor {i}</div>'
+            f'<div class="star-rating-module--star-wrapper"><span data-purpose="rating-number">{course.get("rating", 4.5)}</span>'
+            f'<span class="course-card-ratings-module--reviews">({course.get("reviews", 0):,})</span></div>'
+            f'<div data-purpose="course-price-text"><span><span>$12.99</span></span></div></div></div>'
+        )
+    filler = "".join(
+        f'<li class="ud-block-list-item"><a href="/courses/development/{i}/">Category {i}</a>'
+        f'<svg aria-hidden="true" class="ud-icon"><use xlink:href="#icon-{i}"></use></svg></li>'
+        for i in range(1500)
+    )
+    state = json.dumps({"courses": courses[:cards], "filters": list(range(2000))})
+    return (
+        "<!DOCTYPE html><html><head><title>Udemy</title>"
+        f"<script>window.__STATE__ = {state};</script></head><body>"
+        f"<header><nav><ul>{filler}</ul></nav></header>"
+        f'<main><div class="filter-panel">{filler}</div>'
+        f'<div class="course-list--container">{"".join(card_html)}</div></main>'
+        f"<footer><ul>{filler}</ul></footer></body></html>"
+    )
+
+
+def bench_parse(fixture_dir: Path, cards: int, repeat: int):
+    """
+    Udemy card extraction: html.parser on the whole page vs the strained
+    HTML_PARSER parse, with fixed-order selectors vs an adaptive selector plan
+    """
+    page_sets = {}
+    recorded = udemy_fixture_pages(fixture_dir)
+    if recorded:
+        page_sets[f"{len(recorded)} recorded pages from {fixture_dir}"] = recorded
+    else:
+        print(f"No recorded Udemy pages in {fixture_dir}; using synthetic pages with {cards} cards")
+        for markup in ("data-purpose", "class"):
+            page_sets[f"synthetic {markup} cards"] = [synthetic_udemy_page(cards, markup)]
+
+    def extract(pages: list[str], fast: bool, plan: SelectorPlan) -> list[list[dict]]:
+        return [
+            [course_scraper.parse_udemy_card(card, "bench", plan)
+             for card in course_scraper.find_udemy_cards(page, cards, fast, plan)]
+            for page in pages
+        ]
+
+    def full_parse(pages: list[str], parser_name: str, plan: SelectorPlan) -> list[list[dict]]:
+        results = []
+        for page in pages:
+            soup = BeautifulSoup(page, parser_name)
+            found = plan.first("cards", soup.select) or soup.select(course_scraper.UDEMY_CARD_SELECTORS[-1][1])
+            results.append([course_scraper.parse_udemy_card(card, "bench", plan) for card in found[:cards]])
+        return results
+
+    parser_name = course_scraper.HTML_PARSER
+    variants = {"html.parser, full page": lambda pages, plan: extract(pages, False, plan)}
+    if parser_name != "html.parser":
+        variants[f"{parser_name}, full page"] = lambda pages, plan: full_parse(pages, parser_name, plan)
+    variants[f"{parser_name} + SoupStrainer"] = lambda pages, plan: extract(pages, True, plan)
+    variants[f"{parser_name} + SoupStrainer + plan"] = lambda pages, plan: extract(pages, True, plan)
+    variants[f"{parser_name} + SoupStrainer + warm plan"] = lambda pages, plan: extract(pages, True, plan)
+
+    for source, pages in page_sets.items():
+        size = sum(len(page) for page in pages)
+        print(f"Parsing {source}, {size / 1024:.1f} KiB (best of {repeat})")
+        baseline_time, baseline = None, None
+        for label, run in variants.items():
+            adaptive = label.endswith("plan")
+            plans = []
+            warm_plan = None
+            if label.endswith("warm plan"):
+                # Stands in for a plan loaded from persisted stats: learned on an earlier run
+                warm_plan = SelectorPlan(course_scraper.UDEMY_FIELD_SELECTORS)
+                run(pages, warm_plan)
+
+            def measured():
+                # Otherwise a fresh plan per run, so the adaptive variant relearns from the first card
+                plan = warm_plan or SelectorPlan(course_scraper.UDEMY_FIELD_SELECTORS, adaptive=adaptive)
+                plan.queries = 0
+                plans.append(plan)
+                return run(pages, plan)
+
+            elapsed, result = best_time(measured, repeat)
+            if baseline is None:
+                baseline_time, baseline = elapsed, result
+            same = "same courses" if result == baseline else "DIFFERENT courses"
+            found = sum(len(courses) for courses in result)
+            print(f"  {label:<34} {elapsed * 1000:8.1f} ms  {baseline_time / elapsed:5.1f}x  "
+                  f"{plans[-1].queries / max(found, 1):5.1f} queries/card  {found} cards, {same}")
+
+
+def import_times(stderr: str) -> list[tuple[str, int]]:
+    """(module, cumulative microseconds) for each top-level import in -X importtime output"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):  # Nested imports are indented by two spaces per level
+            modules.append((name.strip(), int(cumulative)))
+    return modules
+
+
+def bench_startup(skill: str, runs: int):
+    """Wall time and import cost of the cache-only course lookup the PHP side runs per render"""
+    script = Path(course_scraper.__file__).resolve()
+    command = [sys.executable, str(script), "--from-cache", "--skill", skill]
+
+    def wall(args: list[str]) -> float:
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            subprocess.run(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+            timings.append(time.perf_counter() - started)
+        return sorted(timings)[len(timings) // 2]
+
+    interpreter = wall([sys.executable, "-c", "pass"])
+    lookup = wall(command)
+    print(f"Cache-only lookup ({skill}), median of {runs} runs")
+    print(f"  {'python -c pass':<34} {interpreter * 1000:8.1f} ms")
+    print(f"  {'course_scraper.py --from-cache':<34} {lookup * 1000:8.1f} ms  (+{(lookup - interpreter) * 1000:.1f} ms)")
+
+    result = subprocess.run([sys.executable, "-X", "importtime", *command[1:]],
+                            capture_output=True, text=True, check=True)
+    json.loads(result.stdout)  # stdout must stay pure JSON for the PHP caller
+    modules = sorted(import_times(result.stderr), key=lambda item: -item[1])
+    print(f"Top-level imports (-X importtime, {sum(us for _, us in modules) / 1000:.1f} ms total)")
+    for name, us in modules[:12]:
+        print(f"  {name:<34} {us / 1000:8.1f} ms")
+    for heavy in ("requests", "bs4", "urllib3", "concurrent.futures", "dotenv"):
+        if any(name == heavy or name.startswith(f"{heavy}.") for name, _ in modules):
+            print(f"  warning: {heavy} is imported on the cache-only path")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline scraper benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    memory = subparsers.add_parser("memory", help="Job representation memory comparison")
+    memory.add_argument("--rows", type=int, default=20000, help="Number of jobs to build (default: 20000)")
+
+    stream = subparsers.add_parser("stream", help="Streaming vs buffered feed parsing peak memory")
+    stream.add_argument("--rows", type=int, default=2000, help="Number of jobs in the feed (default: 2000)")
+    stream.add_argument("--description-kb", type=int, default=8,
+                        help="Description size per job in KiB (default: 8)")
+
+    record = subparsers.add_parser("record", help="Record live upstream responses as fixtures")
+    record.add_argument("--fixtures", type=Path, default=DEFAULT_FIXTURE_DIR, help="Fixture directory")
+
+    replay = subparsers.add_parser("replay", help="Drive the scrapers end to end against recorded fixtures")
+    replay.add_argument("--fixtures", type=Path, default=DEFAULT_FIXTURE_DIR, help="Fixture directory")
+    replay.add_argument("--iterations", type=int, default=20, help="Runs per driver (default: 20)")
+    replay.add_argument("--latency-ms", type=float, default=50, help="Added latency per response (default: 50)")
+    replay.add_argument("--jitter-ms", type=float, default=20, help="Random extra latency (default: 20)")
+    replay.add_argument("--error-rate", type=float, default=0.0,
+                        help="Fraction of responses replaced by a 503 (default: 0)")
+
+    formats = subparsers.add_parser("formats", help="JSON/CSV vs Parquet/Arrow file size and reload time")
+    formats.add_argument("--rows", type=int, default=20000, help="Number of jobs to write (default: 20000)")
+    formats.add_argument("--repeat", type=int, default=3, help="Loads per format; the best is kept (default: 3)")
+
+    parse = subparsers.add_parser("parse", help="Udemy card parsing: html.parser vs lxml with SoupStrainer")
+    parse.add_argument("--fixtures", type=Path, default=DEFAULT_FIXTURE_DIR, help="Fixture directory")
+    parse.add_argument("--cards", type=int, default=20,
+                       help="Cards per page to extract (and to build when no page is recorded; default: 20)")
+    parse.add_argument("--repeat", type=int, default=5, help="Parses per variant; the best is kept (default: 5)")
+
+    startup = subparsers.add_parser("startup", help="Startup time and imports of course_scraper.py --from-cache")
+    startup.add_argument("--skill", default="Design", help="Skill category to look up (default: Design)")
+    startup.add_argument("--runs", type=int, default=10, help="Runs to take the median of (default: 10)")
+
+    args = parser.parse_args()
+
+    if args.benchmark == "memory":
+        bench_memory(args.rows)
+    elif args.benchmark == "stream":
+        bench_stream(args.rows, args.description_kb)
+    elif args.benchmark == "record":
+        bench_record(args.fixtures)
+    elif args.benchmark == "replay":
+        bench_replay(args.fixtures, args.iterations, args.latency_ms, args.jitter_ms, args.error_rate)
+    elif args.benchmark == "formats":
+        bench_formats(args.rows, args.repeat)
+    elif args.benchmark == "parse":
+        bench_parse(args.fixtures, args.cards, args.repeat)
+    elif args.benchmark == "startup":
+        bench_startup(args.skill, args.runs)
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
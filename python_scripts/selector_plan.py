@@ -0,0 +1,103 @@
+"""
+Selector Plan - Remember which CSS selector variant matches each field
+
+Scraped pages change markup over time, so each field is looked up through a
+list of alternative selectors. Trying them in a fixed order costs a DOM query
+per miss on every card. A plan tries the variant that last matched first,
+falling back to the others (in their listed order) only on a miss, so one
+card teaches the plan what the rest of the page looks like.
+
+Hit counts and the last matching variant are persisted as JSON, so a new
+process starts with the last known-good plan instead of relearning it.
+"""
+
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+
+class SelectorPlan:
+    """
+    Adaptive selector order per field.
+
+    Args:
+        selectors: {field: [selector, ...]} in fallback order
+        stats_path: JSON file for hit statistics (None keeps them in memory only)
+        adaptive: When False, always try the listed order (the baseline)
+    """
+
+    def __init__(self, selectors: dict[str, list[str]], stats_path: Optional[Path] = None, adaptive: bool = True):
+        self.selectors = {field: list(variants) for field, variants in selectors.items()}
+        self.stats_path = Path(stats_path) if stats_path is not None else None
+        self.adaptive = adaptive
+        self.hits: dict[str, dict[str, int]] = {field: {} for field in self.selectors}
+        self.preferred: dict[str, str] = {}
+        self.queries = 0
+        self.lock = threading.Lock()
+        if self.stats_path is not None:
+            self.load()
+
+    def order(self, field: str) -> list[str]:
+        """Variants to try for field: the preferred one first, then the rest in listed order"""
+        variants = self.selectors[field]
+        preferred = self.preferred.get(field) if self.adaptive else None
+        if preferred is None or preferred == variants[0]:
+            return variants
+        return [preferred, *(variant for variant in variants if variant != preferred)]
+
+    def record(self, field: str, selector: str):
+        with self.lock:
+            counts = self.hits.setdefault(field, {})
+            counts[selector] = counts.get(selector, 0) + 1
+            self.preferred[field] = selector
+
+    def first(self, field: str, query: Callable[[str], object]):
+        """
+        The first non-empty query(selector) result for field, trying variants
+        in plan order; query is e.g. card.select_one or soup.select.
+        """
+        for selector in self.order(field):
+            self.queries += 1
+            result = query(selector)
+            if result:
+                self.record(field, selector)
+                return result
+        return None
+
+    def select_one(self, element, field: str):
+        return self.first(field, element.select_one)
+
+    def load(self):
+        try:
+            with open(self.stats_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        for field, stats in data.items():
+            if field not in self.selectors:
+                continue
+            known = set(self.selectors[field])
+            self.hits[field] = {selector: count for selector, count in stats.get("hits", {}).items() if selector in known}
+            if stats.get("last") in known:
+                self.preferred[field] = stats["last"]
+
+    def save(self):
+        """Write hit statistics atomically; failures only warn, the plan is an optimization"""
+        if self.stats_path is None:
+            return
+        with self.lock:
+            data = {
+                field: {"last": self.preferred.get(field), "hits": dict(self.hits.get(field, {}))}
+                for field in self.selectors
+            }
+        try:
+            self.stats_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.stats_path.with_name(f".{self.stats_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp, self.stats_path)
+        except OSError as e:
+            print(f"Could not save selector stats: {e}", file=sys.stderr)
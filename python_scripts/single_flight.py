@@ -0,0 +1,184 @@
+"""
+Single Flight - Coalesce identical concurrent work across processes
+
+Each PHP request spawns its own scraper process, so identical searches made
+at the same time would each call the upstream APIs. SingleFlight lets the
+first process (the leader) do the work while duplicates (followers) wait on a
+lock file and then read the leader's result from disk.
+
+Usage:
+    flight = SingleFlight()
+    result, shared = flight.run(("local", title, location, country), fetch)
+
+`fetch` must return something JSON-serializable. `shared` is True when the
+result came from another process's in-flight call.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+DEFAULT_FLIGHT_DIR = Path(tempfile.gettempdir()) / "job_scraper_flights"
+
+
+class FileLock:
+    """
+    Exclusive advisory lock on a file; released automatically if the process dies.
+
+    The holder deletes the file on release so lock files do not pile up, one
+    per key. A waiter that then wins the lock on the deleted file notices and
+    retries on a fresh one.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.handle = None
+
+    def try_acquire(self) -> bool:
+        while True:
+            handle = open(self.path, "a+b")
+            try:
+                if os.name == "nt":
+                    handle.seek(0)
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+                else:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                handle.close()
+                return False
+            if self._is_current(handle):
+                self.handle = handle
+                return True
+            handle.close()  # Locked a file the previous holder already deleted
+
+    def _is_current(self, handle) -> bool:
+        """True if handle is still the file at self.path"""
+        if os.name == "nt":
+            return True  # Open files cannot be deleted there
+        try:
+            return os.path.samestat(os.fstat(handle.fileno()), os.stat(self.path))
+        except OSError:
+            return False
+
+    def acquire(self, timeout: float, poll: float = 0.05) -> bool:
+        deadline = time.monotonic() + timeout
+        while not self.try_acquire():
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(poll)
+        return True
+
+    def release(self):
+        if self.handle is None:
+            return
+        try:
+            if os.name == "nt":
+                self.handle.seek(0)
+                msvcrt.locking(self.handle.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                # Deleted while still held, so no one can lock this file and miss that it is gone
+                self._unlink()
+                fcntl.flock(self.handle.fileno(), fcntl.LOCK_UN)
+        finally:
+            self.handle.close()
+            self.handle = None
+        if os.name == "nt":
+            self._unlink()  # Fails harmlessly while another process has it open
+
+    def _unlink(self):
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+
+class SingleFlight:
+    """
+    Cross-process request coalescing keyed by arbitrary string parts.
+
+    Args:
+        directory: Where lock and result files live (shared by all processes)
+        wait_timeout: Longest a follower waits for the leader before fetching itself
+        result_ttl: Age after which finished results are deleted
+    """
+
+    def __init__(self, directory: Path = DEFAULT_FLIGHT_DIR, wait_timeout: float = 90, result_ttl: float = 300):
+        self.directory = Path(directory)
+        self.wait_timeout = wait_timeout
+        self.result_ttl = result_ttl
+
+    @staticmethod
+    def key(parts: tuple) -> str:
+        normalized = "\x1f".join(" ".join(str(p).lower().split()) for p in parts)
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
+
+    def _read_result(self, key: str, not_before: float) -> Optional[object]:
+        """The leader's result, if it finished after `not_before`"""
+        try:
+            with open(self.directory / f"{key}.json", "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if record.get("completed_at", 0) < not_before:
+            return None
+        return record.get("result")
+
+    def _write_result(self, key: str, result):
+        path = self.directory / f"{key}.json"
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"completed_at": time.time(), "result": result}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def _cleanup(self):
+        cutoff = time.time() - self.result_ttl
+        for path in self.directory.glob("*.json"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                pass
+
+    def run(self, parts: tuple, fetch: Callable[[], object]) -> tuple[object, bool]:
+        """Run fetch() once per concurrent burst of identical keys; returns (result, shared)"""
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            return fetch(), False  # No shared directory; just do the work
+
+        key = self.key(parts)
+        lock = FileLock(self.directory / f"{key}.lock")
+        arrived_at = time.time()
+
+        if not lock.try_acquire():
+            # Someone is already fetching this key: wait for them to finish
+            print("Identical search in flight, waiting for its result...", file=sys.stderr)
+            if lock.acquire(self.wait_timeout):
+                result = self._read_result(key, arrived_at)
+                if result is not None:
+                    lock.release()
+                    return result, True
+                # Leader failed without a result; do the work ourselves under the lock
+            else:
+                return fetch(), False
+
+        try:
+            result = fetch()
+            try:
+                self._write_result(key, result)
+                self._cleanup()
+            except OSError:
+                pass  # Followers fall back to fetching themselves
+            return result, False
+        finally:
+            lock.release()
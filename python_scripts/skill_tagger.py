@@ -0,0 +1,303 @@
+"""
+Skill Tagger - Tag jobs with the nearest rows of the skills table by embedding
+
+extract_skills_from_text() only knows the hard-coded COMMON_SKILLS. This
+batch stage matches job text against the full Kaggle-derived `skills` table
+written by ingest_kaggle_skills_embeddings.py:
+
+1. Split each title and description into short phrases
+2. Embed every distinct phrase once, in batches, with the ingestion model
+   (vectors are cached on disk by phrase hash, so re-tagging is nearly free)
+3. One matrix multiply per batch against the normalized skills matrix; each
+   phrase takes its best skill if the cosine similarity clears the threshold
+
+Usage (from repo root):
+    python python_scripts/skill_tagger.py jobs_20260122_220638.json --out tagged.json
+    python python_scripts/job_listing_scraper.py "Graphics designer" "Taguig City" --tag-skills
+
+Requires numpy and sentence-transformers (see requirements.txt).
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import sqlite3
+import sys
+from dataclasses import asdict, replace
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+
+from ingest_kaggle_skills_embeddings import connect_sqlite, default_sqlite_path
+
+DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+DEFAULT_THRESHOLD = 0.6
+DEFAULT_PHRASE_CACHE = Path(__file__).resolve().parent / "job_cache" / "phrase_vectors.sqlite"
+
+# Phrases longer than this are cut into overlapping windows
+MAX_PHRASE_WORDS = 6
+PHRASE_STRIDE = 3
+
+_PHRASE_BREAKS = re.compile(r"[.;:!?,()\[\]|/•·\n\r\t]+|\s[-–—]\s|\b(?:and|or|with|using|including|such as)\b", re.I)
+_WORD = re.compile(r"[\w+#.]*\w[+#]*")
+
+
+def chunk_phrases(text: Optional[str]) -> list[str]:
+    """Distinct lowercase phrases of 1..MAX_PHRASE_WORDS words, in order of appearance"""
+    if not text:
+        return []
+    phrases = []
+    seen = set()
+    for segment in _PHRASE_BREAKS.split(text):
+        words = _WORD.findall(segment.lower())
+        if not words:
+            continue
+        if len(words) <= MAX_PHRASE_WORDS:
+            windows = [words]
+        else:
+            windows = [words[i:i + MAX_PHRASE_WORDS]
+                       for i in range(0, len(words) - MAX_PHRASE_WORDS + PHRASE_STRIDE, PHRASE_STRIDE)]
+        for window in windows:
+            phrase = " ".join(window)
+            if phrase not in seen:
+                seen.add(phrase)
+                phrases.append(phrase)
+    return phrases
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32, copy=False)
+
+
+def load_skill_matrix(conn: sqlite3.Connection) -> tuple[list[str], np.ndarray]:
+    """Skill names and their L2-normalized float32 embeddings (rows without a vector are skipped)"""
+    names: list[str] = []
+    vectors: list[np.ndarray] = []
+    for name, blob in conn.execute("SELECT name, embedding FROM skills WHERE embedding IS NOT NULL ORDER BY id"):
+        if not blob:
+            continue
+        names.append(name)
+        vectors.append(np.frombuffer(blob, dtype=np.float32))
+    if not vectors:
+        raise RuntimeError("The skills table has no embeddings; run ingest_kaggle_skills_embeddings.py first")
+    return names, _normalize_rows(np.vstack(vectors))
+
+
+class PhraseVectorCache:
+    """Normalized phrase embeddings keyed by sha1(model, phrase), in memory and in SQLite"""
+
+    def __init__(self, model_name: str, path: Optional[Path] = DEFAULT_PHRASE_CACHE):
+        self.model_name = model_name
+        self.memory: dict[str, np.ndarray] = {}
+        self.conn = None
+        if path is not None:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self.conn = connect_sqlite(str(path))
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS phrase_vectors (hash TEXT PRIMARY KEY, vector BLOB NOT NULL);"
+            )
+            self.conn.commit()
+
+    def key(self, phrase: str) -> str:
+        return hashlib.sha1(f"{self.model_name}\x1f{phrase}".encode("utf-8")).hexdigest()
+
+    def get_many(self, phrases: Sequence[str]) -> dict[str, np.ndarray]:
+        """Cached vectors for whichever phrases have one"""
+        found = {}
+        missing = []
+        for phrase in phrases:
+            vector = self.memory.get(phrase)
+            if vector is None:
+                missing.append(phrase)
+            else:
+                found[phrase] = vector
+        if self.conn is not None and missing:
+            by_key = {self.key(phrase): phrase for phrase in missing}
+            keys = list(by_key)
+            for start in range(0, len(keys), 500):  # Stay under SQLite's bound-parameter limit
+                chunk = keys[start:start + 500]
+                rows = self.conn.execute(
+                    f"SELECT hash, vector FROM phrase_vectors WHERE hash IN ({','.join('?' * len(chunk))})", chunk
+                )
+                for key, blob in rows:
+                    phrase = by_key[key]
+                    vector = np.frombuffer(blob, dtype=np.float32)
+                    self.memory[phrase] = vector
+                    found[phrase] = vector
+        return found
+
+    def put_many(self, phrases: Sequence[str], vectors: np.ndarray):
+        for phrase, vector in zip(phrases, vectors):
+            self.memory[phrase] = vector
+        if self.conn is not None:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO phrase_vectors(hash, vector) VALUES(?, ?)",
+                    [(self.key(phrase), vector.tobytes()) for phrase, vector in zip(phrases, vectors)],
+                )
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+
+
+class PhraseEmbedder:
+    """
+    Normalized phrase embeddings with the ingestion model, computed once per
+    phrase and served from PhraseVectorCache afterwards.
+    """
+
+    def __init__(self, model_name: str = DEFAULT_MODEL, batch_size: int = 256,
+                 cache_path: Optional[Path] = DEFAULT_PHRASE_CACHE):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.cache = PhraseVectorCache(model_name, cache_path)
+        self._model = None
+
+    @property
+    def model(self):
+        # Loaded only when some phrase is not cached yet
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer  # type: ignore
+            import torch  # type: ignore
+
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+            self._model = SentenceTransformer(self.model_name, device=device)
+        return self._model
+
+    def vectors(self, phrases: Sequence[str]) -> np.ndarray:
+        """Normalized vectors for phrases (in order), embedding only the uncached ones"""
+        cached = self.cache.get_many(phrases)
+        missing = list(dict.fromkeys(phrase for phrase in phrases if phrase not in cached))
+        if missing:
+            print(f"Embedding {len(missing)} new phrases ({len(cached)} cached)", file=sys.stderr)
+            vectors = self.model.encode(
+                missing,
+                batch_size=self.batch_size,
+                show_progress_bar=False,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+            ).astype(np.float32, copy=False)
+            self.cache.put_many(missing, vectors)
+            cached.update(zip(missing, vectors))
+        if not phrases:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.vstack([cached[phrase] for phrase in phrases])
+
+    def close(self):
+        self.cache.close()
+
+
+class SkillTagger:
+    """
+    Batch skill tagging against the skills table.
+
+    Args:
+        db_path: Laravel SQLite database holding the skills table
+        model_name: Sentence-Transformers model used at ingestion
+        threshold: Minimum cosine similarity between a phrase and a skill
+        batch_size: Phrases per embedding call and per matrix multiply
+        max_tags: Most semantic tags added per job
+        phrase_cache: SQLite file for cached phrase vectors (None keeps them in memory only)
+    """
+
+    def __init__(
+        self,
+        db_path: str = default_sqlite_path(),
+        model_name: str = DEFAULT_MODEL,
+        threshold: float = DEFAULT_THRESHOLD,
+        batch_size: int = 256,
+        max_tags: int = 15,
+        phrase_cache: Optional[Path] = DEFAULT_PHRASE_CACHE,
+    ):
+        self.threshold = threshold
+        self.batch_size = batch_size
+        self.max_tags = max_tags
+        conn = connect_sqlite(db_path)
+        try:
+            self.skill_names, self.skill_matrix = load_skill_matrix(conn)
+        finally:
+            conn.close()
+        self.embedder = PhraseEmbedder(model_name, batch_size, phrase_cache)
+
+    def match_phrases(self, phrases: Sequence[str]) -> dict[str, tuple[str, float]]:
+        """{phrase: (skill name, similarity)} for phrases whose best skill clears the threshold"""
+        matches = {}
+        for start in range(0, len(phrases), self.batch_size):
+            batch = phrases[start:start + self.batch_size]
+            similarities = self.embedder.vectors(batch) @ self.skill_matrix.T
+            best = similarities.argmax(axis=1)
+            scores = similarities[np.arange(len(batch)), best]
+            for phrase, index, score in zip(batch, best, scores):
+                if score >= self.threshold:
+                    matches[phrase] = (self.skill_names[index], float(score))
+        return matches
+
+    def tag_texts(self, texts: Iterable[str]) -> list[list[str]]:
+        """Skills for each text, most similar first; every distinct phrase is embedded once"""
+        phrases_per_text = [chunk_phrases(text) for text in texts]
+        distinct = list(dict.fromkeys(phrase for phrases in phrases_per_text for phrase in phrases))
+        matches = self.match_phrases(distinct)
+
+        tagged = []
+        for phrases in phrases_per_text:
+            best: dict[str, float] = {}
+            for phrase in phrases:
+                if phrase in matches:
+                    skill, score = matches[phrase]
+                    best[skill] = max(score, best.get(skill, 0.0))
+            tagged.append(sorted(best, key=best.get, reverse=True)[:self.max_tags])
+        return tagged
+
+    def tag_jobs(self, jobs: Sequence) -> list:
+        """Copies of jobs with semantic skills appended to their tags"""
+        from job_listing_scraper import merge_tags
+
+        texts = [f"{job.title}. {job.description or ''}" for job in jobs]
+        return [
+            replace(job, tags=merge_tags(job.tags, skills))
+            for job, skills in zip(jobs, self.tag_texts(texts))
+        ]
+
+    def close(self):
+        self.embedder.close()
+
+
+def main():
+    from job_listing_scraper import Job
+
+    parser = argparse.ArgumentParser(description="Tag job dumps with skills from the skills table")
+    parser.add_argument("source", type=Path, help="JSON dump written by JobScraper.save_to_json")
+    parser.add_argument("--out", type=Path, help="Write tagged jobs here instead of stdout")
+    parser.add_argument("--db", default=default_sqlite_path(), help="Path to SQLite database file")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="Sentence-Transformers model name")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Minimum cosine similarity (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--batch-size", type=int, default=256, help="Phrases per batch (default: 256)")
+    args = parser.parse_args()
+
+    with open(args.source, "r", encoding="utf-8") as f:
+        jobs = [Job(**record) for record in json.load(f)]
+
+    tagger = SkillTagger(args.db, args.model, args.threshold, args.batch_size)
+    try:
+        tagged = tagger.tag_jobs(jobs)
+    finally:
+        tagger.close()
+
+    output = json.dumps([asdict(job) for job in tagged], indent=2, ensure_ascii=False)
+    if args.out:
+        args.out.write_text(output, encoding="utf-8")
+        print(f"Tagged {len(tagged)} jobs -> {args.out}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
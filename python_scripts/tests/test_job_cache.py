@@ -0,0 +1,80 @@
+"""
+Local search cache write tests
+
+Usage (from repo root):
+    python -m unittest discover -s python_scripts/tests
+"""
+
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from job_cache import LocalJobCache  # noqa: E402
+from job_listing_scraper import CircuitBreaker, JobScraper, SourceUnavailable  # noqa: E402
+
+JSEARCH_BODY = {
+    "data": [{
+        "job_title": "Python Developer",
+        "employer_name": "Acme",
+        "job_city": "Taguig",
+        "job_country": "PH",
+        "job_apply_link": "https://example.com/jobs/1",
+        "job_description": "Build APIs in Python and SQL.",
+    }]
+}
+
+
+def json_response(body: dict) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.encoding = "utf-8"
+    response.raw = io.BytesIO(json.dumps(body).encode("utf-8"))
+    return response
+
+
+class LocalCacheWriteTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache = LocalJobCache(Path(directory.name) / "local.sqlite")
+        self.addCleanup(self.cache.conn.close)
+        self.scraper = JobScraper(cache=self.cache)
+        self.scraper.circuit_breaker = CircuitBreaker(state_file=None)
+        # JSearch configured, Adzuna not
+        env = {"RAPIDAPI_KEY": "test-key", "ADZUNA_APP_ID": "", "ADZUNA_API_KEY": ""}
+        patcher = mock.patch.dict(os.environ, env)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_unconfigured_source_still_caches(self):
+        self.scraper._get = lambda source, url, **kwargs: json_response(JSEARCH_BODY)
+        jobs = self.scraper.fetch_local_jobs("Python developer", "Taguig")
+
+        self.assertEqual(len(jobs), 1)
+        self.assertIn("skipped", [m.status for m in self.scraper.metrics.records])
+        cached = self.cache.get("Python developer", "Taguig", "ph")
+        self.assertIsNotNone(cached)
+        self.assertEqual([record["title"] for record in cached.records], ["Python Developer"])
+
+    def test_failed_source_is_not_cached(self):
+        def unavailable(source, url, **kwargs):
+            raise SourceUnavailable(f"{source} is failing")
+
+        self.scraper._get = unavailable
+        self.scraper.fetch_local_jobs("Python developer", "Taguig")
+
+        self.assertIn("error", [m.status for m in self.scraper.metrics.records])
+        self.assertIsNone(self.cache.get("Python developer", "Taguig", "ph"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+Location filter tests
+
+Usage (from repo root):
+    python -m unittest discover -s python_scripts/tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from job_listing_scraper import Job, JobScraper  # noqa: E402
+from locations import default_gazetteer  # noqa: E402
+
+
+def make_job(location: str) -> Job:
+    return Job(title="Developer", company="Acme", location=location,
+               url=f"https://example.com/{location}", source="test")
+
+
+class FilterByLocationTest(unittest.TestCase):
+    def setUp(self):
+        self.scraper = JobScraper()
+        self.scraper.jobs = [
+            make_job("San Jose, CA"),
+            make_job("San Jose del Monte, Bulacan"),
+            make_job("Remote - US"),
+            make_job("Remote - Europe"),
+            make_job("Carmona, Cavite"),
+            make_job("Makati City, Metro Manila"),
+            make_job("BGC, Taguig"),
+            make_job("Santa Rosa, CA"),
+            make_job("Santa Rosa, Laguna"),
+            make_job("Angeles, CA"),
+            make_job("Angeles City, Pampanga"),
+            make_job("Car Nicobar"),
+        ]
+
+    def locations(self, query: str) -> list[str]:
+        return [job.location for job in self.scraper.filter_by_location(query)]
+
+    def test_unknown_city_falls_back_to_substring(self):
+        # "San Jose" is a prefix of San Jose del Monte but not a place the gazetteer knows
+        self.assertEqual(self.locations("San Jose"), ["San Jose, CA", "San Jose del Monte, Bulacan"])
+
+    def test_unknown_qualifier_falls_back_to_substring(self):
+        # "us" is not a gazetteer alias, so the query is narrower than remote
+        self.assertEqual(self.locations("Remote - US"), ["Remote - US"])
+
+    def test_place_without_jobs_falls_back_to_substring(self):
+        # "car" is Cordillera's alias, but no job is there
+        self.assertEqual(self.locations("Car"), ["Carmona, Cavite", "Car Nicobar"])
+
+    def test_foreign_namesakes_are_not_ph_places(self):
+        # Unknown words next to a PH place name ("CA", "Nicobar") mean a namesake abroad
+        gazetteer = default_gazetteer()
+        for location in ("San Jose, CA", "Santa Rosa, CA", "Angeles, CA", "Car Nicobar"):
+            self.assertIsNone(gazetteer.normalize(location), location)
+        self.assertEqual(self.locations("Laguna"), ["Santa Rosa, Laguna"])
+        self.assertEqual(self.locations("Pampanga"), ["Angeles City, Pampanga"])
+
+    def test_qualifiers_keep_the_place(self):
+        gazetteer = default_gazetteer()
+        self.assertEqual(gazetteer.normalize("Makati (Hybrid)"), "makati")
+        self.assertEqual(gazetteer.normalize("Taguig City, Metro Manila 1634"), "taguig")
+
+    def test_known_place_matches_hierarchically(self):
+        self.assertEqual(self.locations("Metro Manila"), ["Makati City, Metro Manila", "BGC, Taguig"])
+        self.assertEqual(self.locations("Taguig"), ["BGC, Taguig"])
+        self.assertEqual(self.locations("remote"), ["Remote - US", "Remote - Europe"])
+
+
+if __name__ == "__main__":
+    unittest.main()
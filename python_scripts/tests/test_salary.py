@@ -0,0 +1,39 @@
+"""
+Salary parsing tests
+
+Usage (from repo root):
+    python -m unittest discover -s python_scripts/tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from salary import SalaryRange, parse_salary  # noqa: E402
+
+
+class ParseSalaryTest(unittest.TestCase):
+    def test_docstring_examples(self):
+        self.assertEqual(parse_salary("$130k - $150k"), SalaryRange(130_000.0, 150_000.0, "USD", "year"))
+        self.assertEqual(parse_salary("From 30,000"), SalaryRange(30_000.0, None, None, "year"))
+        self.assertEqual(parse_salary("PHP 25,000 - 35,000 per month"),
+                         SalaryRange(25_000.0, 35_000.0, "PHP", "month"))
+        self.assertEqual(parse_salary("Up to €60k/yr"), SalaryRange(None, 60_000.0, "EUR", "year"))
+
+    def test_range_shares_upper_suffix(self):
+        self.assertEqual(parse_salary("$40-50k"), SalaryRange(40_000.0, 50_000.0, "USD", "year"))
+        self.assertEqual(parse_salary("80-100K USD"), SalaryRange(80_000.0, 100_000.0, "USD", "year"))
+        self.assertEqual(parse_salary("1.5-2M PHP"), SalaryRange(1_500_000.0, 2_000_000.0, "PHP", "year"))
+
+    def test_full_lower_bound_is_not_scaled(self):
+        self.assertEqual(parse_salary("$40,000 - 50k"), SalaryRange(40_000.0, 50_000.0, "USD", "year"))
+
+    def test_bare_small_numbers_are_not_pay(self):
+        self.assertIsNone(parse_salary("2 - 3 years"))
+        self.assertIsNone(parse_salary("2 - 3 years", default_currency="USD"))
+
+
+if __name__ == "__main__":
+    unittest.main()